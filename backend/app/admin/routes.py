@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from backend.app.core.dependencies import require_admin
+from backend.app.core.dependencies import require_admin, principal_cache_stats
 from backend.app.db.models import StaffUser
 from sqlalchemy.orm import Session
 
-from backend.app.db.session import get_db
+from backend.app.db.session import get_db, engine, async_engine
+from backend.app.db.pool import worker_pool_report
+from backend.app.core.security import password_hasher
+from backend.app.core.config import settings
 from backend.app.admin.schemas import (
     StaffCreateRequest,
     StaffCreateResponse,
@@ -126,3 +129,29 @@ def reset_staff_password_route(
         new_password=payload.new_password,
     )
     return {"message": "Password reset successfully"}
+
+
+@router.get("/db/pool")
+def db_pool_stats(current_admin: StaffUser = Depends(require_admin)):
+    """Pool statistics for the worker process that served this request."""
+    return {
+        "config": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+            "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+        },
+        **worker_pool_report(engine, async_engine),
+    }
+
+
+@router.get("/auth/principal-cache")
+def principal_cache(current_admin: StaffUser = Depends(require_admin)):
+    return principal_cache_stats()
+
+
+@router.get("/auth/password-hashing")
+def password_hashing_stats(current_admin: StaffUser = Depends(require_admin)):
+    return password_hasher.stats()
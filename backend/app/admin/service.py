@@ -3,7 +3,9 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from backend.app.db.models import StaffUser, Appointment
+from backend.app.core.dependencies import invalidate_principal
 from backend.app.core.security import hash_password
+from backend.app.reports.service import invalidate_dashboard
 
 
 def create_staff_user(
@@ -39,6 +41,7 @@ def create_staff_user(
 
     db.add(staff)
     db.commit()
+    invalidate_dashboard()
     db.refresh(staff)
 
     return staff
@@ -86,6 +89,8 @@ def update_staff_status(
 
     staff.is_active = is_active
     db.commit()
+    invalidate_principal(staff_id)
+    invalidate_dashboard()
     db.refresh(staff)
 
     return staff
@@ -132,6 +137,7 @@ def update_staff_profile(
         staff.name = name
 
     db.commit()
+    invalidate_principal(staff_id)
     db.refresh(staff)
     return staff
 
@@ -155,5 +161,6 @@ def reset_staff_password(
 
     staff.password_hash = hash_password(new_password)
     db.commit()
+    invalidate_principal(staff_id)
     db.refresh(staff)
     return staff
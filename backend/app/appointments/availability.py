@@ -0,0 +1,186 @@
+"""
+Appointment slot availability.
+
+A clinic day is cut into SLOT_MINUTES slots.  Each day's occupancy is a
+``bytearray`` with one counter per slot (non-cancelled appointments starting
+in it), built for a whole date range with one grouped query and cached per
+day.  A slot is free while its counter is below SLOT_CAPACITY.
+
+Booking a scheduled appointment goes through ``reserve_slot``: it refuses
+closed days and times outside clinic hours, then, inside the booking
+transaction, takes a PostgreSQL advisory lock on just that (day, slot) and
+counts the slot's appointments, so two receptionists racing
+for the same slot are serialized while every other slot books in parallel.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from backend.app.core.cache import TTLCache
+from backend.app.core.config import settings
+from backend.app.db.models import Appointment
+
+# First key of the two-int advisory lock, so slot locks can't collide with
+# other advisory lock users (the migration lock uses the one-bigint form)
+_LOCK_NAMESPACE = 0x534C4F54  # "SLOT"
+
+_day_cache = TTLCache(
+    maxsize=settings.AVAILABILITY_CACHE_MAX_DAYS,
+    ttl=settings.AVAILABILITY_CACHE_TTL_SECONDS,
+    shared=True,
+)
+
+
+def slots_per_day() -> int:
+    return 24 * 60 // settings.SLOT_MINUTES
+
+
+def slot_of(at: time) -> int:
+    return (at.hour * 60 + at.minute) // settings.SLOT_MINUTES
+
+
+def slot_start(slot: int) -> time:
+    minutes = slot * settings.SLOT_MINUTES
+    return time(minutes // 60, minutes % 60)
+
+
+def _slot_bounds(day: date, at: time):
+    """[start, end) of the slot containing ``at``, as times of ``day``."""
+    start = datetime.combine(day, slot_start(slot_of(at)))
+    end = start + timedelta(minutes=settings.SLOT_MINUTES)
+    return start.time(), (end.time() if end.date() == day else None)
+
+
+def _is_open(day: date) -> bool:
+    return day.weekday() not in settings.clinic_closed_weekdays
+
+
+def _opening_slots() -> range:
+    return range(slot_of(settings.CLINIC_OPENS), slot_of(settings.CLINIC_CLOSES))
+
+
+# ──────────── OCCUPANCY ────────────
+
+def _load_occupancy(db: Session, start: date, end: date) -> Dict[date, bytearray]:
+    occupancy = {
+        start + timedelta(days=i): bytearray(slots_per_day())
+        for i in range((end - start).days + 1)
+    }
+    rows = db.execute(
+        select(Appointment.appointment_date, Appointment.appointment_time, func.count())
+        .where(
+            Appointment.appointment_date >= start,
+            Appointment.appointment_date <= end,
+            Appointment.status != "cancelled",
+        )
+        .group_by(Appointment.appointment_date, Appointment.appointment_time)
+    )
+    for day, at, count in rows:
+        slots = occupancy[day]
+        slot = slot_of(at)
+        slots[slot] = min(255, slots[slot] + count)
+    return occupancy
+
+
+def occupancy(db: Session, start: date, end: date) -> Dict[date, bytearray]:
+    """Per-day slot counters for [start, end]; uncached days load in one query."""
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    generation = _day_cache.generation()
+    found = {day: _day_cache.get(day) for day in days}
+    missing = [day for day, slots in found.items() if slots is None]
+    if missing:
+        loaded = _load_occupancy(db, missing[0], missing[-1])
+        for day in missing:
+            found[day] = loaded[day]
+            _day_cache.set(day, loaded[day], if_generation=generation)
+    return found
+
+
+def invalidate_availability(*days: Optional[date]) -> None:
+    """Call after commits that add, move or cancel appointments on ``days``."""
+    for day in {d for d in days if d is not None}:
+        _day_cache.invalidate(day)
+
+
+def availability_cache_stats() -> dict:
+    return _day_cache.stats()
+
+
+@dataclass
+class DayAvailability:
+    date: date
+    open: bool
+    free_slots: List[time]
+
+
+def free_slots(db: Session, start: date, end: date) -> List[DayAvailability]:
+    now = datetime.now()
+    capacity = settings.SLOT_CAPACITY
+    result = []
+    for day, slots in occupancy(db, start, end).items():
+        if not _is_open(day) or day < now.date():
+            result.append(DayAvailability(date=day, open=_is_open(day), free_slots=[]))
+            continue
+        earliest = slot_of(now.time()) + 1 if day == now.date() else 0
+        result.append(DayAvailability(
+            date=day,
+            open=True,
+            free_slots=[
+                slot_start(s) for s in _opening_slots()
+                if s >= earliest and slots[s] < capacity
+            ],
+        ))
+    return result
+
+
+# ──────────── BOOKING ────────────
+
+def reserve_slot(
+    db: Session, day: date, at: time, exclude_id: Optional[int] = None
+) -> None:
+    """Reject a booking on a closed day or outside clinic hours (422), or
+    into a full slot (409).  Call inside the booking transaction, before the
+    insert / update; the lock is released by the commit or rollback."""
+    if not _is_open(day):
+        raise HTTPException(status_code=422, detail=f"The clinic is closed on {day:%A, %d-%b-%Y}")
+    if slot_of(at) not in _opening_slots():
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                f"{at.strftime('%I:%M %p')} is outside clinic hours "
+                f"({settings.CLINIC_OPENS.strftime('%I:%M %p')} - "
+                f"{settings.CLINIC_CLOSES.strftime('%I:%M %p')})"
+            ),
+        )
+
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(
+            text("SELECT pg_advisory_xact_lock(:ns, :key)"),
+            {"ns": _LOCK_NAMESPACE, "key": day.toordinal() * slots_per_day() + slot_of(at)},
+        )
+
+    start, end = _slot_bounds(day, at)
+    query = (
+        select(func.count())
+        .select_from(Appointment)
+        .where(
+            Appointment.appointment_date == day,
+            Appointment.appointment_time >= start,
+            Appointment.status != "cancelled",
+        )
+    )
+    if end is not None:
+        query = query.where(Appointment.appointment_time < end)
+    if exclude_id is not None:
+        query = query.where(Appointment.id != exclude_id)
+
+    if db.execute(query).scalar() >= settings.SLOT_CAPACITY:
+        raise HTTPException(
+            status_code=409,
+            detail=f"The {start.strftime('%I:%M %p')} slot on {day:%d-%b-%Y} is fully booked",
+        )
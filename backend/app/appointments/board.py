@@ -0,0 +1,197 @@
+"""
+Live day board: one snapshot per connection, then deltas as the day changes.
+
+Write paths call ``board_changed()`` after they commit.  That bumps a
+``SharedGeneration`` (seen by every preloaded gunicorn worker) and wakes
+this worker's board task through ``loop.call_soon_threadsafe``.  The task
+re-reads each day that has subscribers once, diffs it against the rows it
+last sent and pushes only the changed / removed appointments to every
+subscriber of that day, so N open terminals cost one query per change
+instead of N polls.  Other workers notice the counter within
+BOARD_POLL_SECONDS.
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from datetime import date
+from typing import AsyncIterator, Dict, Optional, Set
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.appointments.service import appointments_on
+from backend.app.core.cache import SharedGeneration
+from backend.app.core.config import settings
+from backend.app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Events a subscriber may fall behind by before it is resent a snapshot
+_QUEUE_SIZE = 100
+
+
+def _load_day(day: date) -> Dict[int, dict]:
+    db = SessionLocal()
+    try:
+        return {row["id"]: row for row in appointments_on(db, day)}
+    finally:
+        db.close()
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class DayBoard:
+    def __init__(self):
+        self._generation = SharedGeneration()
+        self._seen_generation = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._subscribers: Dict[date, Set[asyncio.Queue]] = defaultdict(set)
+        self._rows: Dict[date, Dict[int, dict]] = {}
+        self._locks: Dict[date, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.counters = {"changes": 0, "refreshes": 0, "deltas": 0, "resyncs": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the board task on the running event loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._seen_generation = self._generation.value
+        self._task = asyncio.create_task(self._run(), name="day-board")
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
+
+    def changed(self) -> None:
+        """Record a committed change to some day's appointments; safe from any thread."""
+        self.counters["changes"] += 1
+        self._generation.bump()
+        if self.running:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    # ──────────── SUBSCRIBERS ────────────
+
+    async def _subscribe(self, day: date) -> asyncio.Queue:
+        self.start()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        async with self._locks[day]:
+            # The first subscriber always loads: rows kept for a day nobody
+            # watched were not being refreshed
+            if day not in self._subscribers or day not in self._rows:
+                self._rows[day] = await run_in_threadpool(_load_day, day)
+            queue.put_nowait(("snapshot", list(self._rows[day].values())))
+            self._subscribers[day].add(queue)
+        return queue
+
+    def _unsubscribe(self, day: date, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(day)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[day]
+            self._rows.pop(day, None)
+            lock = self._locks.get(day)
+            if lock is not None and not lock.locked():
+                del self._locks[day]
+
+    async def stream(self, day: date) -> AsyncIterator[str]:
+        """Server-sent events for ``day``: ``snapshot`` first, then ``delta``s."""
+        queue = await self._subscribe(day)
+        try:
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(
+                        queue.get(), settings.BOARD_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line: keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse(event, data)
+        finally:
+            self._unsubscribe(day, queue)
+
+    # ──────────── REFRESH ────────────
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.BOARD_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            current = self._generation.value
+            if current == self._seen_generation:
+                continue
+            self._seen_generation = current
+            for day in list(self._subscribers):
+                try:
+                    await self._refresh(day)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Day board refresh failed for %s", day)
+
+    async def _refresh(self, day: date) -> None:
+        async with self._locks[day]:
+            if day not in self._subscribers:
+                return
+            rows = await run_in_threadpool(_load_day, day)
+            if day not in self._subscribers:
+                # The last subscriber left during the load
+                return
+            self.counters["refreshes"] += 1
+            previous = self._rows.get(day, {})
+            upserted = [row for id_, row in rows.items() if previous.get(id_) != row]
+            removed = [id_ for id_ in previous if id_ not in rows]
+            self._rows[day] = rows
+            if not upserted and not removed:
+                return
+            delta = {"upserted": upserted, "removed": removed}
+            for queue in list(self._subscribers.get(day, ())):
+                self._push(queue, delta, rows)
+
+    def _push(self, queue: asyncio.Queue, delta: dict, rows: Dict[int, dict]) -> None:
+        try:
+            queue.put_nowait(("delta", delta))
+            self.counters["deltas"] += 1
+        except asyncio.QueueFull:
+            # Slow client: replace its backlog with the current state
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(("snapshot", list(rows.values())))
+            self.counters["resyncs"] += 1
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "days": {str(day): len(queues) for day, queues in self._subscribers.items()},
+            "generation": self._generation.value,
+            **self.counters,
+        }
+
+
+day_board = DayBoard()
+
+
+def board_changed() -> None:
+    """Call after commits that change appointments, records or invoices."""
+    day_board.changed()
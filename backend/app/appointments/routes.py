@@ -0,0 +1,73 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from backend.app.appointments.availability import availability_cache_stats, free_slots
+from backend.app.appointments.board import day_board
+from backend.app.appointments.schemas import DayAvailabilityResponse
+from backend.app.appointments.service import appointments_on
+from backend.app.core.dependencies import get_current_user, get_db
+from backend.app.core.roles import require_admin
+from backend.app.db.models import StaffUser
+from backend.app.receptionist.schemas import AppointmentResponse
+
+router = APIRouter(prefix="/appointments", tags=["Appointments"])
+
+# Longest date range /availability answers in one call
+MAX_AVAILABILITY_DAYS = 62
+
+
+@router.get("/availability", response_model=List[DayAvailabilityResponse])
+def availability(
+    start: date = Query(...),
+    end: Optional[date] = Query(default=None, description="inclusive; default: start"),
+    db: Session = Depends(get_db),
+    current_user: StaffUser = Depends(get_current_user),
+):
+    """Free slot start times per day in [start, end]."""
+    end = end or start
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days >= MAX_AVAILABILITY_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range is limited to {MAX_AVAILABILITY_DAYS} days",
+        )
+    return free_slots(db, start, end)
+
+
+@router.get("/availability/cache")
+def availability_cache(current_user: StaffUser = Depends(require_admin)):
+    return availability_cache_stats()
+
+
+@router.get("/board", response_model=List[AppointmentResponse])
+def board(
+    day: Optional[date] = Query(default=None, description="default: today"),
+    db: Session = Depends(get_db),
+    current_user: StaffUser = Depends(get_current_user),
+):
+    """The day's enriched appointments (same rows as the stream's snapshot)."""
+    return appointments_on(db, day or date.today())
+
+
+@router.get("/board/stream")
+async def board_stream(
+    day: Optional[date] = Query(default=None, description="default: today"),
+    current_user: StaffUser = Depends(get_current_user),
+):
+    """Server-sent events: a ``snapshot`` of the day's appointments, then a
+    ``delta`` ({"upserted": [...], "removed": [ids]}) after each change."""
+    return StreamingResponse(
+        day_board.stream(day or date.today()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/board/stats")
+def board_stats(current_user: StaffUser = Depends(require_admin)):
+    return day_board.stats()
@@ -0,0 +1,13 @@
+from datetime import date, time
+from typing import List
+
+from pydantic import BaseModel
+
+
+class DayAvailabilityResponse(BaseModel):
+    date: date
+    open: bool
+    free_slots: List[time]   # slot start times, SLOT_MINUTES long
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,77 @@
+"""
+Enriched appointment listings shared by the receptionist and doctor routers.
+
+One SELECT returns each appointment with its owner, pet, latest invoice and
+medical record (if any), so a day board renders from a single request
+instead of a follow-up call per row.  Rows come back as plain dicts shaped
+like ``AppointmentResponse``.
+"""
+
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.app.db.models import Appointment, Invoice, MedicalRecord, Owner, Pet
+
+
+def _latest_invoice(column):
+    # ix_invoices_appointment_id: one index probe per appointment
+    return (
+        select(column)
+        .where(Invoice.appointment_id == Appointment.id)
+        .order_by(Invoice.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def enriched_appointments_stmt(*criteria):
+    """SELECT enriched appointment rows matching ``criteria``, by date/time."""
+    return (
+        select(
+            Appointment.id,
+            Appointment.owner_id,
+            Appointment.pet_id,
+            Appointment.appointment_date,
+            Appointment.appointment_time,
+            Appointment.type,
+            Appointment.status,
+            Appointment.notes,
+            Owner.name.label("owner_name"),
+            Owner.phone.label("owner_phone"),
+            Pet.name.label("pet_name"),
+            Pet.species.label("pet_species"),
+            _latest_invoice(Invoice.id).label("invoice_id"),
+            _latest_invoice(Invoice.payment_status).label("invoice_status"),
+            MedicalRecord.id.label("medical_record_id"),
+        )
+        .join(Owner, Owner.id == Appointment.owner_id)
+        .join(Pet, Pet.id == Appointment.pet_id)
+        # appointment_id is unique on medical_records
+        .outerjoin(MedicalRecord, MedicalRecord.appointment_id == Appointment.id)
+        .where(*criteria)
+        .order_by(Appointment.appointment_date, Appointment.appointment_time, Appointment.id)
+    )
+
+
+def _on_day(day: date):
+    return enriched_appointments_stmt(Appointment.appointment_date == day)
+
+
+def appointments_on(db: Session, day: date) -> List[dict]:
+    return [dict(row) for row in db.execute(_on_day(day)).mappings()]
+
+
+async def appointments_on_async(db: AsyncSession, day: date) -> List[dict]:
+    result = await db.execute(_on_day(day))
+    return [dict(row) for row in result.mappings()]
+
+
+def get_appointment(db: Session, appointment_id: int) -> Optional[dict]:
+    row = db.execute(
+        enriched_appointments_stmt(Appointment.id == appointment_id)
+    ).mappings().first()
+    return dict(row) if row else None
@@ -12,11 +12,11 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ):
-    return authenticate_staff(
+    return await authenticate_staff(
         db=db,
         username=form_data.username,
         password=form_data.password,
@@ -1,23 +1,43 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 
 from backend.app.db.models import StaffUser
-from backend.app.core.security import verify_password, create_access_token
+from backend.app.core.security import verify_and_update_password, create_access_token
 
 
-def authenticate_staff(db: Session, username: str, password: str):
-    staff = (
+def _find_active_staff(db: Session, username: str):
+    return (
         db.query(StaffUser)
         .filter(StaffUser.username == username, StaffUser.is_active == True)
         .first()
     )
 
-    if not staff or not verify_password(password, staff.password_hash):
+
+def _store_rehash(db: Session, staff: StaffUser, new_hash: str) -> None:
+    staff.password_hash = new_hash
+    db.commit()
+
+
+async def authenticate_staff(db: Session, username: str, password: str):
+    # DB work stays on the threadpool; bcrypt runs on the hashing pool so
+    # neither blocks the event loop during a login burst.
+    staff = await run_in_threadpool(_find_active_staff, db, username)
+
+    valid, new_hash = (False, None)
+    if staff:
+        valid, new_hash = await verify_and_update_password(password, staff.password_hash)
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
 
+    # Stored hash used a different BCRYPT_ROUNDS — upgrade it transparently
+    if new_hash:
+        await run_in_threadpool(_store_rehash, db, staff, new_hash)
+
     token_data = {
         "sub": str(staff.id),
         "role": staff.role,
@@ -0,0 +1,88 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.app.core.cache import TTLCache
+from backend.app.core.config import settings
+from backend.app.db.models import Service, ServiceMaterial
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    id: int
+    name: str
+    category: Optional[str]
+    price: Decimal
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable view of the services table at one point in time."""
+    entries: Tuple[CatalogEntry, ...]       # all services, ordered by name
+    active: Tuple[CatalogEntry, ...]        # what the public website shows
+    by_id: Dict[int, CatalogEntry]
+    version: str                            # content hash of the public catalog
+    materials: Dict[int, Tuple[Tuple[int, int], ...]]  # service id -> ((item id, qty), ...)
+
+    @property
+    def etag(self) -> str:
+        return f'W/"{self.version}"'
+
+
+# A single-entry cache: the catalog changes a few times a month. Writes
+# invalidate it in every preloaded worker; the TTL is the backstop when
+# workers don't share the invalidation counter.
+_catalog_cache = TTLCache(maxsize=1, ttl=settings.SERVICE_CATALOG_TTL_SECONDS, shared=True)
+
+
+def _load_snapshot(db: Session) -> CatalogSnapshot:
+    rows = db.query(Service).order_by(Service.name).all()
+    entries = tuple(
+        CatalogEntry(
+            id=s.id,
+            name=s.name,
+            category=s.category,
+            price=s.price,
+            is_active=bool(s.is_active),
+        )
+        for s in rows
+    )
+    active = tuple(e for e in entries if e.is_active)
+
+    # Hash only what the public endpoint renders, so unrelated changes
+    # don't bust crawler caches; equal content gives equal ETags in every
+    # worker process.
+    digest = hashlib.sha1(
+        json.dumps(
+            [(e.name, e.category, str(e.price)) for e in active]
+        ).encode("utf-8")
+    ).hexdigest()[:16]
+
+    materials: Dict[int, list] = {}
+    for m in db.query(ServiceMaterial).order_by(ServiceMaterial.service_id, ServiceMaterial.item_id):
+        materials.setdefault(m.service_id, []).append((m.item_id, m.quantity))
+
+    return CatalogSnapshot(
+        entries=entries,
+        active=active,
+        by_id={e.id: e for e in entries},
+        version=digest,
+        materials={sid: tuple(bom) for sid, bom in materials.items()},
+    )
+
+
+def get_catalog(db: Session) -> CatalogSnapshot:
+    return _catalog_cache.get_or_set("catalog", lambda: _load_snapshot(db))
+
+
+def invalidate_catalog() -> None:
+    _catalog_cache.invalidate()
+
+
+def catalog_cache_stats() -> dict:
+    return _catalog_cache.stats()
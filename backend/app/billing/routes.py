@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from backend.app.db.models import StaffUser, Owner
-from backend.app.notifications.service import send_notification
+from datetime import date as date_type
 
 from backend.app.core.dependencies import get_current_user
+from backend.app.core.pagination import PageParams, set_next_cursor
+from backend.app.core.streaming import ExportFormat, export_response
 from backend.app.core.roles import require_admin, require_receptionist
 from backend.app.db.models import StaffUser
 from backend.app.db.session import get_db
@@ -12,18 +13,27 @@ from backend.app.billing.schemas import (
     ServiceCreate,
     ServiceUpdate,
     ServiceResponse,
+    ServiceMaterialsUpdate,
+    ServiceMaterialResponse,
     InvoiceCreate,
+    InvoiceBatchCreate,
     InvoiceResponse,
     PaymentUpdate,
 )
+from backend.app.billing.catalog import catalog_cache_stats
 from backend.app.billing.service import (
     create_service,
     get_all_services,
     update_service,
+    get_service_materials,
+    set_service_materials,
     create_invoice,
+    create_invoices_batch,
     get_invoice,
     list_invoices,
     mark_invoice_paid,
+    iter_invoice_export,
+    INVOICE_EXPORT_FIELDS,
 )
 
 router = APIRouter(prefix="/billing", tags=["Billing"])
@@ -48,6 +58,13 @@ def services_list(
     return get_all_services(db)
 
 
+@router.get("/services/cache-stats")
+def services_cache_stats(
+    current_user: StaffUser = Depends(require_admin),
+):
+    return catalog_cache_stats()
+
+
 @router.patch("/services/{service_id}", response_model=ServiceResponse)
 def edit_service(
     service_id: int,
@@ -58,6 +75,26 @@ def edit_service(
     return update_service(db, service_id, name=data.name, category=data.category, price=data.price, is_active=data.is_active)
 
 
+@router.get("/services/{service_id}/materials", response_model=List[ServiceMaterialResponse])
+def service_materials(
+    service_id: int,
+    db: Session = Depends(get_db),
+    current_user: StaffUser = Depends(require_admin),
+):
+    return get_service_materials(db, service_id)
+
+
+@router.put("/services/{service_id}/materials", response_model=List[ServiceMaterialResponse])
+def edit_service_materials(
+    service_id: int,
+    data: ServiceMaterialsUpdate,
+    db: Session = Depends(get_db),
+    current_user: StaffUser = Depends(require_admin),
+):
+    """Replace the stock consumed per unit of this service when it is billed."""
+    return set_service_materials(db, service_id, data.materials)
+
+
 # ──────────── INVOICES ────────────
 
 @router.post("/invoices", response_model=InvoiceResponse)
@@ -72,6 +109,34 @@ def new_invoice(
         owner_id=data.owner_id,
         items=data.items,
         discount_pct=data.discount_pct,
+        staff_id=current_user.id,
+    )
+
+
+@router.post("/invoices/batch", response_model=List[InvoiceResponse])
+def new_invoices_batch(
+    data: InvoiceBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: StaffUser = Depends(require_receptionist),
+):
+    """Create many invoices in a single transaction (e.g. end-of-day billing)."""
+    return create_invoices_batch(db, data.invoices, staff_id=current_user.id)
+
+
+@router.get("/invoices/export")
+def export_invoices(
+    start: date_type = Query(...),
+    end: date_type = Query(...),
+    format: ExportFormat = Query(default="ndjson"),
+    current_user: StaffUser = Depends(require_receptionist),
+):
+    """Stream invoices (with items) created in [start, end] as NDJSON or CSV."""
+    flatten = format == "csv"
+    return export_response(
+        lambda db: iter_invoice_export(db, start, end, flatten_items=flatten),
+        fmt=format,
+        filename=f"invoices_{start}_{end}",
+        csv_fields=INVOICE_EXPORT_FIELDS,
     )
 
 
@@ -86,12 +151,18 @@ def view_invoice(
 
 @router.get("/invoices", response_model=List[InvoiceResponse])
 def invoices_list(
+    response: Response,
     owner_id: Optional[int] = Query(default=None),
     date: Optional[str] = Query(default=None),
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: StaffUser = Depends(get_current_user),
 ):
-    return list_invoices(db, owner_id=owner_id, date=date)
+    invoices, next_cursor = list_invoices(
+        db, owner_id=owner_id, date=date, after_id=page.after_id, limit=page.limit
+    )
+    set_next_cursor(response, next_cursor)
+    return invoices
 
 
 @router.patch("/invoices/{invoice_id}/pay", response_model=InvoiceResponse)
@@ -101,25 +172,5 @@ def pay_invoice(
     db: Session = Depends(get_db),
     current_user: StaffUser = Depends(require_receptionist),
 ):
-    invoice = mark_invoice_paid(db, invoice_id, payment_method=data.payment_method)
-
-    # Auto-send payment confirmation notification
-    try:
-        owner = db.query(Owner).filter(Owner.id == invoice.owner_id).first()
-        if owner:
-            msg = (
-                f"Hi {owner.name}! Payment of ₹{invoice.final_amount:,.2f} received "
-                f"via {data.payment_method} for Invoice #{invoice.id}. "
-                f"Thank you! — VetCore Pet Clinic"
-            )
-            send_notification(
-                db=db,
-                owner_id=owner.id,
-                message=msg,
-                channel="sms",
-                appointment_id=invoice.appointment_id,
-            )
-    except Exception:
-        pass  # Don't fail payment if notification fails
-
-    return invoice
+    # Also queues the payment confirmation to the owner
+    return mark_invoice_paid(db, invoice_id, payment_method=data.payment_method)
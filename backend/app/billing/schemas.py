@@ -51,6 +51,35 @@ class ServiceResponse(BaseModel):
         from_attributes = True
 
 
+class ServiceMaterialInput(BaseModel):
+    item_id: int
+    quantity: int
+
+    @field_validator("quantity")
+    @classmethod
+    def quantity_must_be_positive(cls, v: int) -> int:
+        if v <= 0:
+            raise ValueError("Quantity must be greater than zero")
+        return v
+
+
+class ServiceMaterialsUpdate(BaseModel):
+    materials: List[ServiceMaterialInput]
+
+    @field_validator("materials")
+    @classmethod
+    def items_unique(cls, v: List[ServiceMaterialInput]) -> List[ServiceMaterialInput]:
+        if len({m.item_id for m in v}) != len(v):
+            raise ValueError("Each item can appear only once")
+        return v
+
+
+class ServiceMaterialResponse(BaseModel):
+    item_id: int
+    item_name: str
+    quantity: int
+
+
 # ──────────── INVOICE ────────────
 
 class InvoiceItemInput(BaseModel):
@@ -65,6 +94,19 @@ class InvoiceCreate(BaseModel):
     discount_pct: Optional[Decimal] = Decimal("0")
 
 
+class InvoiceBatchCreate(BaseModel):
+    invoices: List[InvoiceCreate]
+
+    @field_validator("invoices")
+    @classmethod
+    def batch_size_within_limits(cls, v: List[InvoiceCreate]) -> List[InvoiceCreate]:
+        if not v:
+            raise ValueError("Batch must contain at least one invoice")
+        if len(v) > 1000:
+            raise ValueError("Batch cannot contain more than 1000 invoices")
+        return v
+
+
 class InvoiceItemResponse(BaseModel):
     id: int
     service_id: int
@@ -1,10 +1,21 @@
+from collections import defaultdict
+from datetime import date as date_type, timedelta
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, selectinload
 
-from backend.app.db.models import Service, Invoice, InvoiceItem
+from backend.app.billing.catalog import CatalogEntry, get_catalog, invalidate_catalog
+from backend.app.core.pagination import DEFAULT_PAGE_SIZE, keyset_page
+from backend.app.db.models import InventoryItem, Service, ServiceMaterial, Invoice, InvoiceItem
+from backend.app.inventory.expiry import invalidate_expiry_alerts
+from backend.app.inventory.service import StockMovement, apply_stock_movements
+from backend.app.notifications.dispatcher import queue_notification
+from backend.app.reports.rollup import apply_rollups, capture_rollups
+from backend.app.reports.service import invalidate_dashboard
+from backend.app.appointments.board import board_changed
 
 
 # ──────────── SERVICES ────────────
@@ -16,12 +27,13 @@ def create_service(db: Session, name: str, category: str, price: Decimal) -> Ser
     service = Service(name=name, category=category, price=price)
     db.add(service)
     db.commit()
+    invalidate_catalog()
     db.refresh(service)
     return service
 
 
-def get_all_services(db: Session) -> List[Service]:
-    return db.query(Service).order_by(Service.name).all()
+def get_all_services(db: Session) -> List[CatalogEntry]:
+    return list(get_catalog(db).entries)
 
 
 def update_service(
@@ -48,41 +60,150 @@ def update_service(
     if is_active is not None:
         service.is_active = is_active
     db.commit()
+    invalidate_catalog()
     db.refresh(service)
     return service
 
 
+def get_service_materials(db: Session, service_id: int) -> List[dict]:
+    if not db.get(Service, service_id):
+        raise HTTPException(status_code=404, detail="Service not found")
+    rows = (
+        db.query(ServiceMaterial.item_id, InventoryItem.name, ServiceMaterial.quantity)
+        .join(InventoryItem, InventoryItem.id == ServiceMaterial.item_id)
+        .filter(ServiceMaterial.service_id == service_id)
+        .order_by(ServiceMaterial.item_id)
+        .all()
+    )
+    return [{"item_id": r.item_id, "item_name": r.name, "quantity": r.quantity} for r in rows]
+
+
+def set_service_materials(db: Session, service_id: int, materials: list) -> List[dict]:
+    """Replace a service's bill of materials."""
+    if not db.get(Service, service_id):
+        raise HTTPException(status_code=404, detail="Service not found")
+    item_ids = {m.item_id for m in materials}
+    found = {
+        row[0] for row in
+        db.query(InventoryItem.id).filter(InventoryItem.id.in_(item_ids)).all()
+    } if item_ids else set()
+    missing = sorted(item_ids - found)
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Item {', '.join(map(str, missing))} not found",
+        )
+
+    db.query(ServiceMaterial).filter(ServiceMaterial.service_id == service_id).delete()
+    if materials:
+        db.execute(insert(ServiceMaterial), [
+            {"service_id": service_id, "item_id": m.item_id, "quantity": m.quantity}
+            for m in materials
+        ])
+    db.commit()
+    invalidate_catalog()
+    return get_service_materials(db, service_id)
+
+
 # ──────────── INVOICES ────────────
 
+def _service_prices(db: Session, service_ids) -> Dict[int, Decimal]:
+    """Resolve every referenced service price from the cached catalog.
+
+    Ids the catalog doesn't know yet (e.g. created by another worker since
+    it was loaded) are looked up with a single IN query.
+    """
+    service_ids = set(service_ids)
+    by_id = get_catalog(db).by_id
+    prices = {sid: by_id[sid].price for sid in service_ids if sid in by_id}
+
+    unknown = service_ids - prices.keys()
+    if unknown:
+        prices.update(
+            db.query(Service.id, Service.price)
+            .filter(Service.id.in_(unknown))
+            .all()
+        )
+
+    missing = sorted(service_ids - prices.keys())
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Service {', '.join(map(str, missing))} not found",
+        )
+    return prices
+
+
+def _service_materials(db: Session, service_ids) -> Dict[int, Tuple[Tuple[int, int], ...]]:
+    """Bills of materials from the cached catalog; services it doesn't know
+    yet are looked up with a single IN query, as for prices."""
+    catalog = get_catalog(db)
+    service_ids = set(service_ids)
+    materials = {sid: catalog.materials.get(sid, ()) for sid in service_ids if sid in catalog.by_id}
+
+    unknown = service_ids - materials.keys()
+    if unknown:
+        found = defaultdict(list)
+        for sid, item_id, quantity in (
+            db.query(ServiceMaterial.service_id, ServiceMaterial.item_id, ServiceMaterial.quantity)
+            .filter(ServiceMaterial.service_id.in_(unknown))
+            .order_by(ServiceMaterial.item_id)
+        ):
+            found[sid].append((item_id, quantity))
+        materials.update({sid: tuple(found[sid]) for sid in unknown})
+    return materials
+
+
+def _stock_movements(db: Session, invoices: Iterable[Tuple[int, list]]) -> List[StockMovement]:
+    """Stock consumed by each (invoice id, line item dicts): one movement
+    per invoice and item."""
+    invoices = list(invoices)
+    materials = _service_materials(
+        db, (line["service_id"] for _, lines in invoices for line in lines)
+    )
+    movements = []
+    for invoice_id, lines in invoices:
+        used: Dict[int, int] = defaultdict(int)
+        for line in lines:
+            for item_id, quantity in materials[line["service_id"]]:
+                used[item_id] += quantity * line["quantity"]
+        movements.extend(
+            StockMovement(item_id, -quantity, f"Invoice #{invoice_id}")
+            for item_id, quantity in used.items() if quantity
+        )
+    return movements
+
+
+def _price_invoice(items: list, prices: Dict[int, Decimal], discount_pct: Decimal):
+    """Return (line item dicts, total, final) for one invoice's inputs."""
+    total = Decimal("0")
+    lines = []
+    for item_input in items:
+        unit_price = prices[item_input.service_id]
+        line_total = unit_price * item_input.quantity
+        total += line_total
+        lines.append({
+            "service_id": item_input.service_id,
+            "quantity": item_input.quantity,
+            "unit_price": unit_price,
+            "line_total": line_total,
+        })
+
+    final = total * (1 - discount_pct / 100)
+    return lines, total, final
+
+
 def create_invoice(
     db: Session,
     appointment_id: int,
     owner_id: int,
     items: list,
     discount_pct: Decimal = Decimal("0"),
+    staff_id: Optional[int] = None,
 ) -> Invoice:
-    total = Decimal("0")
-    invoice_items = []
-
-    for item_input in items:
-        service = db.query(Service).filter(Service.id == item_input.service_id).first()
-        if not service:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Service {item_input.service_id} not found",
-            )
-        line_total = service.price * item_input.quantity
-        total += line_total
-        invoice_items.append(
-            InvoiceItem(
-                service_id=service.id,
-                quantity=item_input.quantity,
-                unit_price=service.price,
-                line_total=line_total,
-            )
-        )
-
-    final = total * (1 - discount_pct / 100)
+    prices = _service_prices(db, (i.service_id for i in items))
+    lines, total, final = _price_invoice(items, prices, discount_pct)
+    rollups = capture_rollups(db, [appointment_id])
 
     invoice = Invoice(
         appointment_id=appointment_id,
@@ -94,15 +215,84 @@ def create_invoice(
     db.add(invoice)
     db.flush()  # get invoice.id
 
-    for ii in invoice_items:
-        ii.invoice_id = invoice.id
-        db.add(ii)
+    for line in lines:
+        db.add(InvoiceItem(invoice_id=invoice.id, **line))
 
+    # Consumables leave stock in the same transaction; not enough stock
+    # rejects the invoice
+    movements = _stock_movements(db, [(invoice.id, lines)])
+    apply_stock_movements(db, movements, staff_id)
+
+    apply_rollups(db, [appointment_id], rollups)
     db.commit()
+    invalidate_dashboard()
+    if movements:
+        invalidate_expiry_alerts()
+    board_changed()
     db.refresh(invoice)
     return invoice
 
 
+def create_invoices_batch(
+    db: Session, invoices: list, staff_id: Optional[int] = None
+) -> List[Invoice]:
+    """Create many invoices in one transaction.
+
+    Prices for every referenced service are resolved up front in one query;
+    invoices and their items are then written with two bulk INSERTs, and the
+    whole batch's stock consumption is applied as one set of movements.
+    """
+    prices = _service_prices(
+        db, (item.service_id for inv in invoices for item in inv.items)
+    )
+
+    invoice_rows, line_groups = [], []
+    for inv in invoices:
+        discount_pct = inv.discount_pct or Decimal("0")
+        lines, total, final = _price_invoice(inv.items, prices, discount_pct)
+        invoice_rows.append({
+            "appointment_id": inv.appointment_id,
+            "owner_id": inv.owner_id,
+            "total_amount": total,
+            "discount_pct": discount_pct,
+            "final_amount": final,
+        })
+        line_groups.append(lines)
+
+    appointment_ids = {row["appointment_id"] for row in invoice_rows}
+    rollups = capture_rollups(db, appointment_ids)
+    invoice_ids = db.execute(
+        insert(Invoice).returning(Invoice.id, sort_by_parameter_order=True),
+        invoice_rows,
+    ).scalars().all()
+
+    item_rows = [
+        {"invoice_id": invoice_id, **line}
+        for invoice_id, lines in zip(invoice_ids, line_groups)
+        for line in lines
+    ]
+    if item_rows:
+        db.execute(insert(InvoiceItem), item_rows)
+
+    movements = _stock_movements(db, zip(invoice_ids, line_groups))
+    apply_stock_movements(db, movements, staff_id)
+
+    apply_rollups(db, appointment_ids, rollups)
+    db.commit()
+    invalidate_dashboard()
+    if movements:
+        invalidate_expiry_alerts()
+    board_changed()
+
+    return (
+        db.query(Invoice)
+        .options(selectinload(Invoice.items))
+        .filter(Invoice.id.in_(invoice_ids))
+        .order_by(Invoice.id)
+        .all()
+    )
+
+
 def get_invoice(db: Session, invoice_id: int) -> Invoice:
     invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
     if not invoice:
@@ -114,22 +304,99 @@ def list_invoices(
     db: Session,
     owner_id: Optional[int] = None,
     date: Optional[str] = None,
-) -> List[Invoice]:
+    after_id: Optional[int] = None,
+    limit: Optional[int] = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[Invoice], Optional[int]]:
     q = db.query(Invoice)
     if owner_id:
         q = q.filter(Invoice.owner_id == owner_id)
     if date:
         from sqlalchemy import cast, Date
         q = q.filter(cast(Invoice.created_at, Date) == date)
-    return q.order_by(Invoice.created_at.desc()).all()
+    return keyset_page(q, Invoice, after_id, limit, order_col=Invoice.created_at)
+
+
+INVOICE_EXPORT_FIELDS = [
+    "invoice_id", "appointment_id", "owner_id", "created_at", "payment_status",
+    "payment_method", "total_amount", "discount_pct", "final_amount",
+    "item_id", "service_id", "quantity", "unit_price", "line_total",
+]
+
+
+def iter_invoice_export(
+    db: Session,
+    start: date_type,
+    end: date_type,
+    flatten_items: bool = False,
+) -> Iterator[dict]:
+    """Yield invoices created in [start, end] from a server-side cursor.
+
+    Items are batch-loaded per chunk. With ``flatten_items`` each line item
+    becomes its own row (for CSV); otherwise items are nested.
+    """
+    invoices = (
+        db.query(Invoice)
+        .options(selectinload(Invoice.items))
+        .filter(
+            Invoice.created_at >= start,
+            Invoice.created_at < end + timedelta(days=1),
+        )
+        .order_by(Invoice.id)
+        .yield_per(500)
+    )
+
+    for inv in invoices:
+        row = {
+            "invoice_id": inv.id,
+            "appointment_id": inv.appointment_id,
+            "owner_id": inv.owner_id,
+            "created_at": inv.created_at,
+            "payment_status": inv.payment_status,
+            "payment_method": inv.payment_method,
+            "total_amount": inv.total_amount,
+            "discount_pct": inv.discount_pct,
+            "final_amount": inv.final_amount,
+        }
+        items = [
+            {
+                "item_id": it.id,
+                "service_id": it.service_id,
+                "quantity": it.quantity,
+                "unit_price": it.unit_price,
+                "line_total": it.line_total,
+            }
+            for it in inv.items
+        ]
+        if not flatten_items:
+            yield {**row, "items": items}
+        elif not items:
+            yield row
+        else:
+            for item in items:
+                yield {**row, **item}
 
 
 def mark_invoice_paid(db: Session, invoice_id: int, payment_method: str) -> Invoice:
     invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
+    rollups = capture_rollups(db, [invoice.appointment_id])
     invoice.payment_status = "paid"
     invoice.payment_method = payment_method
+    apply_rollups(db, [invoice.appointment_id], rollups)
+    queue_notification(
+        db,
+        owner_id=invoice.owner_id,
+        template="payment_received",
+        context={
+            "amount": f"{invoice.final_amount:,.2f}",
+            "payment_method": payment_method,
+            "invoice_id": invoice.id,
+        },
+        appointment_id=invoice.appointment_id,
+    )
     db.commit()
+    invalidate_dashboard()
+    board_changed()
     db.refresh(invoice)
     return invoice
@@ -0,0 +1,151 @@
+import ctypes
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class SharedGeneration:
+    """Invalidation counter in shared memory.
+
+    Created at import time, so with gunicorn's ``preload_app`` it exists
+    before the workers are forked and every worker maps the same counter.
+    Without preloading each worker gets its own counter and cross-worker
+    staleness is bounded by the cache TTL alone.
+    """
+
+    def __init__(self):
+        self._value = multiprocessing.Value(ctypes.c_uint64, 0)
+
+    @property
+    def value(self) -> int:
+        # An aligned 64-bit read needs no lock; only increments race
+        return self._value.get_obj().value
+
+    def bump(self) -> int:
+        with self._value.get_lock():
+            self._value.value += 1
+            return self._value.value
+
+
+class TTLCache:
+    """Thread-safe, in-process LRU cache whose entries expire after ``ttl`` seconds.
+
+    Sync route handlers run in Starlette's threadpool, so every access is
+    guarded by a lock.  Hit/miss counters are kept so callers can check the
+    cache actually pays for itself.
+
+    With ``shared=True`` invalidations are also published to the other
+    worker processes through a ``SharedGeneration``: a worker that sees the
+    counter move drops its whole cache on the next access.
+
+    A value computed from the database can be older than an invalidation
+    that happened while it was being computed.  Take ``generation()`` before
+    reading and pass it to ``set(..., if_generation=...)``: the value is
+    dropped if anything was invalidated in between.  ``get_or_set`` does
+    this itself.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, shared: bool = False):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = SharedGeneration() if shared else None
+        self._seen_generation = 0
+        self._local_generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_sets = 0
+
+    def _sync_generation(self) -> None:
+        # Caller holds self._lock
+        if self._generation is not None:
+            current = self._generation.value
+            if current != self._seen_generation:
+                self._data.clear()
+                self._seen_generation = current
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            self._sync_generation()
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def generation(self) -> tuple:
+        """Token that changes whenever this cache (or, if shared, any
+        worker's copy of it) is invalidated."""
+        with self._lock:
+            shared = self._generation.value if self._generation is not None else 0
+            return (self._local_generation, shared)
+
+    def set(self, key: Hashable, value: Any, if_generation: Optional[tuple] = None) -> bool:
+        """Store ``value``; with ``if_generation``, only if nothing was
+        invalidated since that token was taken.  Returns whether it was stored."""
+        with self._lock:
+            if if_generation is not None:
+                shared = self._generation.value if self._generation is not None else 0
+                if (self._local_generation, shared) != if_generation:
+                    self.stale_sets += 1
+                    return False
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, computing it with ``factory`` on a miss."""
+        generation = self.generation()
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value, if_generation=generation)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or every entry when ``key`` is None."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+            self.invalidations += 1
+            self._local_generation += 1
+            if self._generation is not None:
+                # Our own cache is already up to date, unless another worker
+                # bumped the counter in between
+                if self._generation.bump() == self._seen_generation + 1:
+                    self._seen_generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale_sets": self.stale_sets,
+                "shared_generation": (
+                    self._generation.value if self._generation is not None else None
+                ),
+            }
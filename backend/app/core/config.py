@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from datetime import time
+from typing import Dict, List, Literal, Optional, Set
 from pathlib import Path
 
 # Resolve project root (3 levels up from this file: core → app → backend → project root)
@@ -19,6 +20,111 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     ALLOWED_ORIGINS: str = "http://localhost:3000"
 
+    # What the app does with the schema at startup:
+    #   migrate — apply pending migrations (takes the migration lock)
+    #   check   — one version query; refuse to start if the schema is behind
+    #   skip    — nothing
+    # Unset: migrate in development, check everywhere else.
+    SCHEMA_STARTUP_MODE: Optional[Literal["migrate", "check", "skip"]] = None
+
+    # Serve the hot read endpoints from an asyncio engine (psycopg async)
+    # instead of the sync engine + threadpool.
+    DB_ASYNC: bool = False
+
+    # Server worker processes (also read by gunicorn) and request-count
+    # recycling; see backend/gunicorn.conf.py
+    WEB_CONCURRENCY: int = 1
+    WORKER_MAX_REQUESTS: int = 2000
+    WORKER_MAX_REQUESTS_JITTER: int = 200
+
+    # Connection pool (per worker process, per engine)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Total connections all workers may open (e.g. the Neon compute limit).
+    # When set, each engine's pool is capped to its share of the budget.
+    DB_MAX_CONNECTIONS: Optional[int] = None
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 300       # seconds; NeonDB drops idle connections
+    DB_POOL_PRE_PING: bool = True    # one extra round trip per checkout
+    DB_POOL_USE_LIFO: bool = False   # LIFO lets idle connections age out
+
+    # In-process cache for GET /reports/dashboard
+    DASHBOARD_CACHE_TTL_SECONDS: float = 30
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 8
+
+    # Authenticated-principal cache used by get_current_user
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = 60
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 1024
+
+    # Process-local service catalog (writes invalidate it in every worker
+    # forked from a preloaded app; otherwise the TTL bounds staleness)
+    SERVICE_CATALOG_TTL_SECONDS: float = 300
+
+    # In-memory owner search index, used when the database isn't PostgreSQL
+    OWNER_SEARCH_INDEX_TTL_SECONDS: float = 300
+
+    # Day board event stream (appointments/board.py)
+    BOARD_POLL_SECONDS: float = 1             # how soon other workers' changes show up
+    BOARD_KEEPALIVE_SECONDS: float = 15
+
+    # Appointment slots (appointments/availability.py)
+    SLOT_MINUTES: int = 15                    # should divide 60
+    SLOT_CAPACITY: int = 1                    # scheduled appointments per slot
+    CLINIC_OPENS: time = time(9, 0)
+    CLINIC_CLOSES: time = time(19, 0)
+    CLINIC_CLOSED_WEEKDAYS: str = "6"         # comma-separated, Monday = 0
+    AVAILABILITY_CACHE_TTL_SECONDS: float = 60
+    AVAILABILITY_CACHE_MAX_DAYS: int = 400
+
+    # Password hashing: bcrypt cost and the dedicated hashing pool
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Notification dispatch (notifications/dispatcher.py)
+    NOTIFICATION_PROVIDER: str = "mock"       # or "package.module:ProviderClass"
+    NOTIFICATION_OUTBOX: bool = False         # durable table-backed queue
+    NOTIFICATION_BATCH_SIZE: int = 100
+    NOTIFICATION_MAX_ATTEMPTS: int = 3
+    NOTIFICATION_RETRY_BACKOFF_SECONDS: float = 0.5
+    NOTIFICATION_POLL_SECONDS: float = 5      # outbox mode: how often to look for rows
+    # Per-channel send rate, messages/second per worker: "channel=rate,..."
+    NOTIFICATION_RATE_LIMITS: str = "sms=10,whatsapp=10,email=50"
+
+    # Expiry alert buckets, cached per day (inventory/expiry.py)
+    EXPIRY_ALERT_CACHE_TTL_SECONDS: float = 300
+
+    # Reorder forecasting (inventory/forecast.py)
+    FORECAST_HISTORY_DAYS: int = 90           # consumption window
+    FORECAST_SMA_DAYS: int = 28               # moving average / variability window
+    FORECAST_EWMA_ALPHA: float = 0.1
+    FORECAST_LEAD_TIME_DAYS: int = 7          # order to delivery
+    FORECAST_COVER_DAYS: int = 30             # demand a suggested order covers beyond lead time
+    FORECAST_SERVICE_Z: float = 1.65          # safety stock, std devs (~95% service level)
+
+    # Reminder campaigns (notifications/reminders.py)
+    REMINDER_CONCURRENCY: int = 50            # messages in flight at once
+    REMINDER_CHUNK_SIZE: int = 1000           # rows per insert / status update
+
+    @property
+    def schema_startup_mode(self) -> str:
+        if self.SCHEMA_STARTUP_MODE:
+            return self.SCHEMA_STARTUP_MODE
+        return "migrate" if self.ENVIRONMENT == "development" else "check"
+
+    @property
+    def notification_rate_limits(self) -> Dict[str, float]:
+        limits = {}
+        for item in self.NOTIFICATION_RATE_LIMITS.split(","):
+            if "=" in item:
+                channel, rate = item.split("=", 1)
+                limits[channel.strip()] = float(rate)
+        return limits
+
+    @property
+    def clinic_closed_weekdays(self) -> Set[int]:
+        return {int(day) for day in self.CLINIC_CLOSED_WEEKDAYS.split(",") if day.strip()}
+
     @property
     def allowed_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
@@ -5,10 +5,31 @@ from sqlalchemy.orm import Session
 
 from backend.app.db.session import get_db
 from backend.app.db.models import StaffUser
+from backend.app.core.cache import TTLCache
+from backend.app.core.config import settings
 from backend.app.core.security import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Active staff principals keyed by staff id. Entries are detached StaffUser
+# instances with all columns loaded; they are read-only for route handlers.
+# Shared invalidation: deactivating a user logs them out in every worker.
+_principal_cache = TTLCache(
+    maxsize=settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+    shared=True,
+)
+
+
+def invalidate_principal(staff_id: int) -> None:
+    """Forget a cached principal — call after changing a staff member's
+    status, profile or credentials so the next request reloads it."""
+    _principal_cache.invalidate(staff_id)
+
+
+def principal_cache_stats() -> dict:
+    return _principal_cache.stats()
+
 
 def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -29,6 +50,13 @@ def get_current_user(
             detail="Invalid token payload",
         )
 
+    # Taken before the lookup: a deactivation committed while we read the
+    # row invalidates it, and then the possibly stale row is not cached
+    generation = _principal_cache.generation()
+    staff = _principal_cache.get(int(staff_id))
+    if staff is not None:
+        return staff
+
     staff = (
         db.query(StaffUser)
         .filter(StaffUser.id == int(staff_id), StaffUser.is_active == True)
@@ -41,6 +69,8 @@ def get_current_user(
             detail="User not found or inactive",
         )
 
+    db.expunge(staff)
+    _principal_cache.set(staff.id, staff, if_generation=generation)
     return staff
 
 
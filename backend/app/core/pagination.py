@@ -0,0 +1,82 @@
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import and_, or_, select
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """Shared ``after_id`` / ``limit`` query parameters for keyset-paginated lists.
+
+    Without either parameter the whole list is returned, as before these
+    endpoints were paginated; clients opt in by sending ``limit``.
+    """
+
+    def __init__(
+        self,
+        after_id: Optional[int] = Query(
+            default=None, description="Return rows after this id (the previous page's X-Next-Cursor)"
+        ),
+        limit: Optional[int] = Query(
+            default=None, ge=1, le=MAX_PAGE_SIZE,
+            description=f"Page size (default {DEFAULT_PAGE_SIZE} with after_id, else unpaginated)",
+        ),
+    ):
+        self.after_id = after_id
+        if limit is None and after_id is not None:
+            limit = DEFAULT_PAGE_SIZE
+        self.limit = limit
+
+
+def keyset_page(
+    query,
+    model,
+    after_id: Optional[int],
+    limit: Optional[int],
+    order_col=None,
+) -> Tuple[List, Optional[int]]:
+    """Fetch one page of ``query`` newest-first, ordered by ``(order_col, id)``.
+
+    The cursor is just the last row's id: its ``order_col`` value is looked up
+    by primary key, so callers never have to encode timestamps. Ties
+    on ``order_col`` are broken by id, keeping the ordering stable.
+
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    ``limit=None`` returns every row.  A cursor whose row no longer exists is
+    rejected with 400 when ordering by ``order_col``, since there is no
+    position to resume from.
+    """
+    if after_id is not None:
+        if order_col is None:
+            query = query.filter(model.id < after_id)
+        else:
+            anchor = select(order_col).where(model.id == after_id)
+            if query.session.execute(anchor).first() is None:
+                raise HTTPException(status_code=400, detail="Unknown or expired cursor")
+            # Compared in SQL against the stored value: a round-tripped
+            # datetime need not compare equal to it (e.g. SQLite text)
+            anchor = anchor.scalar_subquery()
+            query = query.filter(
+                or_(order_col < anchor, and_(order_col == anchor, model.id < after_id))
+            )
+
+    ordering = [model.id.desc()]
+    if order_col is not None:
+        ordering.insert(0, order_col.desc())
+
+    if limit is None:
+        return query.order_by(*ordering).all(), None
+
+    rows = query.order_by(*ordering).limit(limit + 1).all()
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[int]) -> None:
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = str(next_cursor)
@@ -1,21 +1,139 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from jose import jwt, JWTError
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
 from backend.app.core.config import settings
+from backend.app.core.metrics import LatencyHistogram
+
+# passlib and python-jose are imported on first use rather than at import
+# time; together they are ~45 ms of every cold start and no boot path needs them.
+
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    """Password hashing context. Hashes at any other cost than BCRYPT_ROUNDS
+    are reported by needs_update(), so logins transparently rehash them."""
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+    )
+
+
+class PasswordHasherPool:
+    """Bounded worker pool for bcrypt work.
+
+    bcrypt's C implementation releases the GIL, so a small thread pool gets
+    real parallelism without the pickling cost of a process pool.  At most
+    ``max_pending`` operations may be queued or running; beyond that callers
+    get a 503 instead of piling onto the queue during a login burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+        self.latency = {"hash": LatencyHistogram(), "verify": LatencyHistogram()}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created lazily so forked worker processes never inherit pool threads
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    def submit(self, op: str, fn: Callable, *args) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many password operations in progress, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+            executor = self._get_executor()
+
+        started = time.perf_counter()
+
+        def _done(_: Future) -> None:
+            # Latency includes time spent queued behind other hashes
+            self.latency[op].observe(time.perf_counter() - started)
+            with self._lock:
+                self._pending -= 1
+
+        future = executor.submit(fn, *args)
+        future.add_done_callback(_done)
+        return future
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = self._pending
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": pending,
+            "rejected": self.rejected,
+            "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+            "hash": self.latency["hash"].snapshot(),
+            "verify": self.latency["verify"].snapshot(),
+        }
+
+
+password_hasher = PasswordHasherPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def hash_password(password: str) -> str:
     """Hash a plain password"""
-    return pwd_context.hash(password)
+    return password_hasher.submit("hash", pwd_context().hash, password).result()
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash several passwords in parallel on the hashing pool"""
+    futures = [password_hasher.submit("hash", pwd_context().hash, p) for p in passwords]
+    return [f.result() for f in futures]
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.submit(
+        "verify", pwd_context().verify, plain_password, hashed_password
+    ).result()
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify on the hashing pool without blocking the event loop.
+
+    Returns ``(valid, new_hash)``; ``new_hash`` is set when the stored hash
+    was made with a different bcrypt cost and should be replaced.
+    """
+    future = password_hasher.submit(
+        "verify", pwd_context().verify_and_update, plain_password, hashed_password
+    )
+    return await asyncio.wrap_future(future)
 
 def create_access_token(data: dict) -> str:
     """Create JWT access token"""
+    from jose import jwt
+
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.JWT_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
@@ -23,6 +141,8 @@ def create_access_token(data: dict) -> str:
 
 def decode_access_token(token: str) -> dict:
     """Decode and validate JWT"""
+    from jose import jwt, JWTError
+
     try:
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
         return payload
@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+from typing import Callable, Iterable, Iterator, List, Literal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from backend.app.db.session import SessionLocal
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Rows are buffered into chunks of roughly this many bytes before being sent
+_CHUNK_BYTES = 64 * 1024
+
+
+def _ndjson_lines(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, default=str) + "\n"
+
+
+def _csv_lines(rows: Iterable[dict], fieldnames: List[str]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    yield buf.getvalue()
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[bytes]:
+    parts, size = [], 0
+    for line in lines:
+        parts.append(line)
+        size += len(line)
+        if size >= _CHUNK_BYTES:
+            yield "".join(parts).encode("utf-8")
+            parts, size = [], 0
+    if parts:
+        yield "".join(parts).encode("utf-8")
+
+
+def _rows_with_own_session(produce: Callable[[Session], Iterable[dict]]) -> Iterator[dict]:
+    # The stream outlives the request handler, so it owns its session
+    db = SessionLocal()
+    try:
+        yield from produce(db)
+    finally:
+        db.close()
+
+
+def export_response(
+    produce: Callable[[Session], Iterable[dict]],
+    fmt: ExportFormat,
+    filename: str,
+    csv_fields: List[str],
+) -> StreamingResponse:
+    """Stream rows produced by ``produce(db)`` as NDJSON or CSV.
+
+    ``produce`` should iterate a server-side cursor (``yield_per``) so memory
+    stays bounded however large the range is.
+    """
+    rows = _rows_with_own_session(produce)
+    if fmt == "csv":
+        lines, media_type = _csv_lines(rows, csv_fields), "text/csv"
+    else:
+        lines, media_type = _ndjson_lines(rows), "application/x-ndjson"
+
+    return StreamingResponse(
+        _chunked(lines),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
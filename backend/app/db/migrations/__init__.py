@@ -0,0 +1,128 @@
+"""
+Schema migrations.
+
+Each migration is a module in this package exposing ``VERSION`` (int),
+``DESCRIPTION`` and ``upgrade(conn)``.  Applied versions are recorded in the
+``schema_migrations`` table; ``upgrade`` applies whatever is pending, each
+migration in its own transaction.
+
+Migrations must be idempotent (``checkfirst=True`` / ``IF NOT EXISTS``):
+databases created by the old ``create_all`` startup already have some of
+the objects a migration creates.  They spell out their own tables and DDL
+instead of using the models, so a migration keeps doing what it did when it
+was written; a model change needs a new migration
+(backend/tests/test_migrations.py catches one that is missing).
+
+At startup the app either applies migrations (development) or only checks
+the recorded version (``ensure_current``), which is a single query and takes
+no lock; see ``SCHEMA_STARTUP_MODE``.
+
+Usage:
+    python -m backend.app.db.migrations upgrade
+    python -m backend.app.db.migrations current
+    python -m backend.app.db.migrations check-plans
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import exc, Column, Integer, String, MetaData, Table, TIMESTAMP, func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from backend.app.db.migrations import (
+    m0001_baseline,
+    m0002_hot_query_indexes,
+    m0003_notification_outbox,
+    m0004_reminder_sends,
+    m0005_owner_search,
+    m0006_inventory_expiry_index,
+    m0007_inventory_snapshots,
+    m0008_service_materials,
+)
+
+MIGRATIONS = [
+    m0001_baseline,
+    m0002_hot_query_indexes,
+    m0003_notification_outbox,
+    m0004_reminder_sends,
+    m0005_owner_search,
+    m0006_inventory_expiry_index,
+    m0007_inventory_snapshots,
+    m0008_service_materials,
+]
+LATEST_VERSION = MIGRATIONS[-1].VERSION
+
+# Arbitrary key for pg_advisory_xact_lock: serializes concurrent migrators
+# (e.g. several workers booting at once)
+_MIGRATION_LOCK_KEY = 727_001
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", TIMESTAMP, server_default=func.now(), nullable=False),
+)
+
+
+def current_version(conn: Connection) -> Optional[int]:
+    """Highest applied migration version, or None if nothing is applied."""
+    return conn.execute(select(func.max(schema_migrations.c.version))).scalar()
+
+
+def schema_version(engine: Engine) -> Optional[int]:
+    """Applied version, or None when the database has never been migrated."""
+    with engine.connect() as conn:
+        try:
+            return current_version(conn)
+        except exc.DBAPIError:
+            # schema_migrations does not exist yet
+            return None
+
+
+def ensure_current(engine: Engine) -> int:
+    """Fail fast unless the database is at ``LATEST_VERSION`` or newer."""
+    version = schema_version(engine)
+    if version is None or version < LATEST_VERSION:
+        raise RuntimeError(
+            f"Database schema is at version {version}, this build needs "
+            f"{LATEST_VERSION}. Run: python -m backend.app.db.migrations upgrade"
+        )
+    return version
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[int]:
+    """Apply pending migrations up to ``target`` (default: latest).
+
+    Returns the versions applied by this call.
+    """
+    # Fast path: an up-to-date database costs one query and no lock
+    version = schema_version(engine)
+    if version is not None and version >= (LATEST_VERSION if target is None else target):
+        return []
+
+    _metadata.create_all(engine, checkfirst=True)
+    applied = []
+
+    for migration in MIGRATIONS:
+        if target is not None and migration.VERSION > target:
+            break
+        with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+            done = conn.execute(
+                select(schema_migrations.c.version)
+                .where(schema_migrations.c.version == migration.VERSION)
+            ).first()
+            if done:
+                continue
+            migration.upgrade(conn)
+            conn.execute(
+                schema_migrations.insert().values(
+                    version=migration.VERSION,
+                    description=migration.DESCRIPTION,
+                )
+            )
+            applied.append(migration.VERSION)
+
+    return applied
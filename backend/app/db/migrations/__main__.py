@@ -0,0 +1,40 @@
+import argparse
+import sys
+
+from backend.app.db.migrations import LATEST_VERSION, schema_version, upgrade
+from backend.app.db.session import engine
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.db.migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+    up = sub.add_parser("upgrade", help="apply pending migrations")
+    up.add_argument("--target", type=int, default=None)
+    sub.add_parser("current", help="show the applied schema version")
+    sub.add_parser("check-plans", help="EXPLAIN the hot queries and fail on sequential scans")
+    args = parser.parse_args(argv)
+
+    if args.command == "upgrade":
+        applied = upgrade(engine, target=args.target)
+        print(f"Applied: {applied or 'nothing'} (latest is {LATEST_VERSION})")
+        return 0
+
+    if args.command == "current":
+        version = schema_version(engine)
+        upgrade_needed = version != LATEST_VERSION
+        print(f"Schema version {version} (latest {LATEST_VERSION})"
+              + (" — upgrade needed" if upgrade_needed else ""))
+        return 1 if upgrade_needed else 0
+
+    from backend.app.db.query_plans import check_hot_query_plans
+
+    failures = 0
+    for name, seq_scans in check_hot_query_plans(engine).items():
+        status = "OK" if not seq_scans else f"SEQ SCAN on {', '.join(seq_scans)}"
+        failures += bool(seq_scans)
+        print(f"  {name:<26} {status}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""Tables that existed before migrations (previously made by create_all).
+
+Spelled out here rather than taken from the models, so the baseline stays
+what it was: later schema changes belong in later migrations.
+"""
+
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, ForeignKey, Integer, MetaData, Numeric,
+    String, Table, Text, Time, TIMESTAMP, UniqueConstraint, func, text,
+)
+from sqlalchemy.engine import Connection
+
+VERSION = 1
+DESCRIPTION = "baseline schema"
+
+metadata = MetaData()
+
+Table(
+    "staff_users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(100), nullable=False),
+    Column("email", String(150), unique=True, nullable=False, index=True),
+    Column("role", String(20), nullable=False),
+    Column("password_hash", String, nullable=False),
+    Column("username", String(50), unique=True, nullable=False, index=True),
+    Column("is_active", Boolean, server_default=text("true")),
+    Column("created_at", TIMESTAMP, server_default=text("CURRENT_TIMESTAMP"), nullable=False),
+)
+
+Table(
+    "owners", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False),
+    Column("phone", String, nullable=False, index=True),
+    Column("email", String, nullable=True, index=True),
+    Column("address", String, nullable=True),
+)
+
+Table(
+    "pets", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("owner_id", Integer, ForeignKey("owners.id"), nullable=False),
+    Column("name", String, nullable=False),
+    Column("species", String, nullable=False),
+    Column("breed", String, nullable=True),
+    Column("age", Integer, nullable=True),
+)
+
+Table(
+    "appointments", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("owner_id", Integer, ForeignKey("owners.id"), nullable=False),
+    Column("pet_id", Integer, ForeignKey("pets.id"), nullable=False),
+    Column("appointment_date", Date, nullable=False),
+    Column("appointment_time", Time, nullable=False),
+    Column("type", String, nullable=False),
+    Column("status", String, nullable=False),
+    Column("notes", Text, nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "medical_records", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("appointment_id", Integer, ForeignKey("appointments.id"), nullable=False, unique=True),
+    Column("doctor_id", Integer, ForeignKey("staff_users.id"), nullable=False),
+    Column("diagnosis", Text, nullable=False),
+    Column("symptoms", Text, nullable=True),
+    Column("treatment", Text, nullable=True),
+    Column("prescription", Text, nullable=True),
+    Column("notes", Text, nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "services", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(100), nullable=False, unique=True),
+    Column("category", String(50)),
+    Column("price", Numeric(10, 2), nullable=False),
+    Column("is_active", Boolean, server_default=text("true")),
+)
+
+Table(
+    "invoices", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("appointment_id", Integer, ForeignKey("appointments.id"), nullable=False),
+    Column("owner_id", Integer, ForeignKey("owners.id"), nullable=False),
+    Column("total_amount", Numeric(10, 2), nullable=False),
+    Column("discount_pct", Numeric(5, 2), server_default=text("0")),
+    Column("final_amount", Numeric(10, 2), nullable=False),
+    Column("payment_status", String(20), server_default=text("'pending'")),
+    Column("payment_method", String(30), nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "invoice_items", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("invoice_id", Integer, ForeignKey("invoices.id"), nullable=False),
+    Column("service_id", Integer, ForeignKey("services.id"), nullable=False),
+    Column("quantity", Integer, server_default=text("1")),
+    Column("unit_price", Numeric(10, 2), nullable=False),
+    Column("line_total", Numeric(10, 2), nullable=False),
+)
+
+Table(
+    "inventory_items", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(150), nullable=False),
+    Column("category", String(50)),
+    Column("quantity", Integer, nullable=False, server_default=text("0")),
+    Column("unit", String(30)),
+    Column("reorder_level", Integer, server_default=text("10")),
+    Column("expiry_date", Date, nullable=True),
+    Column("cost_price", Numeric(10, 2), nullable=True),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "inventory_logs", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("item_id", Integer, ForeignKey("inventory_items.id"), nullable=False),
+    Column("change_qty", Integer, nullable=False),
+    Column("reason", String(200)),
+    Column("performed_by", Integer, ForeignKey("staff_users.id")),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "notification_logs", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("owner_id", Integer, ForeignKey("owners.id"), nullable=False),
+    Column("appointment_id", Integer, ForeignKey("appointments.id"), nullable=True),
+    Column("channel", String(20)),
+    Column("message", Text),
+    Column("status", String(20)),
+    Column("sent_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "daily_appointment_rollups", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("rollup_date", Date, nullable=False, index=True),
+    Column("status", String, nullable=False),
+    Column("type", String, nullable=False),
+    Column("appointment_count", Integer, nullable=False, server_default=text("0")),
+    Column("paid_amount", Numeric(12, 2), nullable=False, server_default=text("0")),
+    UniqueConstraint("rollup_date", "status", "type", name="uq_daily_appt_rollup"),
+)
+
+Table(
+    "daily_service_rollups", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("rollup_date", Date, nullable=False, index=True),
+    Column("service_id", Integer, ForeignKey("services.id"), nullable=False),
+    Column("payment_status", String(20), nullable=False),
+    Column("quantity", Integer, nullable=False, server_default=text("0")),
+    Column("revenue", Numeric(12, 2), nullable=False, server_default=text("0")),
+    UniqueConstraint("rollup_date", "service_id", "payment_status", name="uq_daily_service_rollup"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    metadata.create_all(conn, checkfirst=True)
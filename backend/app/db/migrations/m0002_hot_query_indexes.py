@@ -0,0 +1,33 @@
+"""Composite indexes for the hot appointment / invoice / log query shapes."""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 2
+DESCRIPTION = "hot query indexes"
+
+STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_pets_owner_id ON pets (owner_id)",
+    "CREATE INDEX IF NOT EXISTS ix_appointments_date_time "
+    "ON appointments (appointment_date, appointment_time)",
+    "CREATE INDEX IF NOT EXISTS ix_appointments_date_status_type "
+    "ON appointments (appointment_date, status, type)",
+    "CREATE INDEX IF NOT EXISTS ix_appointments_pet_id ON appointments (pet_id)",
+    "CREATE INDEX IF NOT EXISTS ix_medical_records_doctor_created "
+    "ON medical_records (doctor_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_invoices_appointment_id ON invoices (appointment_id)",
+    "CREATE INDEX IF NOT EXISTS ix_invoices_created_at_id ON invoices (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_invoices_owner_created ON invoices (owner_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_invoice_items_invoice_id ON invoice_items (invoice_id)",
+    "CREATE INDEX IF NOT EXISTS ix_inventory_logs_item_created "
+    "ON inventory_logs (item_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_notification_logs_owner_sent "
+    "ON notification_logs (owner_id, sent_at)",
+    "CREATE INDEX IF NOT EXISTS ix_notification_logs_sent_at_id "
+    "ON notification_logs (sent_at, id)",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for statement in STATEMENTS:
+        conn.execute(text(statement))
@@ -0,0 +1,33 @@
+"""Table-backed outbox for the notification dispatcher."""
+
+from sqlalchemy import (
+    JSON, Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, func, text,
+)
+from sqlalchemy.engine import Connection
+
+VERSION = 3
+DESCRIPTION = "notification outbox"
+
+metadata = MetaData()
+# Referenced tables, for the foreign keys only
+Table("owners", metadata, Column("id", Integer, primary_key=True))
+Table("appointments", metadata, Column("id", Integer, primary_key=True))
+
+notification_outbox = Table(
+    "notification_outbox", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("owner_id", Integer, ForeignKey("owners.id"), nullable=False),
+    Column("appointment_id", Integer, ForeignKey("appointments.id"), nullable=True),
+    Column("channel", String(20), nullable=False),
+    Column("template", String(50), nullable=False),
+    Column("context", JSON, nullable=False),
+    Column("status", String(20), nullable=False, server_default=text("'pending'")),
+    Column("attempts", Integer, nullable=False, server_default=text("0")),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("claimed_at", DateTime(timezone=True), nullable=True),
+    Index("ix_notification_outbox_status_id", "status", "id"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    notification_outbox.create(conn, checkfirst=True)
@@ -0,0 +1,27 @@
+"""Idempotency ledger for reminder campaigns."""
+
+from sqlalchemy import (
+    Column, Date, DateTime, ForeignKey, Integer, MetaData, String, Table, UniqueConstraint, func,
+)
+from sqlalchemy.engine import Connection
+
+VERSION = 4
+DESCRIPTION = "reminder sends"
+
+metadata = MetaData()
+# Referenced table, for the foreign key only
+Table("appointments", metadata, Column("id", Integer, primary_key=True))
+
+reminder_sends = Table(
+    "reminder_sends", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("appointment_id", Integer, ForeignKey("appointments.id"), nullable=False),
+    Column("kind", String(30), nullable=False),
+    Column("appointment_date", Date, nullable=False, index=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    UniqueConstraint("appointment_id", "kind", name="uq_reminder_sends_appointment_kind"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    reminder_sends.create(conn, checkfirst=True)
@@ -0,0 +1,31 @@
+"""pg_trgm indexes for fuzzy owner search (PostgreSQL only).
+
+Not declared on the models: the baseline create_all would try to build them
+before the extension exists, and other databases search in memory.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 5
+DESCRIPTION = "owner search indexes"
+
+STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_owners_name_trgm "
+    "ON owners USING gist (lower(name) gist_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_owners_email_trgm "
+    "ON owners USING gist (lower(email) gist_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_pets_name_trgm "
+    "ON pets USING gist (lower(name) gist_trgm_ops)",
+    # Phone suffix search: reversed digits, matched with LIKE 'prefix%'
+    "CREATE INDEX IF NOT EXISTS ix_owners_phone_digits_rev "
+    "ON owners (reverse(regexp_replace(phone, '\\D', '', 'g')) text_pattern_ops)",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+    for statement in STATEMENTS:
+        conn.execute(text(statement))
@@ -0,0 +1,13 @@
+"""Index for the expiry-alert range scan."""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 6
+DESCRIPTION = "inventory expiry index"
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_inventory_items_expiry_date ON inventory_items (expiry_date)"
+    ))
@@ -0,0 +1,31 @@
+"""Inventory stock snapshots and the log time-range index."""
+
+from sqlalchemy import (
+    Column, Date, DateTime, ForeignKey, Index, Integer, MetaData, Table, UniqueConstraint, func, text,
+)
+from sqlalchemy.engine import Connection
+
+VERSION = 7
+DESCRIPTION = "inventory snapshots"
+
+metadata = MetaData()
+# Referenced table, for the foreign key only
+Table("inventory_items", metadata, Column("id", Integer, primary_key=True))
+
+inventory_snapshots = Table(
+    "inventory_snapshots", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("item_id", Integer, ForeignKey("inventory_items.id"), nullable=False),
+    Column("snapshot_date", Date, nullable=False),
+    Column("quantity", Integer, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    UniqueConstraint("item_id", "snapshot_date", name="uq_inventory_snapshots_item_date"),
+    Index("ix_inventory_snapshots_date", "snapshot_date"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    inventory_snapshots.create(conn, checkfirst=True)
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_inventory_logs_created_at ON inventory_logs (created_at)"
+    ))
@@ -0,0 +1,25 @@
+"""Service bill of materials (stock consumed per billed service)."""
+
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, Table, UniqueConstraint
+from sqlalchemy.engine import Connection
+
+VERSION = 8
+DESCRIPTION = "service materials"
+
+metadata = MetaData()
+# Referenced tables, for the foreign keys only
+Table("services", metadata, Column("id", Integer, primary_key=True))
+Table("inventory_items", metadata, Column("id", Integer, primary_key=True))
+
+service_materials = Table(
+    "service_materials", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("service_id", Integer, ForeignKey("services.id"), nullable=False),
+    Column("item_id", Integer, ForeignKey("inventory_items.id"), nullable=False),
+    Column("quantity", Integer, nullable=False),
+    UniqueConstraint("service_id", "item_id", name="uq_service_materials_service_item"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    service_materials.create(conn, checkfirst=True)
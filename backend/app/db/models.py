@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, String, Boolean, TIMESTAMP, text,
-    ForeignKey, Date, Time, Text, Numeric,
+    ForeignKey, Date, Time, Text, Numeric, UniqueConstraint, Index, JSON,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -44,6 +44,9 @@ class Owner(Base):
 
 class Pet(Base):
     __tablename__ = "pets"
+    __table_args__ = (
+        Index("ix_pets_owner_id", "owner_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     owner_id = Column(Integer, ForeignKey("owners.id"), nullable=False)
@@ -60,6 +63,14 @@ class Pet(Base):
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # today's queue / by-date lists: equality on date, ordered by time
+        Index("ix_appointments_date_time", "appointment_date", "appointment_time"),
+        # report ranges and rollup refreshes group by (date, status, type)
+        Index("ix_appointments_date_status_type", "appointment_date", "status", "type"),
+        # pet history joins
+        Index("ix_appointments_pet_id", "pet_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -84,6 +95,9 @@ class Appointment(Base):
 
 class MedicalRecord(Base):
     __tablename__ = "medical_records"
+    __table_args__ = (
+        Index("ix_medical_records_doctor_created", "doctor_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -129,6 +143,12 @@ class Service(Base):
 
 class Invoice(Base):
     __tablename__ = "invoices"
+    __table_args__ = (
+        Index("ix_invoices_appointment_id", "appointment_id"),
+        # keyset pagination / exports: ORDER BY created_at DESC, id DESC
+        Index("ix_invoices_created_at_id", "created_at", "id"),
+        Index("ix_invoices_owner_created", "owner_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     appointment_id = Column(Integer, ForeignKey("appointments.id"), nullable=False)
@@ -147,6 +167,9 @@ class Invoice(Base):
 
 class InvoiceItem(Base):
     __tablename__ = "invoice_items"
+    __table_args__ = (
+        Index("ix_invoice_items_invoice_id", "invoice_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False)
@@ -163,6 +186,10 @@ class InvoiceItem(Base):
 
 class InventoryItem(Base):
     __tablename__ = "inventory_items"
+    __table_args__ = (
+        # expiry alerts: range scan up to today + 90 days
+        Index("ix_inventory_items_expiry_date", "expiry_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(150), nullable=False)
@@ -181,6 +208,11 @@ class InventoryItem(Base):
 
 class InventoryLog(Base):
     __tablename__ = "inventory_logs"
+    __table_args__ = (
+        Index("ix_inventory_logs_item_created", "item_id", "created_at"),
+        # stock-at for every item: one time range across all items
+        Index("ix_inventory_logs_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     item_id = Column(Integer, ForeignKey("inventory_items.id"), nullable=False)
@@ -193,10 +225,45 @@ class InventoryLog(Base):
     staff = relationship("StaffUser")
 
 
+class InventorySnapshot(Base):
+    """Stock of an item at the end of ``snapshot_date`` (a ledger checkpoint)."""
+    __tablename__ = "inventory_snapshots"
+    __table_args__ = (
+        UniqueConstraint("item_id", "snapshot_date", name="uq_inventory_snapshots_item_date"),
+        Index("ix_inventory_snapshots_date", "snapshot_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    item_id = Column(Integer, ForeignKey("inventory_items.id"), nullable=False)
+    snapshot_date = Column(Date, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ServiceMaterial(Base):
+    """Bill of materials: stock one unit of a service consumes."""
+    __tablename__ = "service_materials"
+    __table_args__ = (
+        UniqueConstraint("service_id", "item_id", name="uq_service_materials_service_item"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    service_id = Column(Integer, ForeignKey("services.id"), nullable=False)
+    item_id = Column(Integer, ForeignKey("inventory_items.id"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+
+    service = relationship("Service")
+    item = relationship("InventoryItem")
+
+
 # ──────────────────── NOTIFICATIONS ────────────────────
 
 class NotificationLog(Base):
     __tablename__ = "notification_logs"
+    __table_args__ = (
+        Index("ix_notification_logs_owner_sent", "owner_id", "sent_at"),
+        Index("ix_notification_logs_sent_at_id", "sent_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     owner_id = Column(Integer, ForeignKey("owners.id"), nullable=False)
@@ -209,3 +276,76 @@ class NotificationLog(Base):
     owner = relationship("Owner")
     appointment = relationship("Appointment")
 
+
+class NotificationOutbox(Base):
+    """Durable queue of notifications waiting to be dispatched.
+
+    Rows are written in the same transaction as the change that triggers
+    them and deleted once the dispatcher has recorded a NotificationLog.
+    """
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index("ix_notification_outbox_status_id", "status", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("owners.id"), nullable=False)
+    appointment_id = Column(Integer, ForeignKey("appointments.id"), nullable=True)
+    channel = Column(String(20), nullable=False)
+    template = Column(String(50), nullable=False)
+    context = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, server_default=text("'pending'"))  # pending / sending
+    attempts = Column(Integer, nullable=False, server_default=text("0"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+
+class ReminderSend(Base):
+    """One row per reminder kind already issued for an appointment.
+
+    The unique key is what makes reminder campaigns safe to re-run.
+    """
+    __tablename__ = "reminder_sends"
+    __table_args__ = (
+        UniqueConstraint("appointment_id", "kind", name="uq_reminder_sends_appointment_kind"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    appointment_id = Column(Integer, ForeignKey("appointments.id"), nullable=False)
+    kind = Column(String(30), nullable=False)
+    appointment_date = Column(Date, nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+# ──────────────────── REPORT ROLLUPS ────────────────────
+
+class DailyAppointmentRollup(Base):
+    """Per-day appointment counts and paid revenue, bucketed by status/type."""
+    __tablename__ = "daily_appointment_rollups"
+    __table_args__ = (
+        UniqueConstraint("rollup_date", "status", "type", name="uq_daily_appt_rollup"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    rollup_date = Column(Date, nullable=False, index=True)
+    status = Column(String, nullable=False)
+    type = Column(String, nullable=False)
+    appointment_count = Column(Integer, nullable=False, server_default=text("0"))
+    paid_amount = Column(Numeric(12, 2), nullable=False, server_default=text("0"))
+
+
+class DailyServiceRollup(Base):
+    """Per-day invoiced quantity and line revenue per service and payment status."""
+    __tablename__ = "daily_service_rollups"
+    __table_args__ = (
+        UniqueConstraint("rollup_date", "service_id", "payment_status", name="uq_daily_service_rollup"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    rollup_date = Column(Date, nullable=False, index=True)
+    service_id = Column(Integer, ForeignKey("services.id"), nullable=False)
+    payment_status = Column(String(20), nullable=False)
+    quantity = Column(Integer, nullable=False, server_default=text("0"))
+    revenue = Column(Numeric(12, 2), nullable=False, server_default=text("0"))
+
+    service = relationship("Service")
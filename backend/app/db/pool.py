@@ -0,0 +1,67 @@
+import os
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from backend.app.core.metrics import LatencyHistogram
+
+
+class _TimedCheckoutMixin:
+    """Records how long each pool checkout waits.
+
+    The measured time covers queueing for a free connection and, when the
+    pool grows into its overflow, opening the new connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_times = LatencyHistogram()
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_times.observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_status(engine) -> Optional[dict]:
+    """Live statistics for an engine's pool, for the current worker process."""
+    if engine is None:
+        return None
+    pool = getattr(engine, "sync_engine", engine).pool
+    if not isinstance(pool, QueuePool):
+        return {"pool_class": type(pool).__name__}
+
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": pool._max_overflow,
+        "timeouts": getattr(pool, "timeouts", None),
+        "checkout_wait": pool.wait_times.snapshot() if hasattr(pool, "wait_times") else None,
+    }
+
+
+def worker_pool_report(sync_engine, async_engine=None) -> dict:
+    return {
+        "pid": os.getpid(),
+        "sync": pool_status(sync_engine),
+        "async": pool_status(async_engine),
+    }
@@ -0,0 +1,97 @@
+"""
+EXPLAIN-based check that the hot queries are served by indexes.
+
+Sequential scans are disabled for the session (``enable_seqscan = off``) so
+the planner only falls back to one when no usable index exists — which is
+what we want to catch, independent of how small the tables currently are.
+PostgreSQL only.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List
+
+from sqlalchemy import Float, func, literal, select, text
+from sqlalchemy.engine import Engine
+
+from backend.app.db.models import (
+    Appointment, Invoice, InvoiceItem, MedicalRecord,
+    InventoryItem, InventoryLog, NotificationLog, Owner,
+)
+
+
+def hot_queries() -> Dict[str, object]:
+    today = date.today()
+    return {
+        "todays_queue": (
+            select(Appointment)
+            .where(Appointment.appointment_date == today)
+            .order_by(Appointment.appointment_time)
+        ),
+        "report_range": (
+            select(Appointment.status, Appointment.type)
+            .where(
+                Appointment.appointment_date >= today - timedelta(days=365),
+                Appointment.appointment_date <= today,
+            )
+        ),
+        "pet_history": select(Appointment.id).where(Appointment.pet_id == 1),
+        "invoices_for_appointment": select(Invoice).where(Invoice.appointment_id == 1),
+        "invoice_page": (
+            select(Invoice)
+            .order_by(Invoice.created_at.desc(), Invoice.id.desc())
+            .limit(100)
+        ),
+        "invoice_items": select(InvoiceItem).where(InvoiceItem.invoice_id == 1),
+        "doctor_records": (
+            select(MedicalRecord)
+            .where(MedicalRecord.doctor_id == 1)
+            .order_by(MedicalRecord.created_at.desc(), MedicalRecord.id.desc())
+            .limit(100)
+        ),
+        "item_logs": (
+            select(InventoryLog)
+            .where(InventoryLog.item_id == 1)
+            .order_by(InventoryLog.created_at.desc(), InventoryLog.id.desc())
+            .limit(100)
+        ),
+        "owner_notifications": (
+            select(NotificationLog)
+            .where(NotificationLog.owner_id == 1)
+            .order_by(NotificationLog.sent_at.desc(), NotificationLog.id.desc())
+            .limit(100)
+        ),
+        "expiry_alerts": (
+            select(InventoryItem.id)
+            .where(InventoryItem.expiry_date <= today + timedelta(days=90))
+            .order_by(InventoryItem.expiry_date)
+        ),
+        "owner_fuzzy_name": (
+            select(Owner.id)
+            .order_by(literal("arjun").op("<<->", return_type=Float)(func.lower(Owner.name)))
+            .limit(50)
+        ),
+    }
+
+
+def _seq_scans(plan: dict) -> List[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found += _seq_scans(child)
+    return found
+
+
+def check_hot_query_plans(engine: Engine) -> Dict[str, List[str]]:
+    """Return {query name: [tables seq-scanned]} for every hot query."""
+    if engine.dialect.name != "postgresql":
+        raise RuntimeError("Query plan checks require PostgreSQL")
+
+    results = {}
+    with engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        for name, stmt in hot_queries().items():
+            sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+            plan = conn.execute(text("EXPLAIN (FORMAT JSON) " + sql)).scalar()
+            results[name] = _seq_scans(plan[0]["Plan"])
+    return results
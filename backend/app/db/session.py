@@ -1,18 +1,48 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from backend.app.core.config import settings
+from backend.app.db.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool
 
 # NeonDB requires psycopg3 (psycopg) — swap dialect from postgresql to postgresql+psycopg
 _db_url = settings.DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
 
+
+def pool_limits() -> tuple:
+    """(pool_size, max_overflow) for one engine in one worker process.
+
+    DB_MAX_CONNECTIONS is split evenly across WEB_CONCURRENCY workers and
+    their engines; DB_POOL_SIZE / DB_MAX_OVERFLOW apply within that share.
+    """
+    size, overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    if settings.DB_MAX_CONNECTIONS:
+        engines = 2 if settings.DB_ASYNC else 1
+        share = max(1, settings.DB_MAX_CONNECTIONS // (max(1, settings.WEB_CONCURRENCY) * engines))
+        size = min(size, share)
+        overflow = max(0, min(overflow, share - size))
+    return size, overflow
+
+
+def _pool_options(poolclass) -> dict:
+    pool_size, max_overflow = pool_limits()
+    return dict(
+        poolclass=poolclass,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_use_lifo=settings.DB_POOL_USE_LIFO,
+    )
+
+
 engine = create_engine(
     _db_url,
     echo=settings.ENVIRONMENT == "development",
-    pool_pre_ping=True,       # detect stale connections (important for NeonDB serverless)
-    pool_recycle=300,         # recycle connections every 5 min
     connect_args={
         "sslmode": "require",
     },
+    **_pool_options(TimedQueuePool),
 )
 
 SessionLocal = sessionmaker(
@@ -21,11 +51,46 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Optional async engine — psycopg picks its async driver under create_async_engine.
+# Only built when DB_ASYNC is on, so the sync deployment opens no extra pool.
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    async_engine = create_async_engine(
+        _db_url,
+        echo=settings.ENVIRONMENT == "development",
+        connect_args={
+            "sslmode": "require",
+        },
+        **_pool_options(TimedAsyncAdaptedQueuePool),
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
 Base = declarative_base()
 
+
+def dispose_after_fork() -> None:
+    """Give a freshly forked worker process pools of its own.
+
+    close=False drops the inherited pool without closing its connections,
+    which still belong to the parent process.
+    """
+    engine.dispose(close=False)
+    if async_engine is not None:
+        async_engine.sync_engine.dispose(close=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,16 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from typing import List
-from datetime import date
+from typing import Iterator, List, Optional
+from datetime import date, timedelta
 
+from backend.app.core.config import settings
+from backend.app.core.pagination import PageParams, keyset_page, set_next_cursor
+from backend.app.core.streaming import ExportFormat, export_response
 from backend.app.core.roles import require_doctor
 from backend.app.core.dependencies import get_db
+from backend.app.db.session import get_async_db
 from backend.app.db.models import Appointment, MedicalRecord, StaffUser, Pet, Owner
+from backend.app.appointments.service import (
+    appointments_on,
+    appointments_on_async,
+    get_appointment,
+)
+from backend.app.appointments.board import board_changed
 from backend.app.doctor.schemas import (
     MedicalRecordCreate,
     MedicalRecordResponse,
 )
 from backend.app.receptionist.schemas import AppointmentResponse
+from backend.app.reports.rollup import apply_rollups, capture_rollups
 
 
 router = APIRouter(
@@ -19,13 +31,6 @@ router = APIRouter(
 )
 
 
-def _enrich_appointment(appt: Appointment) -> Appointment:
-    """Populate owner_name and pet_name from relationships."""
-    appt.owner_name = appt.owner.name if appt.owner else None
-    appt.pet_name = appt.pet.name if appt.pet else None
-    return appt
-
-
 def _enrich_record(rec: MedicalRecord) -> MedicalRecord:
     """Populate pet/owner/doctor context on a medical record."""
     appt = rec.appointment
@@ -48,22 +53,22 @@ def _enrich_record(rec: MedicalRecord) -> MedicalRecord:
 # doctors share the same appointment queue. If multi-doctor filtering is
 # needed in the future, add a doctor_id column to the Appointment model
 # and filter by current_user.id here.
-@router.get("/appointments/today", response_model=List[AppointmentResponse])
-def doctor_today_appointments(
-    db: Session = Depends(get_db),
-    current_user: StaffUser = Depends(require_doctor),
-):
-    today = date.today()
+if settings.DB_ASYNC:
+    @router.get("/appointments/today", response_model=List[AppointmentResponse])
+    async def doctor_today_appointments(
+        db: AsyncSession = Depends(get_async_db),
+        current_user: StaffUser = Depends(require_doctor),
+    ):
+        return await appointments_on_async(db, date.today())
+else:
+    @router.get("/appointments/today", response_model=List[AppointmentResponse])
+    def doctor_today_appointments(
+        db: Session = Depends(get_db),
+        current_user: StaffUser = Depends(require_doctor),
+    ):
+        return appointments_on(db, date.today())
 
-    appointments = (
-        db.query(Appointment)
-        .options(joinedload(Appointment.owner), joinedload(Appointment.pet))
-        .filter(Appointment.appointment_date == today)
-        .order_by(Appointment.appointment_time)
-        .all()
-    )
 
-    return [_enrich_appointment(a) for a in appointments]
 @router.post(
     "/appointments/{appointment_id}/medical-record",
     response_model=MedicalRecordResponse
@@ -107,10 +112,13 @@ def create_medical_record(
     )
 
     # Mark appointment as completed
+    rollups = capture_rollups(db, [appointment.id])
     appointment.status = "completed"
 
     db.add(record)
+    apply_rollups(db, [appointment.id], rollups)
     db.commit()
+    board_changed()
     db.refresh(record)
 
     return record
@@ -158,11 +166,13 @@ def update_medical_record(
 
 @router.get("/medical-records", response_model=List[MedicalRecordResponse])
 def list_my_medical_records(
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: StaffUser = Depends(require_doctor),
 ):
-    """List medical records created by the logged-in doctor."""
-    records = (
+    """List medical records created by the logged-in doctor, newest first."""
+    query = (
         db.query(MedicalRecord)
         .filter(MedicalRecord.doctor_id == current_user.id)
         .options(
@@ -170,12 +180,62 @@ def list_my_medical_records(
             joinedload(MedicalRecord.appointment).joinedload(Appointment.owner),
             joinedload(MedicalRecord.doctor),
         )
-        .order_by(MedicalRecord.created_at.desc())
-        .all()
     )
+    records, next_cursor = keyset_page(
+        query, MedicalRecord, page.after_id, page.limit, order_col=MedicalRecord.created_at
+    )
+    set_next_cursor(response, next_cursor)
     return [_enrich_record(r) for r in records]
 
 
+MEDICAL_RECORD_EXPORT_FIELDS = [
+    "id", "appointment_id", "appointment_date", "doctor_id", "doctor_name",
+    "owner_id", "owner_name", "pet_id", "pet_name", "species",
+    "diagnosis", "symptoms", "treatment", "prescription", "notes", "created_at",
+]
+
+
+def _iter_medical_record_export(
+    db: Session, start: date, end: date, doctor_id: Optional[int]
+) -> Iterator[dict]:
+    query = (
+        db.query(MedicalRecord)
+        .options(
+            joinedload(MedicalRecord.appointment).joinedload(Appointment.pet),
+            joinedload(MedicalRecord.appointment).joinedload(Appointment.owner),
+            joinedload(MedicalRecord.doctor),
+        )
+        .filter(
+            MedicalRecord.created_at >= start,
+            MedicalRecord.created_at < end + timedelta(days=1),
+        )
+    )
+    if doctor_id is not None:
+        query = query.filter(MedicalRecord.doctor_id == doctor_id)
+
+    for rec in query.order_by(MedicalRecord.id).yield_per(500):
+        rec = _enrich_record(rec)
+        yield {field: getattr(rec, field, None) for field in MEDICAL_RECORD_EXPORT_FIELDS}
+
+
+@router.get("/medical-records/export")
+def export_medical_records(
+    start: date = Query(...),
+    end: date = Query(...),
+    format: ExportFormat = Query(default="ndjson"),
+    current_user: StaffUser = Depends(require_doctor),
+):
+    """Stream medical records created in [start, end]. Doctors get their own
+    records; admins get every doctor's."""
+    doctor_id = None if current_user.role == "admin" else current_user.id
+    return export_response(
+        lambda db: _iter_medical_record_export(db, start, end, doctor_id),
+        fmt=format,
+        filename=f"medical_records_{start}_{end}",
+        csv_fields=MEDICAL_RECORD_EXPORT_FIELDS,
+    )
+
+
 @router.get(
     "/pets/{pet_id}/history",
     response_model=List[MedicalRecordResponse]
@@ -209,17 +269,12 @@ def doctor_view_appointment(
     db: Session = Depends(get_db),
     current_user: StaffUser = Depends(require_doctor),
 ):
-    appointment = (
-        db.query(Appointment)
-        .options(joinedload(Appointment.owner), joinedload(Appointment.pet))
-        .filter(Appointment.id == appointment_id)
-        .first()
-    )
+    appointment = get_appointment(db, appointment_id)
 
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
 
-    return _enrich_appointment(appointment)
+    return appointment
 
 @router.patch("/appointments/{appointment_id}/complete")
 def complete_appointment(
@@ -236,7 +291,10 @@ def complete_appointment(
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
 
+    rollups = capture_rollups(db, [appointment.id])
     appointment.status = "completed"
+    apply_rollups(db, [appointment.id], rollups)
     db.commit()
+    board_changed()
 
     return {"message": "Appointment marked as completed"}
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Expiry alert buckets.
+
+One indexed range query (``expiry_date <= today + 90``) labels every item
+with its bucket in SQL — a CASE over date cutoffs — and the result is cached
+for the day.  The alert summary, GET /inventory/expiring and the inventory
+report's near-expiry list all read that one cached row set; item writes and
+stock movements invalidate it.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List
+
+from sqlalchemy import case, literal, select
+from sqlalchemy.orm import Session
+
+from backend.app.core.cache import TTLCache
+from backend.app.core.config import settings
+from backend.app.db.models import InventoryItem
+
+LEVELS = ("expired", "critical", "warning", "upcoming")
+# Upper bound (days until expiry, inclusive) of each non-expired level
+CRITICAL_DAYS = 7
+WARNING_DAYS = 30
+HORIZON_DAYS = 90
+
+_expiry_cache = TTLCache(maxsize=2, ttl=settings.EXPIRY_ALERT_CACHE_TTL_SECONDS, shared=True)
+
+
+def invalidate_expiry_alerts() -> None:
+    """Call after item creates / edits / deletes and stock changes."""
+    _expiry_cache.invalidate()
+
+
+def expiry_cache_stats() -> dict:
+    return _expiry_cache.stats()
+
+
+def _bucket_stmt(today: date, horizon_days: int):
+    expiry = InventoryItem.expiry_date
+    # Compared against bound cutoffs rather than CURRENT_DATE arithmetic:
+    # portable, index-friendly, and consistent with the cache's notion of today
+    level = case(
+        (expiry < today, literal("expired")),
+        (expiry <= today + timedelta(days=CRITICAL_DAYS), literal("critical")),
+        (expiry <= today + timedelta(days=WARNING_DAYS), literal("warning")),
+        else_=literal("upcoming"),
+    )
+    return (
+        select(*InventoryItem.__table__.c, level.label("alert_level"))
+        .where(
+            expiry.isnot(None),
+            expiry <= today + timedelta(days=horizon_days),
+        )
+        .order_by(expiry, InventoryItem.name)
+    )
+
+
+def _load(db: Session, today: date, horizon_days: int = HORIZON_DAYS) -> List[dict]:
+    rows = []
+    for row in db.execute(_bucket_stmt(today, horizon_days)).mappings():
+        row = dict(row)
+        row["days_until_expiry"] = (row["expiry_date"] - today).days
+        rows.append(row)
+    return rows
+
+
+def expiring_rows(db: Session) -> List[dict]:
+    """Items expiring within HORIZON_DAYS (or already expired), soonest first."""
+    today = date.today()
+    return _expiry_cache.get_or_set(today, lambda: _load(db, today))
+
+
+def expiring_within(db: Session, days: int) -> List[dict]:
+    """Items expiring within ``days`` (or already expired), soonest first."""
+    if days > HORIZON_DAYS:
+        return _load(db, date.today(), days)
+    return [row for row in expiring_rows(db) if row["days_until_expiry"] <= days]
+
+
+def alert_summary(db: Session) -> Dict[str, object]:
+    buckets: Dict[str, list] = {level: [] for level in LEVELS}
+    for row in expiring_rows(db):
+        buckets[row["alert_level"]].append(row)
+    return {**buckets, "total_alerts": sum(len(b) for b in buckets.values())}
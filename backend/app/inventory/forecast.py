@@ -0,0 +1,174 @@
+"""
+Reorder forecasting from the stock ledger.
+
+Daily consumption (see below) is held as one NumPy matrix, items x days,
+over the last FORECAST_HISTORY_DAYS.  Closed days are read once per day
+with a single grouped query and cached; each request re-reads only
+yesterday and today (a transaction open across midnight can still add to
+yesterday), so new logs count at once for the price of a small range scan
+on ``ix_inventory_logs_created_at``.
+
+Consumption is every outgoing ``inventory_logs`` movement (invoice
+materials, stock dispensed or used through the stock endpoints) except
+direct quantity edits (reason ``QUANTITY_EDITED``): those are stocktake
+corrections and write-downs, and counting them as demand would inflate
+the averages and the safety stock.
+
+Everything below is computed for all items at once:
+
+* ``sma``: mean daily demand over the last FORECAST_SMA_DAYS;
+* ``ewma``: exponentially smoothed daily demand over the whole window;
+* ``days_of_cover``: stock on hand / daily demand (the larger of the two);
+* ``reorder_point``: demand over the lead time plus safety stock
+  (FORECAST_SERVICE_Z x std of daily demand x sqrt(lead time)), never
+  below the item's static ``reorder_level``;
+* ``suggested_order``: once stock is at or below the reorder point, enough
+  to cover the lead time and FORECAST_COVER_DAYS of demand plus safety
+  stock.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import List
+
+import numpy as np
+from sqlalchemy import Date, Integer, cast, func, select
+from sqlalchemy.orm import Session
+
+from backend.app.core.cache import TTLCache
+from backend.app.core.config import settings
+from backend.app.db.models import InventoryItem, InventoryLog
+from backend.app.inventory.service import QUANTITY_EDITED
+
+# Trailing days re-read on every request rather than cached
+_RECENT_DAYS = 2
+
+# Closed days never change, so the history is only rebuilt when the day rolls
+_history_cache = TTLCache(maxsize=2, ttl=24 * 3600)
+
+
+@dataclass(frozen=True)
+class _Usage:
+    item_ids: np.ndarray   # sorted item ids, one per row
+    daily: np.ndarray      # consumption, shape (len(item_ids), days)
+
+
+def _day_offset(db: Session, start: date):
+    """SQL expression: whole days from ``start`` to the log's date."""
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(cast(InventoryLog.created_at, Date) - start, Integer)
+    return cast(
+        func.julianday(func.date(InventoryLog.created_at)) - func.julianday(start.isoformat()),
+        Integer,
+    )
+
+
+def _load_usage(db: Session, start: date, end: date) -> _Usage:
+    """Consumption per item and day for start <= day < end, from one query."""
+    offset = _day_offset(db, start)
+    # Core execution and plain integers: this can be ~1M rows on a cold load
+    rows = db.connection().execute(
+        select(InventoryLog.item_id, offset, func.sum(-InventoryLog.change_qty))
+        .where(
+            InventoryLog.change_qty < 0,
+            InventoryLog.reason.is_distinct_from(QUANTITY_EDITED),
+            InventoryLog.created_at >= datetime.combine(start, time.min),
+            InventoryLog.created_at < datetime.combine(end, time.min),
+        )
+        .group_by(InventoryLog.item_id, offset)
+    ).all()
+
+    days = (end - start).days
+    if not rows:
+        return _Usage(np.empty(0, dtype=np.int64), np.zeros((0, days)))
+    ids, offsets, quantities = (np.fromiter(column, dtype=np.int64, count=len(rows)) for column in zip(*rows))
+    item_ids, index = np.unique(ids, return_inverse=True)
+    daily = np.zeros((len(item_ids), days))
+    np.add.at(daily, (index, offsets), quantities)
+    return _Usage(item_ids, daily)
+
+
+def _place(target: np.ndarray, ids: np.ndarray, usage: _Usage) -> None:
+    """Copy ``usage`` rows into ``target`` rows aligned with ``ids``."""
+    if not len(usage.item_ids):
+        return
+    pos = np.minimum(np.searchsorted(usage.item_ids, ids), len(usage.item_ids) - 1)
+    hit = usage.item_ids[pos] == ids
+    target[hit] = usage.daily[pos[hit]]
+
+
+def consumption_matrix(db: Session, ids: np.ndarray, today: date) -> np.ndarray:
+    """Daily consumption of each item in ``ids`` (sorted) over the history
+    window ending today, oldest day first."""
+    days = max(settings.FORECAST_HISTORY_DAYS, _RECENT_DAYS + 1)
+    start = today - timedelta(days=days - 1)
+    recent_start = today - timedelta(days=_RECENT_DAYS - 1)
+
+    history = _history_cache.get_or_set(
+        (start, recent_start), lambda: _load_usage(db, start, recent_start)
+    )
+    recent = _load_usage(db, recent_start, today + timedelta(days=1))
+
+    daily = np.zeros((len(ids), days))
+    closed = (recent_start - start).days
+    _place(daily[:, :closed], ids, history)
+    _place(daily[:, closed:], ids, recent)
+    return daily
+
+
+def forecast(db: Session, reorder_only: bool = False) -> List[dict]:
+    items = db.execute(
+        select(
+            InventoryItem.id, InventoryItem.name, InventoryItem.quantity,
+            InventoryItem.reorder_level,
+        ).order_by(InventoryItem.id)
+    ).all()
+    if not items:
+        return []
+
+    ids = np.fromiter((i.id for i in items), dtype=np.int64, count=len(items))
+    quantity = np.fromiter((i.quantity for i in items), dtype=float, count=len(items))
+    reorder_level = np.fromiter((i.reorder_level or 0 for i in items), dtype=float, count=len(items))
+    daily = consumption_matrix(db, ids, date.today())
+
+    recent = daily[:, -min(settings.FORECAST_SMA_DAYS, daily.shape[1]):]
+    sma = recent.mean(axis=1)
+    alpha = settings.FORECAST_EWMA_ALPHA
+    weights = alpha * (1 - alpha) ** np.arange(daily.shape[1] - 1, -1, -1)
+    ewma = daily @ (weights / weights.sum())
+    demand = np.maximum(sma, ewma)
+
+    lead = settings.FORECAST_LEAD_TIME_DAYS
+    safety = settings.FORECAST_SERVICE_Z * recent.std(axis=1) * math.sqrt(lead)
+    reorder_point = np.maximum(np.ceil(demand * lead + safety), reorder_level)
+    target = np.maximum(
+        np.ceil(demand * (lead + settings.FORECAST_COVER_DAYS) + safety), reorder_point
+    )
+    suggested = np.where(quantity <= reorder_point, np.maximum(target - quantity, 0), 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cover = np.where(demand > 0, quantity / demand, np.nan)
+
+    result = []
+    for item, s, e, c, rp, order in zip(
+        items, sma.round(3).tolist(), ewma.round(3).tolist(), cover.round(1).tolist(),
+        reorder_point.tolist(), suggested.tolist(),
+    ):
+        if reorder_only and not order:
+            continue
+        result.append({
+            "item_id": item.id,
+            "name": item.name,
+            "quantity": item.quantity,
+            "reorder_level": item.reorder_level,
+            "sma": s,
+            "ewma": e,
+            "days_of_cover": None if math.isnan(c) else c,
+            "reorder_point": int(rp),
+            "suggested_order": int(order),
+        })
+    return result
+
+
+def forecast_cache_stats() -> dict:
+    return _history_cache.stats()
@@ -1,24 +1,35 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import date
 
 from backend.app.core.dependencies import get_current_user
+from backend.app.core.pagination import PageParams, set_next_cursor
 from backend.app.core.roles import require_admin
-from backend.app.db.models import StaffUser
+from backend.app.db.models import InventoryItem, InventoryLog, InventorySnapshot, ServiceMaterial, StaffUser
 from backend.app.db.session import get_db
 from backend.app.inventory.schemas import (
     InventoryItemCreate,
     InventoryItemUpdate,
     InventoryItemResponse,
     StockChange,
+    StockBatch,
     InventoryLogResponse,
     ExpiryAlertSummary,
+    StockAtResponse,
+    ItemForecast,
 )
+from backend.app.billing.catalog import invalidate_catalog
+from backend.app.inventory.expiry import expiry_cache_stats, invalidate_expiry_alerts
+from backend.app.inventory.snapshots import stock_at, stock_at_all, take_snapshots
+from backend.app.reports.service import invalidate_dashboard
 from backend.app.inventory.service import (
     create_item,
     get_all_items,
     update_item,
     adjust_stock,
+    adjust_stock_batch,
+    StockMovement,
     get_item_logs,
     get_expiring_items,
     get_expiry_alerts,
@@ -33,7 +44,7 @@ def add_item(
     db: Session = Depends(get_db),
     current_user: StaffUser = Depends(require_admin),
 ):
-    return create_item(db, **data.model_dump())
+    return create_item(db, staff_id=current_user.id, **data.model_dump())
 
 
 @router.get("/items", response_model=List[InventoryItemResponse])
@@ -53,7 +64,7 @@ def edit_item(
     db: Session = Depends(get_db),
     current_user: StaffUser = Depends(require_admin),
 ):
-    return update_item(db, item_id, **data.model_dump(exclude_unset=True))
+    return update_item(db, item_id, staff_id=current_user.id, **data.model_dump(exclude_unset=True))
 
 
 @router.post("/items/{item_id}/stock", response_model=InventoryItemResponse)
@@ -71,13 +82,84 @@ def change_stock(
     )
 
 
+@router.post("/stock/batch", response_model=List[InventoryItemResponse])
+def change_stock_batch(
+    data: StockBatch,
+    db: Session = Depends(get_db),
+    current_user: StaffUser = Depends(get_current_user),
+):
+    """Apply many stock changes in one transaction; if any would take an
+    item below zero, none are applied."""
+    return adjust_stock_batch(
+        db,
+        [StockMovement(m.item_id, m.change_qty, m.reason) for m in data.movements],
+        staff_id=current_user.id,
+    )
+
+
 @router.get("/items/{item_id}/logs", response_model=List[InventoryLogResponse])
 def item_logs(
     item_id: int,
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+    current_user: StaffUser = Depends(require_admin),
+):
+    logs, next_cursor = get_item_logs(db, item_id, after_id=page.after_id, limit=page.limit)
+    set_next_cursor(response, next_cursor)
+    return logs
+
+
+@router.get("/items/{item_id}/stock-at", response_model=StockAtResponse)
+def item_stock_at(
+    item_id: int,
+    date: date = Query(...),
+    db: Session = Depends(get_db),
+    current_user: StaffUser = Depends(require_admin),
+):
+    """Stock of one item at the end of ``date``."""
+    return stock_at(db, item_id, date)
+
+
+@router.get("/stock-at", response_model=List[StockAtResponse])
+def all_stock_at(
+    date: date = Query(...),
     db: Session = Depends(get_db),
     current_user: StaffUser = Depends(require_admin),
 ):
-    return get_item_logs(db, item_id)
+    """Stock of every item at the end of ``date`` (e.g. month-end audits)."""
+    return stock_at_all(db, date)
+
+
+@router.post("/snapshots")
+def snapshot_stock(
+    date: date = Query(...),
+    db: Session = Depends(get_db),
+    current_user: StaffUser = Depends(require_admin),
+):
+    """Checkpoint every item's stock at the end of a closed day (normally run
+    nightly: ``python -m backend.app.inventory.snapshots``)."""
+    return {"date": date, "items": take_snapshots(db, date)}
+
+
+@router.get("/forecast", response_model=List[ItemForecast])
+def reorder_forecast(
+    reorder_only: bool = Query(default=False, description="only items that should be reordered"),
+    db: Session = Depends(get_db),
+    current_user: StaffUser = Depends(require_admin),
+):
+    """Demand, days of cover and suggested reorder quantity per item."""
+    # Imported on first use: NumPy is ~150 ms of cold start otherwise
+    from backend.app.inventory.forecast import forecast
+
+    return forecast(db, reorder_only=reorder_only)
+
+
+@router.get("/forecast/cache")
+def forecast_cache(current_user: StaffUser = Depends(require_admin)):
+    from backend.app.inventory.forecast import forecast_cache_stats
+
+    return forecast_cache_stats()
 
 
 @router.get("/expiry-alerts", response_model=ExpiryAlertSummary)
@@ -91,6 +173,11 @@ def expiry_alerts(
     return get_expiry_alerts(db)
 
 
+@router.get("/expiry-alerts/cache")
+def expiry_alerts_cache(current_user: StaffUser = Depends(require_admin)):
+    return expiry_cache_stats()
+
+
 @router.get("/expiring", response_model=List[InventoryItemResponse])
 def expiring_items(
     days: int = Query(default=30),
@@ -106,13 +193,16 @@ def remove_item(
     db: Session = Depends(get_db),
     current_user: StaffUser = Depends(require_admin),
 ):
-    from backend.app.db.models import InventoryItem, StockLog
     item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
     if not item:
-        from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Item not found")
-    # Delete associated stock logs first
-    db.query(StockLog).filter(StockLog.item_id == item_id).delete()
+    # Delete associated stock logs, snapshots and service materials first
+    db.query(InventoryLog).filter(InventoryLog.item_id == item_id).delete()
+    db.query(InventorySnapshot).filter(InventorySnapshot.item_id == item_id).delete()
+    db.query(ServiceMaterial).filter(ServiceMaterial.item_id == item_id).delete()
     db.delete(item)
     db.commit()
+    invalidate_dashboard()
+    invalidate_expiry_alerts()
+    invalidate_catalog()
     return {"message": f"Item '{item.name}' deleted successfully"}
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, field_validator
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
 from datetime import date, datetime
 from decimal import Decimal
 
@@ -83,6 +83,14 @@ class StockChange(BaseModel):
         return v.strip()
 
 
+class StockMovementIn(StockChange):
+    item_id: int
+
+
+class StockBatch(BaseModel):
+    movements: List[StockMovementIn] = Field(min_length=1, max_length=500)
+
+
 # ──────────── INVENTORY LOG ────────────
 
 class InventoryLogResponse(BaseModel):
@@ -97,6 +105,30 @@ class InventoryLogResponse(BaseModel):
         from_attributes = True
 
 
+# ──────────── STOCK HISTORY ────────────
+
+class StockAtResponse(BaseModel):
+    item_id: int
+    name: str
+    date: date
+    quantity: int
+    snapshot_date: Optional[date] = None   # checkpoint used; None = rebuilt from current stock
+
+
+# ──────────── FORECAST ────────────
+
+class ItemForecast(BaseModel):
+    item_id: int
+    name: str
+    quantity: int
+    reorder_level: Optional[int]
+    sma: float                              # mean daily demand, recent window
+    ewma: float                             # smoothed daily demand
+    days_of_cover: Optional[float]          # None = no recent demand
+    reorder_point: int
+    suggested_order: int
+
+
 # ──────────── EXPIRY ALERTS ────────────
 
 class ExpiryAlertItem(BaseModel):
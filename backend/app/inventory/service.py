@@ -1,16 +1,33 @@
-from typing import List, Optional
-from datetime import date, timedelta
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 
 from fastapi import HTTPException
+from sqlalchemy import Integer, insert, literal, select, update
 from sqlalchemy.orm import Session
 
+from backend.app.core.pagination import DEFAULT_PAGE_SIZE, keyset_page
 from backend.app.db.models import InventoryItem, InventoryLog
+from backend.app.inventory.expiry import alert_summary, expiring_within, invalidate_expiry_alerts
+from backend.app.reports.service import invalidate_dashboard
 
+# Ledger reason for direct edits of an item's quantity (stocktake
+# corrections, write-downs): not consumption, so forecasting skips them
+QUANTITY_EDITED = "Quantity edited"
 
-def create_item(db: Session, **kwargs) -> InventoryItem:
+
+def create_item(db: Session, staff_id: Optional[int] = None, **kwargs) -> InventoryItem:
     item = InventoryItem(**kwargs)
     db.add(item)
+    if item.quantity:
+        # Every quantity change is in the ledger, so past stock can be rebuilt
+        db.flush()
+        db.add(InventoryLog(
+            item_id=item.id, change_qty=item.quantity,
+            reason="Opening stock", performed_by=staff_id,
+        ))
     db.commit()
+    invalidate_dashboard()
+    invalidate_expiry_alerts()
     db.refresh(item)
     return item
 
@@ -32,63 +49,159 @@ def get_all_items(
     ).all()
 
 
-def update_item(db: Session, item_id: int, **kwargs) -> InventoryItem:
-    item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
+def update_item(
+    db: Session, item_id: int, staff_id: Optional[int] = None, **kwargs
+) -> InventoryItem:
+    query = db.query(InventoryItem).filter(InventoryItem.id == item_id)
+    if kwargs.get("quantity") is not None:
+        # Lock the row so the logged difference matches what is overwritten
+        query = query.with_for_update()
+    item = query.first()
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
+    old_quantity = item.quantity
     for k, v in kwargs.items():
         if v is not None:
             setattr(item, k, v)
+    if item.quantity != old_quantity:
+        db.add(InventoryLog(
+            item_id=item.id, change_qty=item.quantity - old_quantity,
+            reason=QUANTITY_EDITED, performed_by=staff_id,
+        ))
     db.commit()
+    invalidate_dashboard()
+    invalidate_expiry_alerts()
     db.refresh(item)
     return item
 
 
-def adjust_stock(
-    db: Session, item_id: int, change_qty: int, reason: str, staff_id: int
-) -> InventoryItem:
-    item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
-    if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
+class StockMovement(NamedTuple):
+    item_id: int
+    change_qty: int
+    reason: str
 
-    item.quantity += change_qty
-    if item.quantity < 0:
-        raise HTTPException(status_code=400, detail="Stock cannot go below zero")
 
-    log = InventoryLog(
-        item_id=item_id,
-        change_qty=change_qty,
-        reason=reason,
-        performed_by=staff_id,
-    )
-    db.add(log)
-    db.commit()
-    db.refresh(item)
-    return item
+_ITEM_COLUMNS = [c for c in InventoryItem.__table__.c]
 
 
-def get_item_logs(db: Session, item_id: int) -> List[InventoryLog]:
+def _move_stmt(item_id: int, change_qty: int):
+    """Conditional UPDATE ... RETURNING: applies only if stock stays >= 0."""
+    items = InventoryItem.__table__
     return (
-        db.query(InventoryLog)
-        .filter(InventoryLog.item_id == item_id)
-        .order_by(InventoryLog.created_at.desc())
-        .all()
+        update(items)
+        .where(items.c.id == item_id, items.c.quantity + change_qty >= 0)
+        .values(quantity=items.c.quantity + change_qty)
+        .returning(*_ITEM_COLUMNS)
     )
 
 
-def get_expiring_items(db: Session, days: int = 30) -> List[InventoryItem]:
-    cutoff = date.today() + timedelta(days=days)
-    return (
-        db.query(InventoryItem)
-        .filter(
-            InventoryItem.expiry_date.isnot(None),
-            InventoryItem.expiry_date <= cutoff,
-        )
-        .order_by(InventoryItem.expiry_date)
-        .all()
+def _log_values(movement: StockMovement, staff_id: Optional[int]) -> dict:
+    return {
+        "item_id": movement.item_id,
+        "change_qty": movement.change_qty,
+        "reason": movement.reason,
+        "performed_by": staff_id,
+    }
+
+
+def _apply_one_postgres(db: Session, movement: StockMovement, staff_id: Optional[int]):
+    # One round trip: the log row is inserted from the UPDATE's RETURNING,
+    # so no row comes back (and nothing is logged) when the guard fails
+    moved = _move_stmt(movement.item_id, movement.change_qty).cte("moved")
+    logged = insert(InventoryLog).from_select(
+        ["item_id", "change_qty", "reason", "performed_by"],
+        select(
+            moved.c.id,
+            literal(movement.change_qty),
+            literal(movement.reason),
+            literal(staff_id, Integer),
+        ),
+    ).cte("logged")
+    return db.execute(select(moved).add_cte(logged)).mappings().first()
+
+
+def _stock_error(db: Session, item_id: int) -> HTTPException:
+    item = db.get(InventoryItem, item_id)
+    if not item:
+        return HTTPException(status_code=404, detail=f"Item {item_id} not found")
+    return HTTPException(
+        status_code=400,
+        detail=f"Stock cannot go below zero ({item.name}: {item.quantity} in stock)",
     )
 
 
+def apply_stock_movements(
+    db: Session, movements: Sequence[StockMovement], staff_id: Optional[int]
+) -> Dict[int, dict]:
+    """Apply stock changes atomically and log them; does not commit.
+
+    Each item gets one conditional UPDATE for its net change (row lock only,
+    taken in item id order so concurrent batches can't deadlock), then every
+    movement is logged with one bulk INSERT.  Raises 404 / 400 on the first
+    item that can't apply — the caller's rollback undoes the rest.  Returns
+    {item_id: updated item}.
+    """
+    if not movements:
+        return {}
+    if len(movements) == 1 and db.get_bind().dialect.name == "postgresql":
+        movement = movements[0]
+        row = _apply_one_postgres(db, movement, staff_id)
+        if row is None:
+            raise _stock_error(db, movement.item_id)
+        return {movement.item_id: dict(row)}
+
+    net: Dict[int, int] = defaultdict(int)
+    for movement in movements:
+        net[movement.item_id] += movement.change_qty
+    rows = {}
+    for item_id in sorted(net):
+        row = db.execute(_move_stmt(item_id, net[item_id])).mappings().first()
+        if row is None:
+            raise _stock_error(db, item_id)
+        rows[item_id] = dict(row)
+    db.execute(insert(InventoryLog), [_log_values(m, staff_id) for m in movements])
+    return rows
+
+
+def adjust_stock(
+    db: Session, item_id: int, change_qty: int, reason: str, staff_id: int
+) -> dict:
+    rows = apply_stock_movements(db, [StockMovement(item_id, change_qty, reason)], staff_id)
+    db.commit()
+    invalidate_dashboard()
+    invalidate_expiry_alerts()
+    return rows[item_id]
+
+
+def adjust_stock_batch(
+    db: Session, movements: Sequence[StockMovement], staff_id: int
+) -> List[dict]:
+    """Apply several stock changes in one transaction: all or nothing, with
+    each item's net change checked against its stock.  Returns each touched
+    item's final state, in first-seen order."""
+    rows = apply_stock_movements(db, movements, staff_id)
+    db.commit()
+    invalidate_dashboard()
+    invalidate_expiry_alerts()
+    return [rows[item_id] for item_id in dict.fromkeys(m.item_id for m in movements)]
+
+
+def get_item_logs(
+    db: Session,
+    item_id: int,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[InventoryLog], Optional[int]]:
+    return keyset_page(
+        db.query(InventoryLog).filter(InventoryLog.item_id == item_id),
+        InventoryLog, after_id, limit, order_col=InventoryLog.created_at,
+    )
+
+
+def get_expiring_items(db: Session, days: int = 30) -> List[dict]:
+    return expiring_within(db, days)
+
+
 def get_expiry_alerts(db: Session) -> dict:
     """Return inventory items grouped by expiry severity.
 
@@ -98,52 +211,4 @@ def get_expiry_alerts(db: Session) -> dict:
       warning  — expiring within 8–30 days
       upcoming — expiring within 31–90 days
     """
-    today = date.today()
-
-    items_with_expiry = (
-        db.query(InventoryItem)
-        .filter(InventoryItem.expiry_date.isnot(None))
-        .order_by(InventoryItem.expiry_date.asc())
-        .all()
-    )
-
-    expired: list = []
-    critical: list = []  # 0–7 days
-    warning: list = []   # 8–30 days
-    upcoming: list = []  # 31–90 days
-
-    for item in items_with_expiry:
-        delta = (item.expiry_date - today).days
-        if delta < 0:
-            level = "expired"
-            expired.append(_alert_dict(item, delta, level))
-        elif delta <= 7:
-            level = "critical"
-            critical.append(_alert_dict(item, delta, level))
-        elif delta <= 30:
-            level = "warning"
-            warning.append(_alert_dict(item, delta, level))
-        elif delta <= 90:
-            level = "upcoming"
-            upcoming.append(_alert_dict(item, delta, level))
-
-    return {
-        "expired": expired,
-        "critical": critical,
-        "warning": warning,
-        "upcoming": upcoming,
-        "total_alerts": len(expired) + len(critical) + len(warning) + len(upcoming),
-    }
-
-
-def _alert_dict(item: InventoryItem, days_until_expiry: int, alert_level: str) -> dict:
-    return {
-        "id": item.id,
-        "name": item.name,
-        "category": item.category,
-        "quantity": item.quantity,
-        "unit": item.unit,
-        "expiry_date": item.expiry_date,
-        "days_until_expiry": days_until_expiry,
-        "alert_level": alert_level,
-    }
+    return alert_summary(db)
@@ -0,0 +1,161 @@
+"""
+Historical stock from ledger checkpoints.
+
+``inventory_snapshots`` holds each item's quantity at the end of a day.  The
+stock on day D is then
+
+* the latest snapshot on or before D, plus the logged changes between that
+  snapshot and the end of D; or, for items with no such snapshot,
+* the current quantity minus the changes logged after the end of D.
+
+Either way only a bounded slice of each item's ``inventory_logs`` is read
+(on ``ix_inventory_logs_item_created``), and all items are reconstructed by
+a single statement, so the result is consistent even while stock moves.
+Day boundaries follow the database session's time zone.
+
+Take a snapshot of every item at the end of a day (default: yesterday):
+
+    python -m backend.app.inventory.snapshots [--date YYYY-MM-DD]
+"""
+
+import argparse
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, case, func, literal_column, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from backend.app.db.models import InventoryItem, InventoryLog, InventorySnapshot
+from backend.app.db.session import SessionLocal
+
+
+def _day_end(day: date) -> datetime:
+    return datetime.combine(day + timedelta(days=1), time.min)
+
+
+def _next_day(db: Session, column):
+    """SQL expression: the start of the day after the date in ``column``."""
+    if db.get_bind().dialect.name == "postgresql":
+        return column + literal_column("1")
+    return func.datetime(column, "+1 day")
+
+
+def _latest_snapshots(day: date, item_id: Optional[int], include_day: bool):
+    """Subquery (item_id, snapshot_date, quantity) of each item's latest snapshot <= day."""
+    upto = InventorySnapshot.snapshot_date <= day if include_day else InventorySnapshot.snapshot_date < day
+    latest = select(
+        InventorySnapshot.item_id,
+        func.max(InventorySnapshot.snapshot_date).label("snapshot_date"),
+    ).where(upto)
+    if item_id is not None:
+        latest = latest.where(InventorySnapshot.item_id == item_id)
+    latest = latest.group_by(InventorySnapshot.item_id).subquery()
+
+    return (
+        select(InventorySnapshot.item_id, InventorySnapshot.snapshot_date, InventorySnapshot.quantity)
+        .join(latest, and_(
+            InventorySnapshot.item_id == latest.c.item_id,
+            InventorySnapshot.snapshot_date == latest.c.snapshot_date,
+        ))
+        .subquery("snapshot")
+    )
+
+
+def _reconstruct(
+    db: Session, day: date, item_id: Optional[int] = None, include_day: bool = True
+) -> List[dict]:
+    # One statement, so the current quantities, snapshots and log sums all
+    # come from the same database snapshot even while stock is changing
+    snapshot = _latest_snapshots(day, item_id, include_day)
+    end = _day_end(day)
+    changes = (
+        select(func.coalesce(func.sum(InventoryLog.change_qty), 0))
+        .where(
+            InventoryLog.item_id == InventoryItem.id,
+            or_(
+                # forward from the snapshot to the end of the day
+                and_(InventoryLog.created_at >= _next_day(db, snapshot.c.snapshot_date),
+                     InventoryLog.created_at < end),
+                # backward from the current quantity
+                and_(snapshot.c.snapshot_date.is_(None), InventoryLog.created_at >= end),
+            ),
+        )
+        .scalar_subquery()
+    )
+    quantity = case(
+        (snapshot.c.snapshot_date.is_(None), InventoryItem.quantity - changes),
+        else_=snapshot.c.quantity + changes,
+    )
+    stmt = (
+        select(InventoryItem.id, InventoryItem.name, quantity, snapshot.c.snapshot_date)
+        .outerjoin(snapshot, snapshot.c.item_id == InventoryItem.id)
+        .order_by(InventoryItem.id)
+    )
+    if item_id is not None:
+        stmt = stmt.where(InventoryItem.id == item_id)
+
+    return [
+        {
+            "item_id": id_,
+            "name": name,
+            "date": day,
+            "quantity": int(qty),
+            "snapshot_date": snapshot_date,
+        }
+        for id_, name, qty, snapshot_date in db.execute(stmt)
+    ]
+
+
+def stock_at(db: Session, item_id: int, day: date) -> dict:
+    rows = _reconstruct(db, day, item_id=item_id)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return rows[0]
+
+
+def stock_at_all(db: Session, day: date) -> List[dict]:
+    return _reconstruct(db, day)
+
+
+def take_snapshots(db: Session, day: date) -> int:
+    """Checkpoint every item's stock at the end of ``day`` (re-running
+    replaces that day's rows).  Returns the number of items."""
+    if day >= date.today():
+        raise HTTPException(status_code=400, detail="Only closed days can be snapshotted")
+
+    # Rebuilt from earlier checkpoints, so a re-run corrects the day's rows
+    rows = _reconstruct(db, day, include_day=False)
+    if rows:
+        upsert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[db.get_bind().dialect.name]
+        stmt = upsert(InventorySnapshot.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["item_id", "snapshot_date"],
+            set_={"quantity": stmt.excluded.quantity, "created_at": func.now()},
+        )
+        db.execute(stmt, [
+            {"item_id": r["item_id"], "snapshot_date": day, "quantity": r["quantity"]}
+            for r in rows
+        ])
+    db.commit()
+    return len(rows)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Snapshot inventory stock at the end of a day.")
+    parser.add_argument("--date", type=date.fromisoformat, default=None,
+                        help="day to checkpoint (default: yesterday)")
+    args = parser.parse_args(argv)
+
+    day = args.date or date.today() - timedelta(days=1)
+    db = SessionLocal()
+    try:
+        count = take_snapshots(db, day)
+    finally:
+        db.close()
+    print(f"Snapshotted {count} items at the end of {day}")
+
+
+if __name__ == "__main__":
+    main()
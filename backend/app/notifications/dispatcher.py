@@ -0,0 +1,423 @@
+"""
+Background notification dispatch.
+
+Routes call ``queue_notification(db, ...)`` before committing, so nothing is
+sent and no extra transaction is opened on the request path.  Once the
+session commits:
+
+- in-memory mode, the queued messages go onto the worker's asyncio queue;
+- outbox mode (NOTIFICATION_OUTBOX), they were written to
+  ``notification_outbox`` in the caller's own transaction and the worker is
+  woken to claim them.  Rows survive restarts and are shared safely between
+  worker processes (``FOR UPDATE SKIP LOCKED``).
+
+A rollback drops whatever the session had queued.  In-memory messages
+committed while no worker is running (scripts, tests without the lifespan)
+are logged and dropped; nothing is ever sent from the commit hook itself.
+
+One worker task per process, started in the app lifespan, takes messages in
+batches: it renders them, sends each through the configured provider under
+per-channel rate limits with retries, and records the outcomes as
+NotificationLog rows with a single bulk insert.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, event, insert, or_, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.core.config import settings
+from backend.app.db.models import NotificationLog, NotificationOutbox, Owner, Pet
+from backend.app.db.session import SessionLocal
+from backend.app.notifications.providers import (
+    NotificationProvider,
+    ProviderError,
+    Recipient,
+    load_provider,
+)
+from backend.app.notifications.templates import render
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "pending_notifications"
+
+# A claimed outbox row whose worker died is claimed again after this long
+_CLAIM_LEASE = timedelta(minutes=5)
+
+
+@dataclass
+class OutgoingNotification:
+    owner_id: int
+    template: str
+    context: dict
+    channel: str = "sms"
+    appointment_id: Optional[int] = None
+    outbox_id: Optional[int] = None
+
+
+class TokenBucket:
+    """``rate`` sends per second with bursts of up to ``rate`` (at least 1).
+
+    Only used from the dispatcher's event loop, so it needs no lock.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+async def send_with_retries(
+    provider: NotificationProvider,
+    channel: str,
+    recipient: Recipient,
+    message: str,
+    bucket: Optional[TokenBucket] = None,
+) -> Tuple[bool, int]:
+    """Send one message, retrying ProviderError with exponential backoff.
+
+    Returns (delivered, attempts made).
+    """
+    max_attempts = settings.NOTIFICATION_MAX_ATTEMPTS
+    for attempt in range(1, max_attempts + 1):
+        if bucket is not None:
+            await bucket.acquire()
+        try:
+            await provider.send(channel, recipient, message)
+            return True, attempt
+        except ProviderError as e:
+            if attempt == max_attempts:
+                logger.warning("Notification to owner %s failed: %s", recipient.owner_id, e)
+                break
+            await asyncio.sleep(settings.NOTIFICATION_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        except Exception:
+            logger.exception("Notification provider error")
+            break
+    return False, attempt
+
+
+# ──────────── DATABASE WORK (runs in the threadpool) ────────────
+
+def _load_recipients(
+    batch: Sequence[OutgoingNotification],
+) -> Tuple[Dict[int, Recipient], Dict[int, str]]:
+    owner_ids = {item.owner_id for item in batch}
+    pet_ids = {item.context["pet_id"] for item in batch if item.context.get("pet_id")}
+    db = SessionLocal()
+    try:
+        recipients = {
+            row.id: Recipient(owner_id=row.id, name=row.name, phone=row.phone, email=row.email)
+            for row in db.execute(
+                select(Owner.id, Owner.name, Owner.phone, Owner.email)
+                .where(Owner.id.in_(owner_ids))
+            )
+        }
+        pet_names = {}
+        if pet_ids:
+            pet_names = dict(db.execute(select(Pet.id, Pet.name).where(Pet.id.in_(pet_ids))).all())
+        return recipients, pet_names
+    finally:
+        db.close()
+
+
+def _record(batch: Sequence[OutgoingNotification], results: Sequence[Tuple[Optional[str], Optional[str]]]) -> None:
+    logs = [
+        {
+            "owner_id": item.owner_id,
+            "appointment_id": item.appointment_id,
+            "channel": item.channel,
+            "message": message,
+            "status": status,
+        }
+        for item, (message, status) in zip(batch, results)
+        if status is not None
+    ]
+    outbox_ids = [item.outbox_id for item in batch if item.outbox_id is not None]
+    db = SessionLocal()
+    try:
+        if logs:
+            db.execute(insert(NotificationLog), logs)
+        if outbox_ids:
+            db.execute(delete(NotificationOutbox).where(NotificationOutbox.id.in_(outbox_ids)))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _claim_outbox(limit: int) -> List[OutgoingNotification]:
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(NotificationOutbox)
+            .where(
+                or_(
+                    NotificationOutbox.status == "pending",
+                    and_(
+                        NotificationOutbox.status == "sending",
+                        NotificationOutbox.claimed_at < now - _CLAIM_LEASE,
+                    ),
+                )
+            )
+            .order_by(NotificationOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not rows:
+            return []
+        db.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_([r.id for r in rows]))
+            .values(status="sending", claimed_at=now, attempts=NotificationOutbox.attempts + 1)
+        )
+        batch = [
+            OutgoingNotification(
+                owner_id=r.owner_id,
+                template=r.template,
+                context=r.context,
+                channel=r.channel,
+                appointment_id=r.appointment_id,
+                outbox_id=r.id,
+            )
+            for r in rows
+        ]
+        db.commit()
+        return batch
+    finally:
+        db.close()
+
+
+# ──────────── DISPATCHER ────────────
+
+class NotificationDispatcher:
+    def __init__(self, provider: Optional[NotificationProvider] = None):
+        self.provider = provider
+        self.outbox = settings.NOTIFICATION_OUTBOX
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.counters = {"queued": 0, "dropped": 0, "sent": 0, "failed": 0, "retries": 0, "batches": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def get_provider(self) -> NotificationProvider:
+        if self.provider is None:
+            self.provider = load_provider()
+        return self.provider
+
+    def start(self) -> None:
+        """Start the worker on the running event loop (called from the lifespan)."""
+        if self.running:
+            return
+        self.get_provider()
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._buckets = {
+            channel: TokenBucket(rate)
+            for channel, rate in settings.notification_rate_limits.items()
+            if rate > 0
+        }
+        if self.outbox:
+            # Pick up rows left behind by a previous process
+            self._wakeup.set()
+        self._task = asyncio.create_task(self._run(), name="notification-dispatcher")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        if not self.running:
+            return
+        if not self.outbox:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Dropping %d queued notifications at shutdown", self._queue.qsize())
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
+
+    def submit(self, batch: List[OutgoingNotification]) -> None:
+        """Hand committed notifications to the worker; safe from any thread.
+
+        Called from the session's after_commit hook, so it never sends or
+        blocks itself.
+        """
+        if not self.running and not self.outbox:
+            # No worker in this process (scripts, tests without the
+            # lifespan) and nothing persisted: use outbox mode where
+            # notifications must survive that.
+            self.counters["dropped"] += len(batch)
+            logger.warning("No notification worker running; dropping %d notifications", len(batch))
+            return
+
+        self.counters["queued"] += len(batch)
+        if not self.running:
+            # Outbox rows wait for the next worker
+            return
+        if self.outbox:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        else:
+            for item in batch:
+                self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self.outbox:
+                    await self._drain_outbox()
+                else:
+                    batch = [await self._queue.get()]
+                    while len(batch) < settings.NOTIFICATION_BATCH_SIZE and not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                    try:
+                        await self._dispatch(batch)
+                    finally:
+                        for _ in batch:
+                            self._queue.task_done()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Notification dispatch failed")
+                await asyncio.sleep(1)
+
+    async def _drain_outbox(self) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), settings.NOTIFICATION_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+        while True:
+            batch = await run_in_threadpool(_claim_outbox, settings.NOTIFICATION_BATCH_SIZE)
+            if not batch:
+                return
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch: List[OutgoingNotification]) -> None:
+        recipients, pet_names = await run_in_threadpool(_load_recipients, batch)
+        results = await asyncio.gather(
+            *(self._deliver(item, recipients, pet_names) for item in batch)
+        )
+        await run_in_threadpool(_record, batch, results)
+        self.counters["batches"] += 1
+
+    async def _deliver(
+        self,
+        item: OutgoingNotification,
+        recipients: Dict[int, Recipient],
+        pet_names: Dict[int, str],
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Send one message; returns (message, status), status None to skip logging."""
+        recipient = recipients.get(item.owner_id)
+        if recipient is None:
+            logger.warning("Dropping notification for unknown owner %s", item.owner_id)
+            return None, None
+        try:
+            message = render(item.template, {
+                "owner_name": recipient.name,
+                "pet_name": pet_names.get(item.context.get("pet_id"), "your pet"),
+                **item.context,
+            })
+        except (KeyError, ValueError):
+            logger.exception("Cannot render notification template %r", item.template)
+            self.counters["failed"] += 1
+            return None, "failed"
+
+        sent, attempts = await send_with_retries(
+            self.get_provider(), item.channel, recipient, message,
+            bucket=self._buckets.get(item.channel),
+        )
+        self.counters["retries"] += attempts - 1
+        if sent:
+            self.counters["sent"] += 1
+            return message, "sent"
+        self.counters["failed"] += 1
+        return message, "failed"
+
+    def stats(self) -> dict:
+        return {
+            "mode": "outbox" if self.outbox else "memory",
+            "running": self.running,
+            "provider": type(self.provider).__name__ if self.provider else None,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "rate_limits": settings.notification_rate_limits,
+            **self.counters,
+        }
+
+
+dispatcher = NotificationDispatcher()
+
+
+# ──────────── ENQUEUE API ────────────
+
+def queue_notification(
+    db: Session,
+    owner_id: int,
+    template: str,
+    context: dict,
+    channel: str = "sms",
+    appointment_id: Optional[int] = None,
+) -> None:
+    """Queue a templated notification to go out when ``db`` commits.
+
+    Call before ``db.commit()``. ``context`` must be JSON-serializable; it
+    may carry a ``pet_id`` for the {pet_name} placeholder.
+    """
+    if not db.in_transaction():
+        # Tie the queue to a transaction so a rollback can discard it
+        db.begin()
+    if dispatcher.outbox:
+        db.add(NotificationOutbox(
+            owner_id=owner_id,
+            appointment_id=appointment_id,
+            channel=channel,
+            template=template,
+            context=context,
+        ))
+    db.info.setdefault(_PENDING_KEY, []).append(
+        OutgoingNotification(
+            owner_id=owner_id,
+            template=template,
+            context=context,
+            channel=channel,
+            appointment_id=appointment_id,
+        )
+    )
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _submit_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        dispatcher.submit(pending)
+
+
+@event.listens_for(SessionLocal, "after_transaction_end")
+def _drop_pending(session: Session, transaction) -> None:
+    # Runs after after_commit, so anything still queued here was rolled back
+    # or abandoned with session.close(). Savepoints leave the queue alone.
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,59 @@
+import asyncio
+import importlib
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from backend.app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Recipient:
+    owner_id: int
+    name: str
+    phone: Optional[str]
+    email: Optional[str]
+
+
+class ProviderError(Exception):
+    """A failed delivery that is worth retrying."""
+
+
+class NotificationProvider:
+    """Delivers one rendered message over a channel (sms / whatsapp / email).
+
+    Implementations raise ProviderError for failures the dispatcher should
+    retry; any other exception fails the message immediately.
+    """
+
+    async def send(self, channel: str, recipient: Recipient, message: str) -> None:
+        raise NotImplementedError
+
+
+class MockProvider(NotificationProvider):
+    """Keeps messages in memory instead of sending them (local runs, tests).
+
+    ``fail_every=n`` makes every n-th call raise ProviderError.
+    """
+
+    def __init__(self, latency: float = 0.0, fail_every: int = 0):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.calls = 0
+        self.sent: List[Tuple[str, int, str]] = []
+
+    async def send(self, channel: str, recipient: Recipient, message: str) -> None:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.fail_every and self.calls % self.fail_every == 0:
+            raise ProviderError("mock provider failure")
+        self.sent.append((channel, recipient.owner_id, message))
+
+
+def load_provider(spec: Optional[str] = None) -> NotificationProvider:
+    """Build the provider named by NOTIFICATION_PROVIDER ("mock" or "module:Class")."""
+    spec = spec or settings.NOTIFICATION_PROVIDER
+    if spec == "mock":
+        return MockProvider()
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
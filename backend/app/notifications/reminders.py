@@ -0,0 +1,319 @@
+"""
+Day-before appointment reminders.
+
+A campaign for date D:
+
+1. selects every ``scheduled`` appointment on D that has no reminder yet,
+   together with its owner and pet, in one query;
+2. per chunk, claims the appointments in ``reminder_sends`` (INSERT ... ON
+   CONFLICT DO NOTHING RETURNING, so overlapping or repeated runs claim each
+   appointment exactly once), bulk-inserts the rendered NotificationLog rows
+   as ``pending`` and commits;
+3. sends the chunk with up to REMINDER_CONCURRENCY messages in flight and
+   records sent / failed with one executemany UPDATE.
+
+Logs a crashed run left ``pending`` are re-claimed (an UPDATE ... RETURNING
+that moves their ``sent_at`` forward) and sent by the next run for that
+date; concurrent runs never both resend the same log.
+
+    python -m backend.app.notifications.reminders [--date YYYY-MM-DD] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Sequence
+
+from sqlalchemy import exists, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.core.config import settings
+from backend.app.db.models import Appointment, NotificationLog, Owner, Pet, ReminderSend
+from backend.app.db.session import SessionLocal
+from backend.app.notifications.dispatcher import dispatcher, send_with_retries
+from backend.app.notifications.providers import NotificationProvider, Recipient
+from backend.app.notifications.templates import render
+
+KIND = "day_before"
+TEMPLATE = "appointment_reminder"
+
+# Pending logs younger than this may still be in flight in another run
+_RESUME_AFTER = timedelta(minutes=10)
+
+# Chunks being claimed / sent / recorded at the same time, so one chunk's
+# database round trips and retry backoffs overlap with the others' sends
+_CHUNKS_IN_FLIGHT = 4
+
+
+@dataclass
+class _Reminder:
+    appointment_id: int
+    recipient: Recipient
+    message: str
+    log_id: Optional[int] = None
+
+
+def _candidates_stmt(day: date):
+    already_sent = exists().where(
+        ReminderSend.appointment_id == Appointment.id,
+        ReminderSend.kind == KIND,
+    )
+    return (
+        select(
+            Appointment.id,
+            Appointment.appointment_time,
+            Owner.id.label("owner_id"),
+            Owner.name.label("owner_name"),
+            Owner.phone,
+            Owner.email,
+            Pet.name.label("pet_name"),
+        )
+        .join(Owner, Owner.id == Appointment.owner_id)
+        .join(Pet, Pet.id == Appointment.pet_id)
+        .where(
+            Appointment.appointment_date == day,
+            Appointment.status == "scheduled",
+            ~already_sent,
+        )
+        .order_by(Appointment.id)
+    )
+
+
+def _to_reminder(row, day: date) -> _Reminder:
+    return _Reminder(
+        appointment_id=row.id,
+        recipient=Recipient(
+            owner_id=row.owner_id, name=row.owner_name, phone=row.phone, email=row.email
+        ),
+        message=render(TEMPLATE, {
+            "owner_name": row.owner_name,
+            "pet_name": row.pet_name,
+            "date": day.strftime('%d-%b-%Y'),
+            "time": row.appointment_time.strftime('%I:%M %p'),
+        }),
+    )
+
+
+def _load_candidates(day: date) -> List[_Reminder]:
+    db = SessionLocal()
+    try:
+        return [_to_reminder(row, day) for row in db.execute(_candidates_stmt(day))]
+    finally:
+        db.close()
+
+
+def _load_unsent(day: date, channel: str) -> List[_Reminder]:
+    """Re-claim logs an earlier run left pending and return them.
+
+    The UPDATE moves ``sent_at`` forward, so a concurrent run (whose UPDATE
+    waits on the row locks and re-checks ``sent_at < cutoff``) gets none of
+    the rows this one returned, and vice versa.
+    """
+    cutoff = datetime.now(timezone.utc) - _RESUME_AFTER
+    db = SessionLocal()
+    try:
+        logs = db.execute(
+            update(NotificationLog)
+            .where(
+                NotificationLog.status == "pending",
+                NotificationLog.channel == channel,
+                NotificationLog.sent_at < cutoff,
+                NotificationLog.appointment_id.in_(
+                    select(ReminderSend.appointment_id).where(
+                        ReminderSend.appointment_date == day,
+                        ReminderSend.kind == KIND,
+                    )
+                ),
+            )
+            .values(sent_at=func.now())
+            .returning(
+                NotificationLog.id,
+                NotificationLog.appointment_id,
+                NotificationLog.owner_id,
+                NotificationLog.message,
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+        if not logs:
+            return []
+
+        owners = {
+            owner.id: owner
+            for owner in db.execute(
+                select(Owner.id, Owner.name, Owner.phone, Owner.email)
+                .where(Owner.id.in_({log.owner_id for log in logs}))
+            )
+        }
+        return [
+            _Reminder(
+                appointment_id=log.appointment_id,
+                recipient=Recipient(
+                    owner_id=log.owner_id,
+                    name=owners[log.owner_id].name,
+                    phone=owners[log.owner_id].phone,
+                    email=owners[log.owner_id].email,
+                ),
+                message=log.message,
+                log_id=log.id,
+            )
+            for log in sorted(logs, key=lambda log: log.id)
+        ]
+    finally:
+        db.close()
+
+
+def _claim(db, day: date, appointment_ids: Sequence[int]) -> set:
+    """Insert the ledger rows; returns the appointment ids this call claimed."""
+    table = ReminderSend.__table__
+    upsert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[db.get_bind().dialect.name]
+    # executemany keeps one cached statement (insertmanyvalues batches it);
+    # rows that hit the unique key return nothing
+    stmt = (
+        upsert(table)
+        .on_conflict_do_nothing(index_elements=["appointment_id", "kind"])
+        .returning(table.c.appointment_id)
+    )
+    return set(db.execute(stmt, [
+        {"appointment_id": i, "kind": KIND, "appointment_date": day}
+        for i in appointment_ids
+    ]).scalars())
+
+
+def _claim_chunk(day: date, chunk: List[_Reminder], channel: str) -> List[_Reminder]:
+    """Claim a chunk and write its pending logs in one transaction."""
+    db = SessionLocal()
+    try:
+        claimed = _claim(db, day, [r.appointment_id for r in chunk])
+        ours = [r for r in chunk if r.appointment_id in claimed]
+        if ours:
+            log_ids = db.execute(
+                insert(NotificationLog).returning(NotificationLog.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "owner_id": r.recipient.owner_id,
+                        "appointment_id": r.appointment_id,
+                        "channel": channel,
+                        "message": r.message,
+                        "status": "pending",
+                    }
+                    for r in ours
+                ],
+            ).scalars().all()
+            for reminder, log_id in zip(ours, log_ids):
+                reminder.log_id = log_id
+        db.commit()
+        return ours
+    finally:
+        db.close()
+
+
+def _record_statuses(reminders: Sequence[_Reminder], statuses: Sequence[str]) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(NotificationLog),
+            [{"id": r.log_id, "status": s} for r, s in zip(reminders, statuses)],
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _send_all(
+    provider: NotificationProvider,
+    reminders: Sequence[_Reminder],
+    channel: str,
+    semaphore: asyncio.Semaphore,
+) -> List[str]:
+    async def send(reminder: _Reminder) -> str:
+        async with semaphore:
+            delivered, _ = await send_with_retries(
+                provider, channel, reminder.recipient, reminder.message
+            )
+            return "sent" if delivered else "failed"
+
+    return await asyncio.gather(*(send(r) for r in reminders))
+
+
+async def run_reminder_campaign(
+    day: Optional[date] = None,
+    channel: str = "sms",
+    concurrency: Optional[int] = None,
+    dry_run: bool = False,
+    provider: Optional[NotificationProvider] = None,
+) -> dict:
+    """Send reminders for appointments on ``day`` (default: tomorrow)."""
+    started = time.perf_counter()
+    day = day or date.today() + timedelta(days=1)
+    concurrency = concurrency or settings.REMINDER_CONCURRENCY
+    provider = provider or dispatcher.get_provider()
+
+    candidates = await run_in_threadpool(_load_candidates, day)
+    summary = {
+        "date": day.isoformat(),
+        "selected": len(candidates),
+        "claimed": 0,
+        "resumed": 0,
+        "sent": 0,
+        "failed": 0,
+    }
+    if dry_run:
+        summary["sample"] = candidates[0].message if candidates else None
+        summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return summary
+
+    send_slots = asyncio.Semaphore(concurrency)
+    chunk_slots = asyncio.Semaphore(_CHUNKS_IN_FLIGHT)
+
+    async def deliver(batch: List[_Reminder]) -> None:
+        statuses = await _send_all(provider, batch, channel, send_slots)
+        await run_in_threadpool(_record_statuses, batch, statuses)
+        summary["sent"] += statuses.count("sent")
+        summary["failed"] += statuses.count("failed")
+
+    unsent = await run_in_threadpool(_load_unsent, day, channel)
+    if unsent:
+        summary["resumed"] = len(unsent)
+        await deliver(unsent)
+
+    async def process(chunk: List[_Reminder]) -> None:
+        async with chunk_slots:
+            claimed = await run_in_threadpool(_claim_chunk, day, chunk, channel)
+            summary["claimed"] += len(claimed)
+            if claimed:
+                await deliver(claimed)
+
+    size = settings.REMINDER_CHUNK_SIZE
+    await asyncio.gather(*(
+        process(candidates[offset:offset + size])
+        for offset in range(0, len(candidates), size)
+    ))
+
+    summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return summary
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Send day-before appointment reminders.")
+    parser.add_argument("--date", type=date.fromisoformat, default=None,
+                        help="appointment date (default: tomorrow)")
+    parser.add_argument("--channel", default="sms")
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(run_reminder_campaign(
+        day=args.date,
+        channel=args.channel,
+        concurrency=args.concurrency,
+        dry_run=args.dry_run,
+    ))
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
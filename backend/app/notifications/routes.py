@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
+from datetime import date
 from typing import List, Optional
 
 from backend.app.core.dependencies import get_current_user
+from backend.app.core.pagination import PageParams, set_next_cursor
 from backend.app.core.roles import require_admin
 from backend.app.db.models import StaffUser
 from backend.app.db.session import get_db
+from backend.app.notifications.dispatcher import dispatcher
+from backend.app.notifications.reminders import run_reminder_campaign
 from backend.app.notifications.schemas import NotificationSend, NotificationLogResponse
 from backend.app.notifications.service import send_notification, get_notification_logs
 
@@ -29,8 +33,32 @@ def send(
 
 @router.get("/logs", response_model=List[NotificationLogResponse])
 def logs(
+    response: Response,
     owner_id: Optional[int] = Query(default=None),
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: StaffUser = Depends(require_admin),
 ):
-    return get_notification_logs(db, owner_id=owner_id)
+    rows, next_cursor = get_notification_logs(
+        db, owner_id=owner_id, after_id=page.after_id, limit=page.limit
+    )
+    set_next_cursor(response, next_cursor)
+    return rows
+
+
+@router.get("/dispatch/stats")
+def dispatch_stats(current_user: StaffUser = Depends(require_admin)):
+    return dispatcher.stats()
+
+
+@router.post("/reminders/run")
+async def run_reminders(
+    day: Optional[date] = Query(default=None, alias="date"),
+    dry_run: bool = Query(default=False),
+    current_user: StaffUser = Depends(require_admin),
+):
+    """Send reminders for appointments on ``date`` (default: tomorrow).
+
+    Safe to call repeatedly: appointments already reminded are skipped.
+    """
+    return await run_reminder_campaign(day=day, dry_run=dry_run)
@@ -1,6 +1,7 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 
+from backend.app.core.pagination import DEFAULT_PAGE_SIZE, keyset_page
 from backend.app.db.models import NotificationLog
 
 
@@ -31,8 +32,10 @@ def send_notification(
 def get_notification_logs(
     db: Session,
     owner_id: Optional[int] = None,
-) -> List[NotificationLog]:
+    after_id: Optional[int] = None,
+    limit: Optional[int] = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[NotificationLog], Optional[int]]:
     q = db.query(NotificationLog)
     if owner_id:
         q = q.filter(NotificationLog.owner_id == owner_id)
-    return q.order_by(NotificationLog.sent_at.desc()).all()
+    return keyset_page(q, NotificationLog, after_id, limit, order_col=NotificationLog.sent_at)
@@ -0,0 +1,28 @@
+from typing import Dict
+
+# Message templates, rendered with str.format_map. Every template gets
+# {owner_name}; {pet_name} is filled in when the context has a pet_id.
+TEMPLATES: Dict[str, str] = {
+    "appointment_confirmed": (
+        "Hi {owner_name}! Your appointment for {pet_name} is confirmed "
+        "on {date} at {time}. — VetCore Pet Clinic"
+    ),
+    "appointment_cancelled": (
+        "Hi {owner_name}, your appointment for {pet_name} "
+        "on {date} has been cancelled. "
+        "Please contact us to reschedule. — VetCore Pet Clinic"
+    ),
+    "appointment_reminder": (
+        "Hi {owner_name}! A reminder that {pet_name} has an appointment "
+        "on {date} at {time}. — VetCore Pet Clinic"
+    ),
+    "payment_received": (
+        "Hi {owner_name}! Payment of ₹{amount} received "
+        "via {payment_method} for Invoice #{invoice_id}. "
+        "Thank you! — VetCore Pet Clinic"
+    ),
+}
+
+
+def render(template: str, context: dict) -> str:
+    return TEMPLATES[template].format_map(context)
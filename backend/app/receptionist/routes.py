@@ -1,20 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from typing import Iterator, List, Optional
+
+from backend.app.core.config import settings
+from backend.app.core.pagination import PageParams, keyset_page, set_next_cursor
+from backend.app.core.streaming import ExportFormat, export_response
 from backend.app.core.roles import require_receptionist
 from backend.app.core.dependencies import get_db
+from backend.app.db.session import get_async_db
 from backend.app.db.models import Owner, Pet, StaffUser, Appointment
+from backend.app.appointments.service import appointments_on, appointments_on_async
+from backend.app.appointments.availability import invalidate_availability, reserve_slot
+from backend.app.appointments.board import board_changed
 from backend.app.receptionist.schemas import (
     OwnerCreate,
     OwnerResponse,
+    OwnerSearchResult,
     PetCreate,
     PetResponse,
     AppointmentCreate,
     AppointmentUpdate,
     AppointmentResponse,
 )
-from backend.app.notifications.service import send_notification
+from backend.app.notifications.dispatcher import queue_notification
+from backend.app.receptionist.search import invalidate_search_index, search_owners
+from backend.app.reports.rollup import apply_rollups, capture_rollups
+from backend.app.reports.service import invalidate_dashboard
 from datetime import date
 
 router = APIRouter(
@@ -33,16 +45,21 @@ def create_owner(
     owner = Owner(**data.model_dump())
     db.add(owner)
     db.commit()
+    invalidate_search_index()
     db.refresh(owner)
     return owner
 
 
 @router.get("/owners", response_model=List[OwnerResponse])
 def list_owners(
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: StaffUser = Depends(require_receptionist),
 ):
-    return db.query(Owner).order_by(Owner.id.desc()).all()
+    owners, next_cursor = keyset_page(db.query(Owner), Owner, page.after_id, page.limit)
+    set_next_cursor(response, next_cursor)
+    return owners
 
 
 @router.get("/owners/search", response_model=List[OwnerResponse])
@@ -60,6 +77,23 @@ def search_owner(
     return query.all()
 
 
+@router.get("/owners/fuzzy", response_model=List[OwnerSearchResult])
+def fuzzy_search_owners(
+    q: str = Query(min_length=2, max_length=100, description="name, email, phone digits or pet name"),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: StaffUser = Depends(require_receptionist),
+):
+    return [
+        OwnerSearchResult(
+            **OwnerResponse.model_validate(owner).model_dump(),
+            score=score,
+            pet_names=pet_names,
+        )
+        for owner, score, pet_names in search_owners(db, q, limit)
+    ]
+
+
 # ---------------- PET ----------------
 
 @router.post("/owners/{owner_id}/pets", response_model=PetResponse)
@@ -76,6 +110,7 @@ def create_pet(
     pet = Pet(owner_id=owner_id, **data.model_dump())
     db.add(pet)
     db.commit()
+    invalidate_search_index()
     db.refresh(pet)
     return pet
 
@@ -109,6 +144,10 @@ def create_appointment(
     # ✅ FIXED: Both types start as scheduled
     status = "scheduled"  # Both walk-in and scheduled start as scheduled
 
+    # Walk-ins are already in the clinic: they take a slot but aren't refused
+    if data.type == "scheduled":
+        reserve_slot(db, data.appointment_date, data.appointment_time)
+
     appointment = Appointment(
         owner_id=data.owner_id,
         pet_id=data.pet_id,
@@ -121,42 +160,44 @@ def create_appointment(
 
 
     db.add(appointment)
+    db.flush()
+    apply_rollups(db, [appointment.id])
+
+    # Appointment confirmation goes out once the booking commits
+    queue_notification(
+        db,
+        owner_id=owner.id,
+        template="appointment_confirmed",
+        context={
+            "pet_id": pet.id,
+            "date": data.appointment_date.strftime('%d-%b-%Y'),
+            "time": data.appointment_time.strftime('%I:%M %p'),
+        },
+        appointment_id=appointment.id,
+    )
     db.commit()
+    invalidate_dashboard()
+    invalidate_availability(appointment.appointment_date)
+    board_changed()
     db.refresh(appointment)
 
-    # Auto-send appointment confirmation notification
-    try:
-        pet_name = pet.name if pet else "your pet"
-        msg = (
-            f"Hi {owner.name}! Your appointment for {pet_name} is confirmed "
-            f"on {data.appointment_date.strftime('%d-%b-%Y')} at {data.appointment_time.strftime('%I:%M %p')}. "
-            f"— VetCore Pet Clinic"
-        )
-        send_notification(
-            db=db,
-            owner_id=owner.id,
-            message=msg,
-            channel="sms",
-            appointment_id=appointment.id,
-        )
-    except Exception:
-        pass  # Don't fail appointment creation if notification fails
-
     return appointment
 
 
-@router.get("/appointments/today", response_model=list[AppointmentResponse])
-def list_today_appointments(
-    db: Session = Depends(get_db),
-    current_user: StaffUser = Depends(require_receptionist),
-):
-    today = date.today()
-    return (
-        db.query(Appointment)
-        .filter(Appointment.appointment_date == today)
-        .order_by(Appointment.appointment_time)
-        .all()
-    )
+if settings.DB_ASYNC:
+    @router.get("/appointments/today", response_model=list[AppointmentResponse])
+    async def list_today_appointments(
+        db: AsyncSession = Depends(get_async_db),
+        current_user: StaffUser = Depends(require_receptionist),
+    ):
+        return await appointments_on_async(db, date.today())
+else:
+    @router.get("/appointments/today", response_model=list[AppointmentResponse])
+    def list_today_appointments(
+        db: Session = Depends(get_db),
+        current_user: StaffUser = Depends(require_receptionist),
+    ):
+        return appointments_on(db, date.today())
 
 
 @router.get("/appointments", response_model=list[AppointmentResponse])
@@ -165,11 +206,56 @@ def list_appointments_by_date(
     db: Session = Depends(get_db),
     current_user: StaffUser = Depends(require_receptionist),
 ):
-    return (
+    return appointments_on(db, appointment_date)
+
+
+APPOINTMENT_EXPORT_FIELDS = [
+    "id", "appointment_date", "appointment_time", "type", "status",
+    "owner_id", "owner_name", "owner_phone", "pet_id", "pet_name", "species", "notes",
+]
+
+
+def _iter_appointment_export(db: Session, start: date, end: date) -> Iterator[dict]:
+    appointments = (
         db.query(Appointment)
-        .filter(Appointment.appointment_date == appointment_date)
-        .order_by(Appointment.appointment_time)
-        .all()
+        .options(joinedload(Appointment.owner), joinedload(Appointment.pet))
+        .filter(
+            Appointment.appointment_date >= start,
+            Appointment.appointment_date <= end,
+        )
+        .order_by(Appointment.appointment_date, Appointment.appointment_time, Appointment.id)
+        .yield_per(500)
+    )
+    for a in appointments:
+        yield {
+            "id": a.id,
+            "appointment_date": a.appointment_date,
+            "appointment_time": a.appointment_time,
+            "type": a.type,
+            "status": a.status,
+            "owner_id": a.owner_id,
+            "owner_name": a.owner.name if a.owner else None,
+            "owner_phone": a.owner.phone if a.owner else None,
+            "pet_id": a.pet_id,
+            "pet_name": a.pet.name if a.pet else None,
+            "species": a.pet.species if a.pet else None,
+            "notes": a.notes,
+        }
+
+
+@router.get("/appointments/export")
+def export_appointments(
+    start: date = Query(...),
+    end: date = Query(...),
+    format: ExportFormat = Query(default="ndjson"),
+    current_user: StaffUser = Depends(require_receptionist),
+):
+    """Stream appointments dated [start, end] as NDJSON or CSV."""
+    return export_response(
+        lambda db: _iter_appointment_export(db, start, end),
+        fmt=format,
+        filename=f"appointments_{start}_{end}",
+        csv_fields=APPOINTMENT_EXPORT_FIELDS,
     )
 
 
@@ -189,7 +275,10 @@ def update_appointment(
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
 
+    rollups = capture_rollups(db, [appointment.id])
     old_status = appointment.status
+    old_date = appointment.appointment_date
+    old_time = appointment.appointment_time
 
     if data.appointment_date:
         appointment.appointment_date = data.appointment_date
@@ -200,29 +289,40 @@ def update_appointment(
     if data.notes is not None:
         appointment.notes = data.notes
 
-    db.commit()
-    db.refresh(appointment)
+    # Moving a scheduled appointment, or reinstating a cancelled one, needs
+    # room in the target slot
+    if (
+        appointment.type == "scheduled"
+        and appointment.status != "cancelled"
+        and (
+            appointment.appointment_date != old_date
+            or appointment.appointment_time != old_time
+            or old_status == "cancelled"
+        )
+    ):
+        reserve_slot(
+            db, appointment.appointment_date, appointment.appointment_time,
+            exclude_id=appointment.id,
+        )
+
+    apply_rollups(db, [appointment.id], rollups)
 
-    # Auto-send notification on cancellation
+    # Cancellation notice goes out once the change commits
     if data.status and data.status == "cancelled" and old_status != "cancelled":
-        try:
-            owner = db.query(Owner).filter(Owner.id == appointment.owner_id).first()
-            pet = db.query(Pet).filter(Pet.id == appointment.pet_id).first()
-            if owner:
-                pet_name = pet.name if pet else "your pet"
-                msg = (
-                    f"Hi {owner.name}, your appointment for {pet_name} "
-                    f"on {appointment.appointment_date.strftime('%d-%b-%Y')} has been cancelled. "
-                    f"Please contact us to reschedule. — VetCore Pet Clinic"
-                )
-                send_notification(
-                    db=db,
-                    owner_id=owner.id,
-                    message=msg,
-                    channel="sms",
-                    appointment_id=appointment.id,
-                )
-        except Exception:
-            pass
+        queue_notification(
+            db,
+            owner_id=appointment.owner_id,
+            template="appointment_cancelled",
+            context={
+                "pet_id": appointment.pet_id,
+                "date": appointment.appointment_date.strftime('%d-%b-%Y'),
+            },
+            appointment_id=appointment.id,
+        )
+    db.commit()
+    invalidate_dashboard()
+    invalidate_availability(old_date, appointment.appointment_date)
+    board_changed()
+    db.refresh(appointment)
 
     return appointment
\ No newline at end of file
@@ -22,6 +22,11 @@ class OwnerResponse(BaseModel):
         from_attributes = True
 
 
+class OwnerSearchResult(OwnerResponse):
+    score: float                 # 0..1, best match first
+    pet_names: List[str] = []
+
+
 # ---------- PET ----------
 
 class PetCreate(BaseModel):
@@ -75,6 +80,12 @@ class AppointmentResponse(BaseModel):
     notes: Optional[str] = None
     owner_name: Optional[str] = None
     pet_name: Optional[str] = None
+    # Filled in by the enriched listings (backend.app.appointments)
+    owner_phone: Optional[str] = None
+    pet_species: Optional[str] = None
+    invoice_id: Optional[int] = None
+    invoice_status: Optional[str] = None     # latest invoice's payment_status
+    medical_record_id: Optional[int] = None
 
     class Config:
         from_attributes = True
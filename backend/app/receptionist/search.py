@@ -0,0 +1,194 @@
+"""
+Fuzzy owner search over owner name, email, phone suffix and pet name.
+
+PostgreSQL uses pg_trgm GiST indexes (migration 0005): each field is
+searched with a nearest-neighbour scan (``<<->``, word-similarity distance)
+capped at a few dozen rows, so the cost stays flat as the owners table
+grows.  Phone numbers match on their trailing digits through an index on
+the reversed digit string.
+
+Other databases (SQLite test runs) use ``TrigramIndex``, an in-memory
+index built with the same trigram rules as pg_trgm and cached like the
+service catalog.  Owner / pet writes invalidate it.
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import Float, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from backend.app.core.cache import TTLCache
+from backend.app.core.config import settings
+from backend.app.db.models import Owner, Pet
+
+# Results below this similarity (0..1) are dropped
+MIN_SCORE = 0.3
+# Phone searches need at least this many digits
+MIN_PHONE_DIGITS = 3
+# Relative weight of a match on each field
+_WEIGHTS = {"name": 1.0, "phone": 1.0, "pet": 0.9, "email": 0.8}
+# Rows each nearest-neighbour branch contributes before merging
+_BRANCH_LIMIT = 50
+
+
+@dataclass(frozen=True)
+class OwnerMatch:
+    owner_id: int
+    score: float
+
+
+def _digits(text: str) -> str:
+    return re.sub(r"\D", "", text)
+
+
+# ──────────── POSTGRESQL ────────────
+
+def _postgres_matches(db: Session, q: str, limit: int) -> List[OwnerMatch]:
+    term = literal(q.lower())
+
+    def nearest(owner_id_col, expr, weight):
+        distance = term.op("<<->", return_type=Float)(expr)
+        return (
+            select(owner_id_col.label("owner_id"), ((1 - distance) * weight).label("score"))
+            .where(expr.isnot(None))
+            .order_by(distance)
+            .limit(_BRANCH_LIMIT)
+        )
+
+    branches = [
+        nearest(Owner.id, func.lower(Owner.name), _WEIGHTS["name"]),
+        nearest(Owner.id, func.lower(Owner.email), _WEIGHTS["email"]),
+        nearest(Pet.owner_id, func.lower(Pet.name), _WEIGHTS["pet"]),
+    ]
+    digits = _digits(q)
+    if len(digits) >= MIN_PHONE_DIGITS:
+        reversed_digits = func.reverse(func.regexp_replace(Owner.phone, r"\D", "", "g"))
+        branches.append(
+            select(Owner.id.label("owner_id"), literal(_WEIGHTS["phone"]).label("score"))
+            .where(reversed_digits.like(digits[::-1] + "%"))
+            .limit(_BRANCH_LIMIT)
+        )
+
+    candidates = union_all(*(b.subquery().select() for b in branches)).subquery()
+    best = func.max(candidates.c.score)
+    rows = db.execute(
+        select(candidates.c.owner_id, best.label("score"))
+        .group_by(candidates.c.owner_id)
+        .having(best >= MIN_SCORE)
+        .order_by(best.desc(), candidates.c.owner_id)
+        .limit(limit)
+    ).all()
+    return [OwnerMatch(owner_id=r.owner_id, score=float(r.score)) for r in rows]
+
+
+# ──────────── IN-MEMORY FALLBACK ────────────
+
+def trigrams(text: str) -> Set[str]:
+    """pg_trgm's trigrams: per alphanumeric word, padded "  word "."""
+    grams = set()
+    for word in re.findall(r"[0-9a-z]+", text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Trigram postings per field, scored like pg_trgm's word_similarity.
+
+    A document's score for a query is the share of the query's trigrams it
+    contains (1.0 = every query trigram is present).
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, Set[int]]] = {
+            field: defaultdict(set) for field in ("name", "email", "pet")
+        }
+        self._phones: Dict[int, str] = {}
+
+    def add(self, field: str, owner_id: int, text: str) -> None:
+        if not text:
+            return
+        postings = self._postings[field]
+        for gram in trigrams(text):
+            postings[gram].add(owner_id)
+
+    def add_phone(self, owner_id: int, phone: str) -> None:
+        self._phones[owner_id] = _digits(phone or "")
+
+    def search(self, q: str, limit: int) -> List[OwnerMatch]:
+        scores: Dict[int, float] = {}
+        grams = trigrams(q)
+        if grams:
+            for field, postings in self._postings.items():
+                hits: Dict[int, int] = defaultdict(int)
+                for gram in grams:
+                    for owner_id in postings.get(gram, ()):
+                        hits[owner_id] += 1
+                weight = _WEIGHTS[field]
+                for owner_id, count in hits.items():
+                    score = count / len(grams) * weight
+                    if score > scores.get(owner_id, 0.0):
+                        scores[owner_id] = score
+
+        digits = _digits(q)
+        if len(digits) >= MIN_PHONE_DIGITS:
+            for owner_id, phone in self._phones.items():
+                if phone.endswith(digits):
+                    scores[owner_id] = max(scores.get(owner_id, 0.0), _WEIGHTS["phone"])
+
+        ranked = sorted(
+            (item for item in scores.items() if item[1] >= MIN_SCORE),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return [OwnerMatch(owner_id=o, score=s) for o, s in ranked[:limit]]
+
+
+_index_cache = TTLCache(maxsize=1, ttl=settings.OWNER_SEARCH_INDEX_TTL_SECONDS, shared=True)
+
+
+def _build_index(db: Session) -> TrigramIndex:
+    index = TrigramIndex()
+    for owner_id, name, phone, email in db.execute(
+        select(Owner.id, Owner.name, Owner.phone, Owner.email)
+    ):
+        index.add("name", owner_id, name)
+        index.add("email", owner_id, email)
+        index.add_phone(owner_id, phone)
+    for owner_id, name in db.execute(select(Pet.owner_id, Pet.name)):
+        index.add("pet", owner_id, name)
+    return index
+
+
+def invalidate_search_index() -> None:
+    """Call after owner or pet writes (only the in-memory index needs it)."""
+    _index_cache.invalidate()
+
+
+# ──────────── ENTRY POINT ────────────
+
+def search_owners(db: Session, q: str, limit: int) -> List[Tuple[Owner, float, List[str]]]:
+    """Ranked (owner, score, pet names) for ``q``, best first."""
+    q = q.strip()
+    if db.get_bind().dialect.name == "postgresql":
+        matches = _postgres_matches(db, q, limit)
+    else:
+        index = _index_cache.get_or_set("owners", lambda: _build_index(db))
+        matches = index.search(q, limit)
+    if not matches:
+        return []
+
+    ids = [m.owner_id for m in matches]
+    owners = {o.id: o for o in db.query(Owner).filter(Owner.id.in_(ids))}
+    pets: Dict[int, List[str]] = defaultdict(list)
+    for owner_id, name in db.execute(
+        select(Pet.owner_id, Pet.name).where(Pet.owner_id.in_(ids)).order_by(Pet.id)
+    ):
+        pets[owner_id].append(name)
+    return [
+        (owners[m.owner_id], round(m.score, 4), pets[m.owner_id])
+        for m in matches
+        if m.owner_id in owners
+    ]
@@ -0,0 +1,274 @@
+"""
+Daily report rollups.
+
+The rollup tables hold one row per (appointment date, status, type) and per
+(appointment date, service, payment status).  They are maintained with
+per-key deltas inside the transaction of every write that affects them:
+
+    before = capture_rollups(db, appointment_ids)   # before changing anything
+    ...change the appointments / their invoices...
+    apply_rollups(db, appointment_ids, before)      # right before commit
+
+``capture_rollups`` locks the appointment rows (in id order), so writers of
+the same appointment are serialized and each one's "before" already includes
+the previous writer's change.  ``apply_rollups`` adds the difference with
+``INSERT ... ON CONFLICT DO UPDATE SET x = x + excluded.x``, so concurrent
+writers on the same day only ever add to shared rows.
+
+Backfill / rebuild:
+    python -m backend.app.reports.rollup [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+
+import argparse
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import case, delete, distinct, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from backend.app.db.models import (
+    Appointment, Invoice, InvoiceItem,
+    DailyAppointmentRollup, DailyServiceRollup,
+)
+
+
+@dataclass
+class RollupContribution:
+    """What a set of appointments adds to each rollup row."""
+    appointments: Dict[Tuple, Tuple[int, Decimal]] = field(default_factory=dict)  # (date, status, type) -> (count, paid)
+    services: Dict[Tuple, Tuple[int, Decimal]] = field(default_factory=dict)      # (date, service, status) -> (qty, revenue)
+
+
+def _contribution(db: Session, appointment_ids: Iterable[int]) -> RollupContribution:
+    appointment_ids = sorted(set(appointment_ids))
+    if not appointment_ids:
+        return RollupContribution()
+    appt_rows, service_rows = _aggregate(db, Appointment.id.in_(appointment_ids))
+    return RollupContribution(
+        appointments={(d, status, t): (count, paid) for d, status, t, count, paid in appt_rows},
+        services={(d, sid, status): (qty, rev) for d, sid, status, qty, rev in service_rows},
+    )
+
+
+def capture_rollups(db: Session, appointment_ids: Iterable[int]) -> RollupContribution:
+    """Lock the appointments and return their current rollup contribution.
+
+    Call before changing the appointments or their invoices; pass the result
+    to ``apply_rollups`` once the changes are made.
+    """
+    appointment_ids = sorted(set(appointment_ids))
+    if appointment_ids:
+        db.execute(
+            select(Appointment.id)
+            .where(Appointment.id.in_(appointment_ids))
+            .order_by(Appointment.id)
+            .with_for_update()
+        )
+    return _contribution(db, appointment_ids)
+
+
+def _deltas(after: dict, before: dict) -> Dict[Tuple, Tuple]:
+    deltas = {}
+    # Sorted, so concurrent writers take the rollup row locks in one order
+    for key in sorted(after.keys() | before.keys()):
+        a = after.get(key, (0, 0))
+        b = before.get(key, (0, 0))
+        delta = (a[0] - b[0], a[1] - b[1])
+        if delta != (0, 0):
+            deltas[key] = delta
+    return deltas
+
+
+def _upsert(db: Session):
+    return {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[db.get_bind().dialect.name]
+
+
+def apply_rollups(
+    db: Session,
+    appointment_ids: Iterable[int],
+    before: Optional[RollupContribution] = None,
+) -> None:
+    """Add the appointments' change since ``capture_rollups`` to the rollup
+    rows (``before`` may be omitted for appointments created in this
+    transaction).  Does not commit — call right before the caller's commit."""
+    db.flush()  # make pending writes visible to the aggregate queries
+    before = before or RollupContribution()
+    after = _contribution(db, appointment_ids)
+    upsert = _upsert(db)
+
+    appt_deltas = _deltas(after.appointments, before.appointments)
+    if appt_deltas:
+        table = DailyAppointmentRollup.__table__
+        stmt = upsert(table)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["rollup_date", "status", "type"],
+                set_={
+                    "appointment_count": table.c.appointment_count + stmt.excluded.appointment_count,
+                    "paid_amount": table.c.paid_amount + stmt.excluded.paid_amount,
+                },
+            ),
+            [
+                {"rollup_date": d, "status": status, "type": t, "appointment_count": count, "paid_amount": paid}
+                for (d, status, t), (count, paid) in appt_deltas.items()
+            ],
+        )
+        db.execute(
+            delete(table).where(
+                table.c.appointment_count == 0,
+                table.c.paid_amount == 0,
+                table.c.rollup_date.in_({d for d, _, _ in appt_deltas}),
+            )
+        )
+
+    service_deltas = _deltas(after.services, before.services)
+    if service_deltas:
+        table = DailyServiceRollup.__table__
+        stmt = upsert(table)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["rollup_date", "service_id", "payment_status"],
+                set_={
+                    "quantity": table.c.quantity + stmt.excluded.quantity,
+                    "revenue": table.c.revenue + stmt.excluded.revenue,
+                },
+            ),
+            [
+                {"rollup_date": d, "service_id": sid, "payment_status": status, "quantity": qty, "revenue": rev}
+                for (d, sid, status), (qty, rev) in service_deltas.items()
+            ],
+        )
+        db.execute(
+            delete(table).where(
+                table.c.quantity == 0,
+                table.c.revenue == 0,
+                table.c.rollup_date.in_({d for d, _, _ in service_deltas}),
+            )
+        )
+
+
+def rebuild_rollups(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> None:
+    """Drop and recompute every rollup row in [start, end] (open-ended if None)."""
+    appt_filters, svc_filters, raw_filters = [], [], []
+    if start:
+        appt_filters.append(DailyAppointmentRollup.rollup_date >= start)
+        svc_filters.append(DailyServiceRollup.rollup_date >= start)
+        raw_filters.append(Appointment.appointment_date >= start)
+    if end:
+        appt_filters.append(DailyAppointmentRollup.rollup_date <= end)
+        svc_filters.append(DailyServiceRollup.rollup_date <= end)
+        raw_filters.append(Appointment.appointment_date <= end)
+
+    _delete_rollups(db, appt_filters, svc_filters)
+    _insert_rollups(db, *raw_filters)
+    db.commit()
+
+
+def _delete_rollups(db: Session, appt_filters: list, svc_filters: list) -> None:
+    db.query(DailyAppointmentRollup).filter(*appt_filters).delete(synchronize_session=False)
+    db.query(DailyServiceRollup).filter(*svc_filters).delete(synchronize_session=False)
+
+
+def _aggregate(db: Session, *appointment_filters) -> tuple:
+    """(appointment rollup rows, service rollup rows) for matching appointments."""
+    paid_amount = func.coalesce(
+        func.sum(
+            case(
+                (Invoice.payment_status == "paid", Invoice.final_amount),
+                else_=0,
+            )
+        ),
+        0,
+    )
+    appt_rows = (
+        db.query(
+            Appointment.appointment_date,
+            Appointment.status,
+            Appointment.type,
+            func.count(distinct(Appointment.id)),
+            paid_amount,
+        )
+        .outerjoin(Invoice, Invoice.appointment_id == Appointment.id)
+        .filter(*appointment_filters)
+        .group_by(Appointment.appointment_date, Appointment.status, Appointment.type)
+        .all()
+    )
+
+    payment_status = func.coalesce(Invoice.payment_status, "pending")
+    service_rows = (
+        db.query(
+            Appointment.appointment_date,
+            InvoiceItem.service_id,
+            payment_status,
+            func.coalesce(func.sum(InvoiceItem.quantity), 0),
+            func.coalesce(func.sum(InvoiceItem.line_total), 0),
+        )
+        .select_from(InvoiceItem)
+        .join(Invoice, Invoice.id == InvoiceItem.invoice_id)
+        .join(Appointment, Appointment.id == Invoice.appointment_id)
+        .filter(*appointment_filters)
+        .group_by(Appointment.appointment_date, InvoiceItem.service_id, payment_status)
+        .all()
+    )
+    return appt_rows, service_rows
+
+
+def _insert_rollups(db: Session, *appointment_filters) -> None:
+    appt_rows, service_rows = _aggregate(db, *appointment_filters)
+    if appt_rows:
+        db.execute(
+            insert(DailyAppointmentRollup),
+            [
+                {
+                    "rollup_date": d,
+                    "status": status,
+                    "type": appt_type,
+                    "appointment_count": count,
+                    "paid_amount": paid,
+                }
+                for d, status, appt_type, count, paid in appt_rows
+            ],
+        )
+    if service_rows:
+        db.execute(
+            insert(DailyServiceRollup),
+            [
+                {
+                    "rollup_date": d,
+                    "service_id": service_id,
+                    "payment_status": status,
+                    "quantity": qty,
+                    "revenue": revenue,
+                }
+                for d, service_id, status, qty, revenue in service_rows
+            ],
+        )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Rebuild daily report rollups.")
+    parser.add_argument("--start", type=date.fromisoformat, default=None)
+    parser.add_argument("--end", type=date.fromisoformat, default=None)
+    args = parser.parse_args(argv)
+
+    from backend.app.db.session import SessionLocal, engine
+    from backend.app.db.migrations import upgrade as upgrade_schema
+
+    upgrade_schema(engine)
+    db = SessionLocal()
+    try:
+        rebuild_rollups(db, start=args.start, end=args.end)
+        print(f"Rollups rebuilt for {args.start or 'beginning'} → {args.end or 'latest'}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,48 @@
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import date
+from typing import Literal
 
+from backend.app.core.config import settings
 from backend.app.core.roles import require_admin
 from backend.app.db.models import StaffUser
-from backend.app.db.session import get_db
+from backend.app.db.session import get_db, get_async_db
 from backend.app.reports.service import (
     dashboard_summary,
+    dashboard_summary_async,
+    dashboard_cache_stats,
     revenue_report,
     services_report,
     appointments_report,
+    appointments_breakdown,
     inventory_report,
 )
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
 
-@router.get("/dashboard")
-def dashboard(
-    db: Session = Depends(get_db),
+if settings.DB_ASYNC:
+    @router.get("/dashboard")
+    async def dashboard(
+        db: AsyncSession = Depends(get_async_db),
+        current_user: StaffUser = Depends(require_admin),
+    ):
+        return await dashboard_summary_async(db)
+else:
+    @router.get("/dashboard")
+    def dashboard(
+        db: Session = Depends(get_db),
+        current_user: StaffUser = Depends(require_admin),
+    ):
+        return dashboard_summary(db)
+
+
+@router.get("/dashboard/cache-stats")
+def dashboard_cache(
     current_user: StaffUser = Depends(require_admin),
 ):
-    return dashboard_summary(db)
+    return dashboard_cache_stats()
 
 
 @router.get("/revenue")
@@ -54,6 +75,17 @@ def appointments(
     return appointments_report(db, start, end)
 
 
+@router.get("/appointments/breakdown")
+def appointments_by_period(
+    start: date = Query(...),
+    end: date = Query(...),
+    granularity: Literal["day", "week"] = Query(default="day"),
+    db: Session = Depends(get_db),
+    current_user: StaffUser = Depends(require_admin),
+):
+    return appointments_breakdown(db, start, end, granularity=granularity)
+
+
 @router.get("/inventory")
 def inventory(
     db: Session = Depends(get_db),
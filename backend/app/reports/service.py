@@ -2,128 +2,289 @@ from datetime import date, timedelta
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import func, cast, Date
+from sqlalchemy import func, cast, select, Date
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from backend.app.core.cache import TTLCache
+from backend.app.core.config import settings
 from backend.app.db.models import (
     Appointment, Invoice, InvoiceItem, Service,
     InventoryItem, StaffUser,
+    DailyAppointmentRollup, DailyServiceRollup,
 )
+from backend.app.inventory.expiry import expiring_within
+
+
+_dashboard_cache = TTLCache(
+    maxsize=settings.DASHBOARD_CACHE_MAX_ENTRIES,
+    ttl=settings.DASHBOARD_CACHE_TTL_SECONDS,
+    shared=True,
+)
+
+
+def invalidate_dashboard() -> None:
+    """Drop cached dashboard numbers — call after writes that change them."""
+    _dashboard_cache.invalidate()
+
+
+def dashboard_cache_stats() -> dict:
+    return _dashboard_cache.stats()
 
 
 def dashboard_summary(db: Session) -> dict:
     today = date.today()
+    return _dashboard_cache.get_or_set(
+        today, lambda: _dashboard_row(db.execute(_dashboard_stmt(today)).one())
+    )
+
+
+async def dashboard_summary_async(db: AsyncSession) -> dict:
+    today = date.today()
+    generation = _dashboard_cache.generation()
+    cached = _dashboard_cache.get(today)
+    if cached is None:
+        result = await db.execute(_dashboard_stmt(today))
+        cached = _dashboard_row(result.one())
+        _dashboard_cache.set(today, cached, if_generation=generation)
+    return cached
 
+
+def _dashboard_stmt(today: date):
+    """All four dashboard figures as scalar subqueries of a single SELECT."""
     todays_appointments = (
-        db.query(func.count(Appointment.id))
-        .filter(Appointment.appointment_date == today)
-        .scalar()
+        select(func.count(Appointment.id))
+        .where(Appointment.appointment_date == today)
     )
 
     total_revenue_today = (
-        db.query(func.coalesce(func.sum(Invoice.final_amount), 0))
+        select(func.coalesce(func.sum(Invoice.final_amount), 0))
         .select_from(Invoice)
         .join(Appointment, Appointment.id == Invoice.appointment_id)
-        .filter(
+        .where(
             Appointment.appointment_date == today,
             Invoice.payment_status == "paid",
         )
-        .scalar()
     )
 
     low_stock_count = (
-        db.query(func.count(InventoryItem.id))
-        .filter(InventoryItem.quantity <= InventoryItem.reorder_level)
-        .scalar()
+        select(func.count(InventoryItem.id))
+        .where(InventoryItem.quantity <= InventoryItem.reorder_level)
     )
 
     active_staff = (
-        db.query(func.count(StaffUser.id))
-        .filter(StaffUser.is_active == True)
-        .scalar()
+        select(func.count(StaffUser.id))
+        .where(StaffUser.is_active == True)
+    )
+
+    return select(
+        todays_appointments.scalar_subquery().label("todays_appointments"),
+        total_revenue_today.scalar_subquery().label("total_revenue_today"),
+        low_stock_count.scalar_subquery().label("low_stock_count"),
+        active_staff.scalar_subquery().label("active_staff"),
     )
 
+
+def _dashboard_row(row) -> dict:
     return {
-        "todays_appointments": todays_appointments,
-        "total_revenue_today": float(total_revenue_today),
-        "low_stock_count": low_stock_count,
-        "active_staff": active_staff,
+        "todays_appointments": row.todays_appointments,
+        "total_revenue_today": float(row.total_revenue_today),
+        "low_stock_count": row.low_stock_count,
+        "active_staff": row.active_staff,
     }
 
 
+def _split_range(start: date, end: date):
+    """Split [start, end] into the closed part served from rollups and the
+    still-open part (today onwards) that must be read from raw rows.
+
+    Returns ``((closed_start, closed_end) | None, (open_start, open_end) | None)``.
+    """
+    today = date.today()
+    closed = (start, min(end, today - timedelta(days=1))) if start < today else None
+    opened = (max(start, today), end) if end >= today else None
+    return closed, opened
+
+
 def revenue_report(db: Session, start: date, end: date) -> dict:
-    rows = (
-        db.query(
-            Appointment.appointment_date.label("date"),
-            func.sum(Invoice.final_amount).label("amount"),
+    closed, opened = _split_range(start, end)
+    data = []
+
+    if closed:
+        rows = (
+            db.query(
+                DailyAppointmentRollup.rollup_date.label("date"),
+                func.sum(DailyAppointmentRollup.paid_amount).label("amount"),
+            )
+            .filter(
+                DailyAppointmentRollup.rollup_date >= closed[0],
+                DailyAppointmentRollup.rollup_date <= closed[1],
+            )
+            .group_by(DailyAppointmentRollup.rollup_date)
+            .having(func.sum(DailyAppointmentRollup.paid_amount) > 0)
+            .order_by(DailyAppointmentRollup.rollup_date)
+            .all()
         )
-        .select_from(Invoice)
-        .join(Appointment, Appointment.id == Invoice.appointment_id)
-        .filter(
-            Appointment.appointment_date >= start,
-            Appointment.appointment_date <= end,
-            Invoice.payment_status == "paid",
+        data += [{"date": str(r.date), "amount": float(r.amount)} for r in rows]
+
+    if opened:
+        rows = (
+            db.query(
+                Appointment.appointment_date.label("date"),
+                func.sum(Invoice.final_amount).label("amount"),
+            )
+            .select_from(Invoice)
+            .join(Appointment, Appointment.id == Invoice.appointment_id)
+            .filter(
+                Appointment.appointment_date >= opened[0],
+                Appointment.appointment_date <= opened[1],
+                Invoice.payment_status == "paid",
+            )
+            .group_by(Appointment.appointment_date)
+            .order_by(Appointment.appointment_date)
+            .all()
         )
-        .group_by(Appointment.appointment_date)
-        .order_by(Appointment.appointment_date)
-        .all()
-    )
+        data += [{"date": str(r.date), "amount": float(r.amount)} for r in rows]
 
-    data = [{"date": str(r.date), "amount": float(r.amount)} for r in rows]
     total = sum(d["amount"] for d in data)
     return {"data": data, "total": total}
 
 
 def services_report(db: Session, start: date, end: date) -> list:
-    rows = (
-        db.query(
-            Service.name.label("service_name"),
-            func.sum(InvoiceItem.quantity).label("count"),
-            func.sum(InvoiceItem.line_total).label("revenue"),
+    closed, opened = _split_range(start, end)
+    merged: dict = {}
+
+    def _merge(rows):
+        for r in rows:
+            entry = merged.setdefault(r.service_name, {"count": 0, "revenue": 0.0})
+            entry["count"] += int(r.count)
+            entry["revenue"] += float(r.revenue)
+
+    if closed:
+        _merge(
+            db.query(
+                Service.name.label("service_name"),
+                func.sum(DailyServiceRollup.quantity).label("count"),
+                func.sum(DailyServiceRollup.revenue).label("revenue"),
+            )
+            .join(DailyServiceRollup, DailyServiceRollup.service_id == Service.id)
+            .filter(
+                DailyServiceRollup.rollup_date >= closed[0],
+                DailyServiceRollup.rollup_date <= closed[1],
+            )
+            .group_by(Service.name)
+            .all()
         )
-        .join(InvoiceItem, InvoiceItem.service_id == Service.id)
-        .join(Invoice, Invoice.id == InvoiceItem.invoice_id)
-        .join(Appointment, Appointment.id == Invoice.appointment_id)
-        .filter(
-            Appointment.appointment_date >= start,
-            Appointment.appointment_date <= end,
+
+    if opened:
+        _merge(
+            db.query(
+                Service.name.label("service_name"),
+                func.sum(InvoiceItem.quantity).label("count"),
+                func.sum(InvoiceItem.line_total).label("revenue"),
+            )
+            .join(InvoiceItem, InvoiceItem.service_id == Service.id)
+            .join(Invoice, Invoice.id == InvoiceItem.invoice_id)
+            .join(Appointment, Appointment.id == Invoice.appointment_id)
+            .filter(
+                Appointment.appointment_date >= opened[0],
+                Appointment.appointment_date <= opened[1],
+            )
+            .group_by(Service.name)
+            .all()
         )
-        .group_by(Service.name)
-        .order_by(func.sum(InvoiceItem.quantity).desc())
-        .all()
+
+    return sorted(
+        (
+            {"service_name": name, "count": v["count"], "revenue": v["revenue"]}
+            for name, v in merged.items()
+        ),
+        key=lambda r: r["count"],
+        reverse=True,
     )
 
-    return [
-        {
-            "service_name": r.service_name,
-            "count": int(r.count),
-            "revenue": float(r.revenue),
-        }
-        for r in rows
-    ]
 
+# ──────────── GROUPED APPOINTMENT AGGREGATES ────────────
 
-def appointments_report(db: Session, start: date, end: date) -> dict:
-    q = db.query(Appointment).filter(
-        Appointment.appointment_date >= start,
-        Appointment.appointment_date <= end,
-    )
+def _appointment_buckets(
+    db: Session, start: date, end: date, by_day: bool = False
+) -> list:
+    """Return (day, status, type, count) buckets for [start, end] in one
+    grouped scan per source — rollups for closed days, raw rows for open ones.
+
+    ``day`` is None unless ``by_day`` is set.
+    """
+    closed, opened = _split_range(start, end)
+    buckets = []
+
+    if closed:
+        day_col = DailyAppointmentRollup.rollup_date
+        group = [DailyAppointmentRollup.status, DailyAppointmentRollup.type]
+        if by_day:
+            group.insert(0, day_col)
+        rows = (
+            db.query(*group, func.sum(DailyAppointmentRollup.appointment_count))
+            .filter(day_col >= closed[0], day_col <= closed[1])
+            .group_by(*group)
+            .all()
+        )
+        buckets += [((r[0],) if by_day else (None,)) + tuple(r[-3:]) for r in rows]
+
+    if opened:
+        day_col = Appointment.appointment_date
+        group = [Appointment.status, Appointment.type]
+        if by_day:
+            group.insert(0, day_col)
+        rows = (
+            db.query(*group, func.count(Appointment.id))
+            .filter(day_col >= opened[0], day_col <= opened[1])
+            .group_by(*group)
+            .all()
+        )
+        buckets += [((r[0],) if by_day else (None,)) + tuple(r[-3:]) for r in rows]
 
-    total = q.count()
-    completed = q.filter(Appointment.status == "completed").count()
-    cancelled = q.filter(Appointment.status == "cancelled").count()
-    scheduled = q.filter(Appointment.status == "scheduled").count()
-    walk_in = q.filter(Appointment.type == "walk-in").count()
+    return [(day, status, appt_type, int(count)) for day, status, appt_type, count in buckets]
+
+
+def _summarize_buckets(buckets) -> dict:
+    by_status: dict = {}
+    by_type: dict = {}
+    for _, status, appt_type, count in buckets:
+        by_status[status] = by_status.get(status, 0) + count
+        by_type[appt_type] = by_type.get(appt_type, 0) + count
 
     return {
-        "total": total,
-        "completed": completed,
-        "cancelled": cancelled,
-        "walk_in": walk_in,
-        "scheduled": scheduled,
+        "total": sum(by_status.values()),
+        "completed": by_status.get("completed", 0),
+        "cancelled": by_status.get("cancelled", 0),
+        "walk_in": by_type.get("walk-in", 0),
+        "scheduled": by_status.get("scheduled", 0),
+        "by_status": by_status,
+        "by_type": by_type,
     }
 
 
+def appointments_report(db: Session, start: date, end: date) -> dict:
+    return _summarize_buckets(_appointment_buckets(db, start, end))
+
+
+def appointments_breakdown(
+    db: Session, start: date, end: date, granularity: str = "day"
+) -> list:
+    """Per-day or per-week (ISO weeks, keyed by Monday) appointment summaries."""
+    periods: dict = {}
+    for bucket in _appointment_buckets(db, start, end, by_day=True):
+        day = bucket[0]
+        if granularity == "week":
+            day = day - timedelta(days=day.weekday())
+        periods.setdefault(day, []).append(bucket)
+
+    return [
+        {"period": str(period), **_summarize_buckets(periods[period])}
+        for period in sorted(periods)
+    ]
+
+
 def inventory_report(db: Session) -> dict:
     low_stock = (
         db.query(InventoryItem)
@@ -131,14 +292,7 @@ def inventory_report(db: Session) -> dict:
         .all()
     )
 
-    cutoff = date.today() + timedelta(days=30)
-    near_expiry = (
-        db.query(InventoryItem)
-        .filter(
-            InventoryItem.expiry_date.isnot(None),
-            InventoryItem.expiry_date <= cutoff,
-        )
-        .all()
-    )
+    # Shared with the inventory expiry alerts (cached per day)
+    near_expiry = expiring_within(db, 30)
 
     return {"low_stock": low_stock, "near_expiry": near_expiry}
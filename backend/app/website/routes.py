@@ -1,10 +1,16 @@
 import os
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 
 from backend.app.db.session import get_db
-from backend.app.db.models import Service, Owner, Pet, Appointment
+from backend.app.billing.catalog import get_catalog
+from backend.app.db.models import Owner, Pet, Appointment
+from backend.app.appointments.availability import invalidate_availability, reserve_slot
+from backend.app.appointments.board import board_changed
+from backend.app.receptionist.search import invalidate_search_index
+from backend.app.reports.rollup import apply_rollups
+from backend.app.reports.service import invalidate_dashboard
 from backend.app.website.schemas import (
     ClinicInfoResponse,
     PublicServiceResponse,
@@ -14,6 +20,17 @@ from backend.app.website.schemas import (
 router = APIRouter(prefix="/website", tags=["Website (Public)"])
 
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check: ``*`` or any listed tag equal to ``etag`` under
+    weak comparison (the ``W/`` prefix is ignored on both sides)."""
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or opaque(etag) in {opaque(tag) for tag in tags if tag}
+
+
 @router.get("/info", response_model=ClinicInfoResponse)
 def clinic_info():
     return {
@@ -31,13 +48,19 @@ def clinic_info():
 
 
 @router.get("/services", response_model=List[PublicServiceResponse])
-def public_services(db: Session = Depends(get_db)):
-    return (
-        db.query(Service)
-        .filter(Service.is_active == True)
-        .order_by(Service.name)
-        .all()
-    )
+def public_services(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    catalog = get_catalog(db)
+    headers = {"ETag": catalog.etag, "Cache-Control": "public, no-cache"}
+
+    if _etag_matches(request.headers.get("if-none-match", ""), catalog.etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return list(catalog.active)
 
 
 @router.post("/appointments")
@@ -45,9 +68,14 @@ def public_appointment_request(
     data: PublicAppointmentRequest,
     db: Session = Depends(get_db),
 ):
+    # Refuse a full slot before creating anything
+    reserve_slot(db, data.preferred_date, data.preferred_time)
+
     # Find or create owner
+    created = False
     owner = db.query(Owner).filter(Owner.phone == data.phone).first()
     if not owner:
+        created = True
         owner = Owner(name=data.owner_name, phone=data.phone)
         db.add(owner)
         db.flush()
@@ -59,6 +87,7 @@ def public_appointment_request(
         .first()
     )
     if not pet:
+        created = True
         pet = Pet(owner_id=owner.id, name=data.pet_name, species=data.species)
         db.add(pet)
         db.flush()
@@ -74,7 +103,14 @@ def public_appointment_request(
         notes=data.notes,
     )
     db.add(appointment)
+    db.flush()
+    apply_rollups(db, [appointment.id])
     db.commit()
+    invalidate_dashboard()
+    invalidate_availability(appointment.appointment_date)
+    board_changed()
+    if created:
+        invalidate_search_index()
     db.refresh(appointment)
 
     return {
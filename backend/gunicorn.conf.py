@@ -0,0 +1,45 @@
+"""
+Production server: N uvicorn worker processes under gunicorn.
+
+    gunicorn -c backend/gunicorn.conf.py backend.main:app
+
+The app is imported once in the master (preload_app) and forked, so workers
+boot without re-importing it and share the cache invalidation counters
+created at import time (see core/cache.py).  Workers are recycled after
+WORKER_MAX_REQUESTS (+ jitter, so they don't all restart at once).
+"""
+
+import os
+
+from backend.app.core.config import settings
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = settings.WEB_CONCURRENCY
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+
+max_requests = settings.WORKER_MAX_REQUESTS
+max_requests_jitter = settings.WORKER_MAX_REQUESTS_JITTER
+# Recycled workers finish in-flight requests first
+graceful_timeout = 30
+timeout = 60
+keepalive = 5
+
+accesslog = "-"
+
+
+def post_fork(server, worker):
+    # Nothing connects to the database or starts threads at import time, but
+    # never let a worker share a connection or pool with its parent. Thread
+    # pools (password hashing) are created lazily inside each worker, and
+    # per-worker background work starts in the app lifespan.
+    from backend.app.db.session import dispose_after_fork
+
+    dispose_after_fork()
+
+
+def when_ready(server):
+    server.log.info(
+        "Serving with %s workers, max_requests=%s (+%s jitter)",
+        workers, max_requests, max_requests_jitter,
+    )
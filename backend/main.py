@@ -1,9 +1,12 @@
 from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.app.core.config import settings
+from backend.app.core.pagination import NEXT_CURSOR_HEADER
 from backend.app.auth.routes import router as auth_router
+from backend.app.appointments.routes import router as appointments_router
 from backend.app.admin.routes import router as admin_router
 from backend.app.receptionist.routes import router as receptionist_router
 from backend.app.doctor.routes import router as doctor_router
@@ -12,15 +15,36 @@ from backend.app.inventory.routes import router as inventory_router
 from backend.app.reports.routes import router as reports_router
 from backend.app.notifications.routes import router as notifications_router
 from backend.app.website.routes import router as website_router
-from backend.app.db.session import engine, Base
+from backend.app.db.session import engine, async_engine
+from backend.app.db.migrations import ensure_current as ensure_schema_current
+from backend.app.db.migrations import upgrade as upgrade_schema
+from backend.app.notifications.dispatcher import dispatcher as notification_dispatcher
+from backend.app.appointments.board import day_board
+
+
+def prepare_schema() -> None:
+    mode = settings.schema_startup_mode
+    if mode == "migrate":
+        upgrade_schema(engine)
+    elif mode == "check":
+        # One version query, no reflection and no migration lock; production
+        # runs `python -m backend.app.db.migrations upgrade` before deploying.
+        ensure_schema_current(engine)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: create all tables
-    Base.metadata.create_all(bind=engine)
+    # Startup: migrate or verify the schema (SCHEMA_STARTUP_MODE), then start
+    # this worker's notification dispatcher
+    prepare_schema()
+    notification_dispatcher.start()
     yield
-    # Shutdown: nothing needed for now
+    # Shutdown: stop the day board task, drain queued notifications, then
+    # release the async pool (the sync pool is closed by its finalizer)
+    await day_board.stop()
+    await notification_dispatcher.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 app = FastAPI(
@@ -41,6 +65,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Routers
@@ -48,6 +73,7 @@ app.include_router(auth_router)
 app.include_router(admin_router)
 app.include_router(receptionist_router)
 app.include_router(doctor_router)
+app.include_router(appointments_router)
 app.include_router(billing_router)
 app.include_router(inventory_router)
 app.include_router(reports_router)
@@ -58,3 +84,127 @@ app.include_router(website_router)
 @app.get("/health")
 def health():
     return {"status": "ok", "environment": settings.ENVIRONMENT}
+
+
+# ──────────── STARTUP BENCHMARK ────────────
+# python -m backend.main --check-startup [--runs N] [--budget-ms MS]
+#
+# Boots the app in fresh interpreters (nothing cached in sys.modules) and
+# reports how long the import of backend.main and the lifespan startup take.
+# The benchmark's own imports stay inside these functions so they don't
+# count against the app.
+
+_STARTUP_PROBE = """
+import asyncio, json, time
+t0 = time.perf_counter()
+from backend.main import app
+t1 = time.perf_counter()
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+t2 = asyncio.run(boot())
+print("STARTUP " + json.dumps({"import_ms": (t1 - t0) * 1000, "lifespan_ms": (t2 - t1) * 1000}))
+"""
+
+
+def _probe_once() -> dict:
+    import json
+    import subprocess
+    import sys
+    import time
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", _STARTUP_PROBE], capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "boot failed")
+    line = next(l for l in reversed(proc.stdout.splitlines()) if l.startswith("STARTUP "))
+    result = json.loads(line[len("STARTUP "):])
+    result["process_ms"] = wall_ms
+    return result
+
+
+def _slowest_imports(limit: int = 8) -> tuple:
+    import subprocess
+    import sys
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.main"],
+        capture_output=True, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            # importtime indents nested imports by two spaces per level
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            rows.append((int(cumulative) / 1000, depth, name.strip()))
+
+    # Children are listed before their parent; keep only what backend.main
+    # pulled in, not the interpreter's own startup imports
+    roots = [i for i, (_, depth, _) in enumerate(rows) if depth == 0]
+    if len(roots) > 1:
+        rows = rows[roots[-2] + 1:]
+
+    packages = [(ms, n) for ms, _, n in rows if "." not in n and n != "backend"]
+    app_modules = [(ms, n) for ms, _, n in rows if n.startswith("backend.app.")]
+    return (
+        sorted(packages, reverse=True)[:limit],
+        sorted(app_modules, reverse=True)[:limit],
+    )
+
+
+def check_startup(runs: int, budget_ms: float = None) -> int:
+    import statistics
+
+    print(f"Schema startup mode: {settings.schema_startup_mode}")
+    try:
+        samples = [_probe_once() for _ in range(runs)]
+    except RuntimeError as e:
+        print(f"Startup failed: {e}")
+        return 1
+
+    for key, label in (
+        ("import_ms", "import backend.main"),
+        ("lifespan_ms", "lifespan startup"),
+        ("process_ms", "total boot (process)"),
+    ):
+        values = [s[key] for s in samples]
+        print(f"  {label:<22} median {statistics.median(values):8.1f} ms   "
+              f"min {min(values):8.1f} ms   max {max(values):8.1f} ms")
+
+    packages, app_modules = _slowest_imports()
+    print("Slowest packages (cumulative import ms):")
+    for ms, name in packages:
+        print(f"  {ms:8.1f}  {name}")
+    print("Slowest app modules (cumulative import ms):")
+    for ms, name in app_modules:
+        print(f"  {ms:8.1f}  {name}")
+
+    total = statistics.median(s["import_ms"] + s["lifespan_ms"] for s in samples)
+    if budget_ms is not None and total > budget_ms:
+        print(f"Boot latency {total:.1f} ms exceeds the {budget_ms:.0f} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(prog="python -m backend.main")
+    parser.add_argument("--check-startup", action="store_true",
+                        help="measure import and lifespan startup latency")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="exit non-zero if import + lifespan exceeds this")
+    args = parser.parse_args()
+    if not args.check_startup:
+        parser.error("nothing to do; run the app with uvicorn backend.main:app")
+    sys.exit(check_startup(args.runs, args.budget_ms))
@@ -14,22 +14,33 @@ from decimal import Decimal
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.app.db.session import SessionLocal, engine, Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.db.migrations import upgrade as upgrade_schema
 from backend.app.db.models import (
     StaffUser, Owner, Pet, Service, InventoryItem, InventoryLog,
     Appointment, MedicalRecord, Invoice, InvoiceItem, NotificationLog,
 )
-from backend.app.core.security import hash_password
+from backend.app.core.security import hash_passwords
+from backend.app.reports.rollup import rebuild_rollups
 
 TODAY = date.today()
 D = lambda days: TODAY + timedelta(days=days)  # relative date helper
 
 
-def _get_or_create_staff(db, username, name, email, role, password):
+def _hash_missing_staff_passwords(db, staff_rows):
+    """bcrypt dominates seeding time — hash every missing account's password
+    in parallel on the hashing pool. Returns {username: password_hash}."""
+    usernames = [row[0] for row in staff_rows]
+    existing = {u for (u,) in db.query(StaffUser.username).filter(StaffUser.username.in_(usernames))}
+    missing = [row for row in staff_rows if row[0] not in existing]
+    return dict(zip((row[0] for row in missing), hash_passwords([row[4] for row in missing])))
+
+
+def _get_or_create_staff(db, username, name, email, role, password_hash):
     obj = db.query(StaffUser).filter(StaffUser.username == username).first()
     if not obj:
         obj = StaffUser(name=name, username=username, email=email,
-                        role=role, password_hash=hash_password(password))
+                        role=role, password_hash=password_hash)
         db.add(obj)
         db.flush()
         print(f"  + staff: {username} ({role})")
@@ -60,16 +71,23 @@ def _get_or_create_inventory(db, name, category, qty, unit, reorder, expiry, cos
 
 
 def seed():
-    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
     db = SessionLocal()
     try:
         # ── 1. STAFF ──────────────────────────────────────────────────────────
         print("\n[1/8] Staff users…")
-        admin      = _get_or_create_staff(db, "admin",     "Dr. Priya Nair (Admin)", "admin@vetcore.in",       "admin",        "admin123")
-        dr_anand   = _get_or_create_staff(db, "dranand",   "Dr. Anand Krishnan",     "anand@vetcore.in",       "doctor",       "doctor123")
-        dr_meena   = _get_or_create_staff(db, "drmeena",   "Dr. Meena Pillai",       "meena@vetcore.in",       "doctor",       "doctor123")
-        rec_riya   = _get_or_create_staff(db, "riya",      "Riya Thomas",            "riya@vetcore.in",        "receptionist", "recep123")
-        rec_james  = _get_or_create_staff(db, "james",     "James Mathew",           "james@vetcore.in",       "receptionist", "recep123")
+        staff_rows = [
+            ("admin",     "Dr. Priya Nair (Admin)", "admin@vetcore.in",       "admin",        "admin123"),
+            ("dranand",   "Dr. Anand Krishnan",     "anand@vetcore.in",       "doctor",       "doctor123"),
+            ("drmeena",   "Dr. Meena Pillai",       "meena@vetcore.in",       "doctor",       "doctor123"),
+            ("riya",      "Riya Thomas",            "riya@vetcore.in",        "receptionist", "recep123"),
+            ("james",     "James Mathew",           "james@vetcore.in",       "receptionist", "recep123"),
+        ]
+        hashes = _hash_missing_staff_passwords(db, staff_rows)
+        admin, dr_anand, dr_meena, rec_riya, rec_james = [
+            _get_or_create_staff(db, *row[:4], password_hash=hashes.get(row[0]))
+            for row in staff_rows
+        ]
         db.flush()
 
         # ── 2. SERVICES ───────────────────────────────────────────────────────
@@ -458,6 +476,11 @@ def seed():
         print("  + notification logs seeded")
 
         db.commit()
+
+        # Seeded rows bypass the billing/appointment write hooks
+        rebuild_rollups(db)
+        print("  + report rollups rebuilt")
+
         print("\n✅ Database seeded successfully!")
         print("\n─── Login Credentials ───────────────────────────────")
         print("  Admin:        admin      / admin123")
@@ -0,0 +1,115 @@
+"""Booking checks in reserve_slot: clinic hours, closed days, full slots."""
+
+from datetime import date, time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.appointments.availability import invalidate_availability, reserve_slot
+from backend.app.core.config import settings
+from backend.app.db import models  # noqa: F401  (registers every table)
+from backend.app.db.models import Appointment, Owner, Pet
+from backend.app.db.session import Base, get_db
+
+MONDAY = date(2030, 1, 7)
+SUNDAY = date(2030, 1, 6)
+
+
+@pytest.fixture(autouse=True)
+def clinic_hours(monkeypatch):
+    monkeypatch.setattr(settings, "SLOT_MINUTES", 15)
+    monkeypatch.setattr(settings, "SLOT_CAPACITY", 1)
+    monkeypatch.setattr(settings, "CLINIC_OPENS", time(9, 0))
+    monkeypatch.setattr(settings, "CLINIC_CLOSES", time(19, 0))
+    monkeypatch.setattr(settings, "CLINIC_CLOSED_WEEKDAYS", "6")
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'booking.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    with factory() as db:
+        db.add(Owner(id=1, name="Asha", phone="9000000001"))
+        db.add(Pet(id=1, owner_id=1, name="Bruno", species="Dog"))
+        db.add(Appointment(
+            id=1, owner_id=1, pet_id=1, appointment_date=MONDAY,
+            appointment_time=time(10, 0), type="scheduled", status="scheduled",
+        ))
+        db.commit()
+    yield factory
+    invalidate_availability(MONDAY)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as session:
+        yield session
+
+
+def _status(db, day, at, exclude_id=None):
+    try:
+        reserve_slot(db, day, at, exclude_id=exclude_id)
+    except HTTPException as e:
+        return e.status_code
+    return None
+
+
+def test_full_slot_is_409(db):
+    assert _status(db, MONDAY, time(10, 0)) == 409
+    # anywhere in the same slot
+    assert _status(db, MONDAY, time(10, 10)) == 409
+    assert _status(db, MONDAY, time(10, 15)) is None
+
+
+def test_moving_within_own_slot_is_allowed(db):
+    assert _status(db, MONDAY, time(10, 5), exclude_id=1) is None
+    assert _status(db, MONDAY, time(10, 5), exclude_id=2) == 409
+
+
+def test_cancelled_appointments_free_the_slot(db):
+    db.get(Appointment, 1).status = "cancelled"
+    db.flush()
+    assert _status(db, MONDAY, time(10, 0)) is None
+
+
+@pytest.mark.parametrize("day, at", [
+    (MONDAY, time(3, 0)),
+    (MONDAY, time(8, 59)),
+    (MONDAY, time(19, 0)),
+    (SUNDAY, time(10, 0)),
+])
+def test_closed_times_are_422(db, day, at):
+    assert _status(db, day, at) == 422
+
+
+def test_public_booking_request(session_factory):
+    from backend.main import app
+
+    def override_get_db():
+        with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        request = {
+            "owner_name": "Ravi", "phone": "9000000002", "pet_name": "Milo",
+            "species": "Cat", "preferred_date": MONDAY.isoformat(),
+        }
+        assert client.post("/website/appointments", json={**request, "preferred_time": "03:00:00"}).status_code == 422
+        assert client.post("/website/appointments", json={**request, "preferred_time": "10:00:00"}).status_code == 409
+        assert client.post("/website/appointments", json={**request, "preferred_time": "11:00:00"}).status_code == 200
+        assert client.post("/website/appointments", json={**request, "preferred_time": "11:05:00"}).status_code == 409
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    with session_factory() as db:
+        assert db.query(Appointment).count() == 2
+        assert db.query(Owner).count() == 2
@@ -0,0 +1,39 @@
+"""Forecast demand: outgoing movements except direct quantity edits."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.db import models  # noqa: F401  (registers every table)
+from backend.app.db.models import InventoryItem, InventoryLog
+from backend.app.db.session import Base
+from backend.app.inventory import forecast
+from backend.app.inventory.service import QUANTITY_EDITED
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'forecast.db'}")
+    Base.metadata.create_all(engine)
+    forecast._history_cache.invalidate()
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_quantity_edits_are_not_demand(db):
+    db.add(InventoryItem(id=1, name="Gauze", quantity=100, reorder_level=0))
+    now = datetime.now()
+    db.add_all([
+        InventoryLog(item_id=1, change_qty=-14, reason="Invoice #1", created_at=now),
+        InventoryLog(item_id=1, change_qty=-6, reason="Used in surgery", created_at=now),
+        InventoryLog(item_id=1, change_qty=-500, reason=QUANTITY_EDITED, created_at=now),
+        InventoryLog(item_id=1, change_qty=40, reason="Restock", created_at=now),
+    ])
+    db.commit()
+
+    [row] = forecast.forecast(db)
+    assert row["sma"] == round(20 / settings.FORECAST_SMA_DAYS, 3)
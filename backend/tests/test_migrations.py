@@ -0,0 +1,36 @@
+"""A database built by the migrations matches the models."""
+
+from sqlalchemy import create_engine, inspect
+
+from backend.app.db import models  # noqa: F401  (registers every table)
+from backend.app.db.migrations import LATEST_VERSION, schema_version, upgrade
+from backend.app.db.session import Base
+
+
+def _schema(insp, table):
+    columns = {c["name"]: c["nullable"] for c in insp.get_columns(table)}
+    indexes = {ix["name"] for ix in insp.get_indexes(table)}
+    uniques = {tuple(uq["column_names"]) for uq in insp.get_unique_constraints(table)}
+    # SQLite reports UNIQUE indexes as indexes: compare by columns, not name
+    uniques |= {tuple(ix["column_names"]) for ix in insp.get_indexes(table) if ix["unique"]}
+    return columns, indexes - {n for n in indexes if n.startswith("sqlite_")}, uniques
+
+
+def test_migrations_match_models(tmp_path):
+    migrated = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    upgrade(migrated)
+    assert schema_version(migrated) == LATEST_VERSION
+
+    declared = create_engine(f"sqlite:///{tmp_path / 'declared.db'}")
+    Base.metadata.create_all(declared)
+
+    got, want = inspect(migrated), inspect(declared)
+    assert set(got.get_table_names()) - {"schema_migrations"} == set(want.get_table_names())
+    for table in want.get_table_names():
+        assert _schema(got, table) == _schema(want, table), table
+
+
+def test_upgrade_is_idempotent(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.db'}")
+    assert upgrade(engine) == list(range(1, LATEST_VERSION + 1))
+    assert upgrade(engine) == []
@@ -0,0 +1,75 @@
+"""apply_stock_movements on the portable path (no CTE): per-item netting,
+all-or-nothing failures."""
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from backend.app.db import models  # noqa: F401  (registers every table)
+from backend.app.db.models import InventoryItem, InventoryLog
+from backend.app.db.session import Base
+from backend.app.inventory.service import StockMovement, apply_stock_movements
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stock.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([
+            InventoryItem(id=1, name="Gauze", quantity=3),
+            InventoryItem(id=2, name="Syringe", quantity=10),
+        ])
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def _quantities(db):
+    return dict(db.execute(select(InventoryItem.id, InventoryItem.quantity)).all())
+
+
+def _logs(db):
+    return db.execute(
+        select(InventoryLog.item_id, InventoryLog.change_qty).order_by(InventoryLog.id)
+    ).all()
+
+
+def test_changes_are_netted_per_item(db):
+    # -5 alone would take Gauze below zero; the batch's net +5 is fine
+    rows = apply_stock_movements(db, [
+        StockMovement(1, -5, "dispensed"),
+        StockMovement(2, -4, "dispensed"),
+        StockMovement(1, 10, "restock"),
+    ], None)
+    db.commit()
+
+    assert {item_id: row["quantity"] for item_id, row in rows.items()} == {1: 8, 2: 6}
+    assert _quantities(db) == {1: 8, 2: 6}
+    # every movement is logged, in the order given
+    assert _logs(db) == [(1, -5), (2, -4), (1, 10)]
+
+
+def test_underflow_is_rejected_and_nothing_logged(db):
+    with pytest.raises(HTTPException) as e:
+        apply_stock_movements(db, [
+            StockMovement(2, -1, "dispensed"),
+            StockMovement(1, -2, "dispensed"),
+            StockMovement(1, -2, "dispensed"),
+        ], None)
+    db.rollback()
+
+    assert e.value.status_code == 400
+    assert "Gauze" in e.value.detail
+    assert _quantities(db) == {1: 3, 2: 10}
+    assert _logs(db) == []
+
+
+def test_unknown_item_is_404(db):
+    with pytest.raises(HTTPException) as e:
+        apply_stock_movements(db, [StockMovement(99, 1, "restock")], None)
+    db.rollback()
+
+    assert e.value.status_code == 404
+    assert _logs(db) == []